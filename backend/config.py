@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,11 +12,100 @@ SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
 
+# Upstream base URLs (overridable so benchmarks can point at local fakes)
+SERPER_BASE_URL = os.getenv("SERPER_BASE_URL", "https://google.serper.dev")
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com")
+NAVER_FINANCE_BASE_URL = os.getenv("NAVER_FINANCE_BASE_URL", "https://finance.naver.com")
+
 # Configuration
 SCHEDULE_INTERVAL_MINUTES = 10
 MARKET_KRX = "KRX"
 MARKET_US = "US"
 
+# Upstream concurrency
+SERPER_MAX_CONCURRENCY = 5
+
+# Shared HTTP client: (connect, read) timeouts per upstream service
+HTTP_TIMEOUTS = {
+    "serper": (3.05, 10),
+    "gemini": (3.05, 60),
+    "naver": (3.05, 10),
+}
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_POOL_SIZE = 10
+
+# Upstream rate limits, shared through one SQLite file by every process on
+# the host (API workers and the bot): token bucket (requests/second, burst)
+# plus an adaptive cap on concurrent requests that halves on each 429
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", os.path.join(tempfile.gettempdir(), "ai_stock_news_rate_limits.sqlite3"))
+RATE_LIMITS = {
+    "gemini": {"rate": float(os.getenv("GEMINI_RATE_PER_SECOND", 25)), "burst": 50, "max_concurrency": 32},
+    "serper": {"rate": float(os.getenv("SERPER_RATE_PER_SECOND", 50)), "burst": 100, "max_concurrency": 20},
+}
+RATE_LIMIT_MAX_WAIT_SECONDS = 60
+ENRICH_TIMEOUT_SECONDS = 15
+
+# Shared LLM news context: token budget, per-snippet cap, near-duplicate
+# threshold (word-shingle Jaccard) and how fast older articles lose rank
+PROMPT_CONTEXT_TOKEN_BUDGET = 1500
+PROMPT_SNIPPET_MAX_TOKENS = 200
+PROMPT_DUPLICATE_JACCARD = 0.6
+PROMPT_RECENCY_HALF_LIFE_HOURS = 12
+
+# /analyze request coalescing: identical requests within this window reuse one result
+ANALYZE_CACHE_TTL_SECONDS = 60
+ANALYZE_CACHE_MAX_ENTRIES = 256
+
+# Local OHLCV store
+DATA_DIR = "data"
+PRICE_STORE_DIR = os.path.join(DATA_DIR, "prices")
+PRICE_STORE_LOOKBACK_DAYS = 400
+PRICE_STORE_REFRESH_SECONDS = 300
+
+# Chart image cache
+CHART_CACHE_MAX_BYTES = 50 * 1024 * 1024
+CHART_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+# Server-side PNG charts; the frontend draws charts from /chart-data instead
+CHART_PNG_ENABLED = os.getenv("CHART_PNG_ENABLED", "false").lower() in ("1", "true", "yes")
+# /chart-data defaults: calendar days of history and max points after downsampling
+CHART_DATA_DEFAULT_DAYS = 180
+CHART_DATA_DEFAULT_POINTS = 120
+CHART_DATA_MAX_POINTS = 1000
+# Chart rendering worker processes (0 renders in the API process instead)
+CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Security master (daily snapshot of fdr.StockListing)
+SECURITY_MASTER_DIR = os.path.join(DATA_DIR, "listings")
+SECURITY_MASTER_REFRESH_SECONDS = 24 * 60 * 60
+
+# Naver Finance PER/PBR, cached per trading day
+FUNDAMENTALS_CACHE_PATH = os.path.join(DATA_DIR, "fundamentals.sqlite3")
+FUNDAMENTALS_MAX_WORKERS = 8
+
+# Technical indicators (bars per ticker in the panel; ~1 year for the 52-week range)
+INDICATOR_PANEL_LENGTH = 260
+INDICATOR_LOAD_WORKERS = 8
+
+# LLM response cache
+LLM_CACHE_PATH = os.path.join(DATA_DIR, "llm_cache.sqlite3")
+LLM_CACHE_TTL_SECONDS = 6 * 60 * 60
+LLM_CACHE_MAX_ENTRIES = 5000
+
+# Reuse of historical market reactions: a new history-search query within
+# this cosine similarity of an answered one gets the stored reaction
+REACTION_INDEX_PATH = os.path.join(DATA_DIR, "reaction_index.sqlite3")
+REACTION_INDEX_THRESHOLD = 0.87
+REACTION_INDEX_TTL_SECONDS = 7 * 24 * 60 * 60
+REACTION_INDEX_MAX_ENTRIES = 5000
+
+# Archive of every fetched article (FTS5 search); /analyze can answer a
+# keyword fetched within NEWS_ARCHIVE_FRESH_SECONDS from it instead of Serper.
+# Point NEWS_ARCHIVE_PATH at one file to share the archive with the scheduler.
+NEWS_ARCHIVE_PATH = os.getenv("NEWS_ARCHIVE_PATH", os.path.join(DATA_DIR, "news_archive.sqlite3"))
+NEWS_ARCHIVE_FRESH_SECONDS = 15 * 60
+NEWS_ARCHIVE_WINDOW_HOURS = 24
+
 import json
 
 # Watchlist
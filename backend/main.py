@@ -1,17 +1,36 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Tuple
 import uvicorn
 import os
+import json
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
-from modules.news_fetcher import fetch_news
+from modules.news_fetcher import fetch_news_many
 from modules.ai_analyzer import analyze_news
 from modules.stock_recommender import recommend_stocks
-from modules.finance_analyzer import get_financial_summary
-from modules.chart_generator import generate_chart
+from modules.security_master import LISTING_SOURCES, refresh_listings, validate_recommendations
+from modules.stock_enricher import enrich_stock, start_indicators
 from modules.telegram_bot import send_alert
+from modules.llm_cache import get_llm_cache
+from modules.reaction_index import get_reaction_index
+from modules.news_archive import get_news_archive
+from modules.price_loader import price_loader_scope
+from modules.chart_renderer import get_chart_renderer
+from modules.chart_data import get_chart_data, encode_binary
+from modules.prompt_packer import PromptContext, pack_news
+from utils import http_client
+from utils.singleflight import SingleFlight
+from utils.rate_limiter import get_rate_limiter
+from config import (
+    ANALYZE_CACHE_TTL_SECONDS, ANALYZE_CACHE_MAX_ENTRIES, CHART_RENDER_WORKERS, CHART_PNG_ENABLED,
+    CHART_DATA_DEFAULT_DAYS, CHART_DATA_DEFAULT_POINTS, CHART_DATA_MAX_POINTS
+)
 import asyncio
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -19,7 +38,20 @@ from fastapi.middleware.cors import CORSMiddleware
 # Load env vars
 load_dotenv()
 
-app = FastAPI(title="AI Stock News Analyst")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the security master in the background so ticker validation never waits for a listing download
+    refresh_listings(list(LISTING_SOURCES))
+    # Start chart workers before serving so the first request does not pay for spawning them
+    renderer = get_chart_renderer()
+    if CHART_PNG_ENABLED and CHART_RENDER_WORKERS > 0:
+        await run_in_threadpool(renderer.start)
+    yield
+    await run_in_threadpool(renderer.shutdown)
+    # Connections pooled by fetch_news_many and other async upstream calls on this loop
+    await http_client.close_async_client()
+
+app = FastAPI(title="AI Stock News Analyst", lifespan=lifespan)
 
 # CORS Configuration
 app.add_middleware(
@@ -34,9 +66,14 @@ app.add_middleware(
 os.makedirs("static/charts", exist_ok=True)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# Identical /analyze requests share one pipeline run and its result for a short while
+analysis_flight = SingleFlight(ANALYZE_CACHE_TTL_SECONDS, ANALYZE_CACHE_MAX_ENTRIES)
+
 class AnalysisRequest(BaseModel):
     keywords: List[str]
     markets: List[str] = ["KRX", "US"]
+    # Answer keywords searched within the last few minutes from the news archive
+    use_archive: bool = False
 
 class StockInfo(BaseModel):
     name: str
@@ -46,12 +83,22 @@ class StockInfo(BaseModel):
     price: Optional[float] = None
     change: Optional[float] = None
     chart_url: Optional[str] = None
+    chart_data_url: Optional[str] = None
+    indicators: Optional[Dict[str, Optional[float]]] = None
 
 class NewsItem(BaseModel):
     title: str
     link: str
     date: str
 
+class ArchivedNewsItem(NewsItem):
+    snippet: str
+    source: Optional[str] = None
+
+class NewsSearchResponse(BaseModel):
+    query: str
+    results: List[ArchivedNewsItem]
+
 class AnalysisResponse(BaseModel):
     news_summary: str
     themes: List[str]
@@ -62,97 +109,264 @@ class AnalysisResponse(BaseModel):
 def read_root():
     return {"message": "AI Stock News Analyst API is running"}
 
-@app.post("/analyze", response_model=AnalysisResponse)
-async def analyze_keyword(request: AnalysisRequest):
-    keywords = request.keywords
-    markets = request.markets
-    print(f"Analyzing keywords: {keywords}, Markets: {markets}")
-    
+@app.get("/cache-stats")
+def cache_stats():
+    cache = get_llm_cache()
+    limiter = get_rate_limiter()
+    reactions = get_reaction_index()
+    archive = get_news_archive()
+    return {
+        "llm": cache.stats() if cache else None,
+        "reactions": reactions.stats() if reactions else None,
+        "news_archive": archive.stats() if archive else None,
+        "analyze": analysis_flight.stats(),
+        "rate_limits": limiter.stats() if limiter else None
+    }
+
+def _archived_news(keywords: List[str], n: int) -> List[Optional[List[Dict[str, Any]]]]:
+    archive = get_news_archive()
+    return [archive.recent(keyword, n) if archive else None for keyword in keywords]
+
+async def _collect_news(keywords: List[str], use_archive: bool = False) -> PromptContext:
     all_news_items = []
     
-    # 1. Fetch News for all keywords
-    for keyword in keywords:
-        items = fetch_news(keyword, n=3) # Fetch 3 per keyword to avoid too much noise
+    # Keywords fetched recently come from the archive; the rest are fetched concurrently
+    n = 3 # Fetch 3 per keyword to avoid too much noise
+    archived = await run_in_threadpool(_archived_news, keywords, n) if use_archive else [None] * len(keywords)
+    missing = [keyword for keyword, items in zip(keywords, archived) if items is None]
+    results = [items for items in archived if items is not None]
+    if missing:
+        results.extend(await fetch_news_many(missing, n=n))
+    for items in results:
         all_news_items.extend(items)
         
     if not all_news_items:
         raise HTTPException(status_code=404, detail="No news found")
         
-    # Deduplicate by link
+    # Deduplicate by link, then rank, drop near-duplicate stories and fit the token budget
     unique_news = {item['link']: item for item in all_news_items}.values()
-    # Convert back to list and limit to top 5-7 to avoid token limits
-    final_news_items = list(unique_news)[:7]
-        
-    # 2. Analyze News (Summary & Themes)
-    combined_snippet = "\n".join([f"- {item['title']}: {item.get('snippet','')}" for item in final_news_items])
-    
-    # Use the first item for the main "Analysis" object structure or create a dummy one
-    # We need a way to summarize ALL news. 
-    # Let's pass the combined snippet to a modified analyze_news or just use the first one for structure
-    # and rely on stock_recommender for the real synthesis.
-    
-    # For MVP, let's analyze the first item to get themes, 
-    # BUT this is weak if keywords are different.
-    # Better: Use Gemini to summarize the combined text.
-    # We will reuse analyze_news but pass a "Synthetic" news item containing all info.
-    
+    return pack_news(list(unique_news), keywords)
+
+def _format_news(news_items: List[Dict[str, Any]]) -> List[NewsItem]:
+    return [
+        NewsItem(
+            title=item.get('title', 'No Title'),
+            link=item.get('link', '#'),
+            date=item.get('date', 'Recent')
+        ) for item in news_items
+    ]
+
+async def _summarize_news(keywords: List[str], news_context: str) -> Tuple[str, List[str]]:
+    # We need a way to summarize ALL news, so analyze_news gets a
+    # "Synthetic" news item containing all info.
     synthetic_news = {
         "title": f"News Summary for {', '.join(keywords)}",
-        "snippet": combined_snippet,
+        "snippet": news_context,
         "link": ""
     }
     
-    analysis_result = analyze_news(synthetic_news)
+    analysis_result = await run_in_threadpool(analyze_news, synthetic_news)
     
     if not analysis_result:
          raise HTTPException(status_code=500, detail="AI Analysis failed")
          
     themes = analysis_result.get('themes', [])
     news_summary = analysis_result.get('reason', 'No summary available')
+    return news_summary, themes
+
+async def _recommend(themes: List[str], news_context: str, markets: List[str]) -> List[Dict[str, Any]]:
+    recommendations = await run_in_threadpool(recommend_stocks, themes, news_context, markets)
+    # Drop hallucinated tickers before spending chart/price work on them
+    return await run_in_threadpool(validate_recommendations, recommendations, markets)
+
+def _to_stock_info(stock: Dict[str, Any]) -> StockInfo:
+    chart_path = stock.get('chart_path')
+    # Convert local path to URL (assuming running locally)
+    chart_url = f"/static/charts/{os.path.basename(chart_path)}" if chart_path else None
     
-    # 3. Recommend Stocks
-    # Pass markets to recommender
-    recommendations = recommend_stocks(themes, combined_snippet, markets)
-    
-    # 4. Enrich with Financials & Charts
-    enriched_stocks = []
-    for stock in recommendations:
-        ticker = stock.get('ticker')
-        market = stock.get('market')
+    return StockInfo(
+        name=stock.get('name'),
+        ticker=stock.get('ticker'),
+        market=stock.get('market'),
+        reason=stock.get('reason'),
+        price=stock.get('price'),
+        change=stock.get('change'),
+        chart_url=chart_url,
+        chart_data_url=f"/chart-data/{stock.get('market')}/{stock.get('ticker')}",
+        indicators=stock.get('indicators')
+    )
+
+@app.get("/chart-data/{market}/{ticker}")
+async def chart_data(market: str, ticker: str,
+                     days: int = Query(CHART_DATA_DEFAULT_DAYS, ge=7, le=3650),
+                     points: int = Query(CHART_DATA_DEFAULT_POINTS, ge=3, le=CHART_DATA_MAX_POINTS),
+                     format: str = Query("json", pattern="^(json|binary)$")):
+    """
+    Daily OHLCV bars for client-side charts, downsampled with LTTB.
+
+    `format=json` returns columns (t, o, h, l, c, v); `format=binary`
+    returns the same columns packed as described in chart_data.encode_binary.
+    """
+    if market not in ("KRX", "US"):
+        raise HTTPException(status_code=400, detail="Unknown market")
+
+    data = await run_in_threadpool(get_chart_data, ticker, market, days, points)
+    if not data["t"]:
+        raise HTTPException(status_code=404, detail="No price data")
+
+    headers = {"Cache-Control": "public, max-age=300"}
+    if format == "binary":
+        return Response(encode_binary(data), media_type="application/octet-stream", headers=headers)
+    return Response(json.dumps(data, separators=(",", ":")), media_type="application/json", headers=headers)
+
+@app.get("/news/search", response_model=NewsSearchResponse)
+async def news_search(q: str = Query(..., min_length=1, max_length=200),
+                      limit: int = Query(20, ge=1, le=100),
+                      hours: Optional[float] = Query(None, gt=0)):
+    """
+    Full-text search over every article fetched so far, best match first,
+    optionally limited to articles from the last `hours`. Serper is not called.
+    """
+    archive = get_news_archive()
+    if not archive:
+        raise HTTPException(status_code=503, detail="News archive unavailable")
+
+    results = await run_in_threadpool(archive.search, q, limit, hours)
+    return {
+        "query": q,
+        "results": [dict(item, date=item.get('date') or 'Recent') for item in results]
+    }
+
+def _analysis_key(keywords: List[str], markets: List[str], use_archive: bool) -> Tuple[Tuple[str, ...], Tuple[str, ...], bool]:
+    normalized_keywords = sorted({keyword.strip().lower() for keyword in keywords if keyword.strip()})
+    normalized_markets = sorted({market.strip().upper() for market in markets})
+    return tuple(normalized_keywords), tuple(normalized_markets), use_archive
+
+class AnalysisRun:
+    """
+    One analysis shared by every /analyze and /analyze/stream caller with
+    the same keywords, markets and archive option.
+
+    Each stage publishes its result in a future as soon as it is ready:
+    `news` (PromptContext), `analysis` (summary, themes), `stocks` (one
+    task per recommended stock, resolving to its StockInfo) and `result`
+    (the full AnalysisResponse dict). A stream that joins late replays
+    the finished stages and follows the rest.
+    """
+
+    def __init__(self):
+        loop = asyncio.get_running_loop()
+        self.news: asyncio.Future = loop.create_future()
+        self.analysis: asyncio.Future = loop.create_future()
+        self.stocks: asyncio.Future = loop.create_future()
+        self.result: asyncio.Future = loop.create_future()
+        self.task: Optional[asyncio.Task] = None
+
+    def fail(self, error: BaseException) -> None:
+        for future in (self.news, self.analysis, self.stocks, self.result):
+            if not future.done():
+                future.set_exception(error)
+                # Mark it retrieved; callers that are not waiting on this stage do not need it
+                future.exception()
+
+async def _enrich_to_stock_info(stock: Dict[str, Any], indicators: asyncio.Future) -> StockInfo:
+    return _to_stock_info(await enrich_stock(stock, indicators=indicators))
+
+async def _run_analysis(run: AnalysisRun, keywords: List[str], markets: List[str], use_archive: bool) -> None:
+    try:
+        # 1. Fetch News (packed once into the context both LLM stages share)
+        news_context = await _collect_news(keywords, use_archive)
+        run.news.set_result(news_context)
         
-        # Get Financials
-        fin = get_financial_summary(ticker, market)
+        # 2. Analyze News (Summary & Themes)
+        news_summary, themes = await _summarize_news(keywords, news_context.text)
+        run.analysis.set_result((news_summary, themes))
         
-        # Generate Chart
-        chart_path = generate_chart(ticker, market)
-        # Convert local path to URL (assuming running locally)
-        chart_url = f"/static/charts/{os.path.basename(chart_path)}" if chart_path else None
+        # 3. Recommend Stocks (validated against the listed securities)
+        # Pass markets to recommender
+        recommendations = await _recommend(themes, news_context.text, markets)
         
-        enriched_stocks.append(StockInfo(
-            name=stock.get('name'),
-            ticker=ticker,
-            market=market,
-            reason=stock.get('reason'),
-            price=fin.get('price'),
-            change=fin.get('change'),
-            chart_url=chart_url
-        ))
-    
-    # 5. Format News Items
-    formatted_news = [
-        NewsItem(
-            title=item.get('title', 'No Title'),
-            link=item.get('link', '#'),
-            date=item.get('date', 'Recent')
-        ) for item in final_news_items
-    ]
+        # 4. Enrich with Financials & Charts (all stocks at once, partial on timeout)
+        # One price-store read per ticker shared by summary and chart
+        with price_loader_scope():
+            # Indicators for all recommended tickers as one panel
+            indicators = start_indicators([stock['ticker'] for stock in recommendations])
+            stock_tasks = [asyncio.ensure_future(_enrich_to_stock_info(stock, indicators)) for stock in recommendations]
+        run.stocks.set_result(stock_tasks)
+        enriched_stocks = list(await asyncio.gather(*stock_tasks))
         
-    return {
-        "news_summary": news_summary,
-        "themes": themes,
-        "recommended_stocks": enriched_stocks,
-        "news_items": formatted_news
-    }
+        run.result.set_result({
+            "news_summary": news_summary,
+            "themes": themes,
+            "recommended_stocks": enriched_stocks,
+            "news_items": _format_news(news_context.items)
+        })
+    except BaseException as e:
+        run.fail(e)
+        if not isinstance(e, Exception):
+            raise
+
+def _start_analysis(keywords: List[str], markets: List[str], use_archive: bool) -> AnalysisRun:
+    run = AnalysisRun()
+    run.task = asyncio.ensure_future(_run_analysis(run, keywords, markets, use_archive))
+    return run
+
+def _analysis_run(keywords: List[str], markets: List[str], use_archive: bool) -> AnalysisRun:
+    # Identical requests, streamed or not, share one run until it finishes and for a short while after
+    key = _analysis_key(keywords, markets, use_archive)
+    return analysis_flight.share(key, lambda: _start_analysis(keywords, markets, use_archive), lambda run: run.result)
+
+@app.post("/analyze", response_model=AnalysisResponse)
+async def analyze_keyword(request: AnalysisRequest):
+    keywords = request.keywords
+    markets = request.markets
+    print(f"Analyzing keywords: {keywords}, Markets: {markets}")
+    
+    run = _analysis_run(keywords, markets, request.use_archive)
+    return await asyncio.shield(run.result)
+
+def _sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), ensure_ascii=False)}\n\n"
+
+@app.get("/analyze/stream")
+async def analyze_keyword_stream(keywords: List[str] = Query(...), markets: List[str] = Query(["KRX", "US"]),
+                                 use_archive: bool = False):
+    """
+    Streaming variant of /analyze using Server-Sent Events.
+    
+    Events are sent as each stage finishes: `news`, then `analysis`
+    (summary and themes), then one `stock` per enriched stock in completion
+    order, and finally `done`. Failures are reported as an `error` event.
+    The stages come from the same shared run as /analyze, so identical
+    concurrent requests do the work once.
+    """
+    print(f"Streaming analysis for keywords: {keywords}, Markets: {markets}")
+    
+    async def event_stream():
+        try:
+            run = _analysis_run(keywords, markets, use_archive)
+            # Shielded so a client that disconnects does not cancel the run other callers share
+            news_context = await asyncio.shield(run.news)
+            yield _sse_event("news", {"news_items": _format_news(news_context.items)})
+            
+            news_summary, themes = await asyncio.shield(run.analysis)
+            yield _sse_event("analysis", {"news_summary": news_summary, "themes": themes})
+            
+            for future in asyncio.as_completed(await asyncio.shield(run.stocks)):
+                yield _sse_event("stock", await future)
+                
+            yield _sse_event("done", {})
+        except HTTPException as e:
+            yield _sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+        except Exception as e:
+            print(f"Streaming analysis failed: {e}")
+            yield _sse_event("error", {"status_code": 500, "detail": "Analysis failed"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.post("/send-telegram")
 async def trigger_telegram(response: AnalysisResponse):
@@ -1,15 +1,18 @@
-import requests
 import json
 import os
 from typing import Optional, Dict, Any, List
-from config import GEMINI_API_KEY
+from config import GEMINI_API_KEY, GEMINI_BASE_URL
 from modules.news_fetcher import search_past_reaction
+from modules.llm_cache import get_llm_cache
+from modules.reaction_index import reused_reaction, remember_reaction
+from utils import http_client
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 # Use REST API directly to avoid Python 3.8 SDK compatibility issues
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+GEMINI_MODEL = "gemini-2.0-flash"
+GEMINI_API_URL = f"{GEMINI_BASE_URL}/v1beta/models/{GEMINI_MODEL}:generateContent"
 
 def _call_gemini_api(prompt: str) -> Optional[str]:
     """
@@ -25,6 +28,13 @@ def _call_gemini_api(prompt: str) -> Optional[str]:
         logger.error("GEMINI_API_KEY is missing.")
         return None
         
+    # Byte-identical prompts are answered from the local cache
+    cache = get_llm_cache()
+    if cache:
+        cached = cache.get(GEMINI_MODEL, prompt)
+        if cached is not None:
+            return cached
+        
     headers = {
         "Content-Type": "application/json"
     }
@@ -38,7 +48,7 @@ def _call_gemini_api(prompt: str) -> Optional[str]:
     }
     
     try:
-        response = requests.post(GEMINI_API_URL, headers=headers, params=params, json=payload)
+        response = http_client.post('gemini', GEMINI_API_URL, headers=headers, params=params, json=payload)
         response.raise_for_status()
         result = response.json()
         
@@ -46,6 +56,8 @@ def _call_gemini_api(prompt: str) -> Optional[str]:
         # Structure: candidates[0].content.parts[0].text
         if "candidates" in result and result["candidates"]:
             content = result["candidates"][0]["content"]["parts"][0]["text"]
+            if cache and content:
+                cache.set(GEMINI_MODEL, prompt, content)
             return content
         else:
             logger.warning(f"Empty or unexpected response from Gemini: {result}")
@@ -108,14 +120,19 @@ def analyze_news(news_item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
                 "original_news": news_item
             }
             
-        # Step 2: Historical Context Search
+        # A near-identical query answered recently skips both the search and the synthesis
         search_query = analysis.get('search_query')
+        reused = reused_reaction(search_query) if search_query else None
+        
+        # Step 2: Historical Context Search
         past_results = []
-        if search_query:
+        if search_query and not reused:
             past_results = search_past_reaction(search_query)
             
         # Step 3: Synthesis
-        if past_results:
+        if reused:
+            historical_reaction = reused
+        elif past_results:
             past_context = "\n".join([f"- {r.get('title')}: {r.get('snippet')}" for r in past_results])
             
             prompt_2 = f"""
@@ -129,6 +146,8 @@ def analyze_news(news_item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             historical_reaction = _call_gemini_api(prompt_2)
             if not historical_reaction:
                 historical_reaction = "Failed to summarize history."
+            else:
+                remember_reaction(search_query, historical_reaction)
         else:
             historical_reaction = "No historical context found."
             
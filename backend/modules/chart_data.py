@@ -0,0 +1,97 @@
+import struct
+from datetime import datetime, timedelta
+from typing import Any, Dict
+from config import CHART_DATA_DEFAULT_DAYS, CHART_DATA_DEFAULT_POINTS
+from modules.price_loader import load_price_history
+from utils.lazy_import import lazy_import
+from utils.logger import setup_logger
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+logger = setup_logger(__name__)
+
+# Binary layout: magic, version, point count, then one little-endian column per field
+BINARY_MAGIC = b"OHLC"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sHI")
+EPOCH = "1970-01-01"
+
+def lttb_indices(values: "np.ndarray", threshold: int) -> "np.ndarray":
+    """
+    Largest-Triangle-Three-Buckets: picks `threshold` points that keep the
+    visual shape of the series (first and last points always included).
+
+    Returns:
+        Sorted positions into `values`.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float)
+    y = np.asarray(values, dtype=float)
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+
+    selected = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        # Triangle with the previous pick and the average of the next bucket
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[selected] - avg_x) * (y[start:end] - y[selected])
+                      - (x[selected] - x[start:end]) * (avg_y - y[selected]))
+        selected = start + int(np.argmax(area))
+        indices[i + 1] = selected
+    return indices
+
+def get_chart_data(ticker: str, market: str, days: int = CHART_DATA_DEFAULT_DAYS,
+                   points: int = CHART_DATA_DEFAULT_POINTS) -> Dict[str, Any]:
+    """
+    Returns the last `days` calendar days of daily bars, downsampled with
+    LTTB (on the close) to at most `points` bars, as columns.
+
+    Returns:
+        {"ticker", "market", "t" (YYYY-MM-DD), "o", "h", "l", "c", "v"};
+        the columns are empty if there is no data or loading failed.
+    """
+    start = datetime.now() - timedelta(days=days)
+    try:
+        df = load_price_history(ticker, start).dropna(subset=['Close'])
+    except Exception as e:
+        logger.error(f"Error loading chart data for {ticker}: {e}")
+        df = pd.DataFrame(columns=['Close'])
+    if not df.empty:
+        df = df.iloc[lttb_indices(df['Close'].to_numpy(), points)]
+
+    def column(name: str, digits: int):
+        series = df[name] if name in df.columns else df['Close']
+        return series.round(digits).tolist()
+
+    return {
+        "ticker": ticker,
+        "market": market,
+        "t": [ts.strftime('%Y-%m-%d') for ts in df.index],
+        "o": column('Open', 4),
+        "h": column('High', 4),
+        "l": column('Low', 4),
+        "c": column('Close', 4),
+        "v": df['Volume'].fillna(0).astype('int64').tolist() if 'Volume' in df.columns else [0] * len(df),
+    }
+
+def encode_binary(data: Dict[str, Any]) -> bytes:
+    """
+    Packs chart data as: header (b"OHLC", uint16 version, uint32 count),
+    int32 days since 1970-01-01, then float32 open/high/low/close/volume,
+    all little-endian.
+    """
+    count = len(data["t"])
+    days = (pd.to_datetime(data["t"]) - pd.Timestamp(EPOCH)).days.to_numpy(dtype='<i4') if count else np.empty(0, dtype='<i4')
+    parts = [BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, count), days.tobytes()]
+    for key in ("o", "h", "l", "c", "v"):
+        parts.append(np.asarray(data[key], dtype='<f4').tobytes())
+    return b"".join(parts)
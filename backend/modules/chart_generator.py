@@ -1,41 +1,160 @@
-import FinanceDataReader as fdr
-import mplfinance as mpf
+import asyncio
+import contextvars
+import hashlib
 import os
+import threading
+import time
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from config import CHART_CACHE_MAX_BYTES, CHART_CACHE_MAX_AGE_SECONDS
+from modules.chart_renderer import get_chart_renderer
+from modules.price_loader import load_price_history
+from utils.lazy_import import lazy_import
 from utils.logger import setup_logger
 
+# Headless backend; matplotlib reads this when mplfinance first imports it
+os.environ["MPLBACKEND"] = "Agg"
+mpf = lazy_import("mplfinance")
+pd = lazy_import("pandas")
+
 logger = setup_logger(__name__)
 
 CHART_DIR = "static/charts"
 os.makedirs(CHART_DIR, exist_ok=True)
 
-def generate_chart(ticker: str, market: str) -> str:
+# matplotlib is not thread-safe; in-process renders (no renderer running) must not overlap
+_render_lock = threading.Lock()
+
+def _chart_filename(ticker: str, last_bar_date: datetime, style: str) -> str:
+    # Content-addressed: the same (ticker, last bar, style) always maps to the same file
+    key = f"{ticker}|{last_bar_date:%Y-%m-%d}|{style}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+    return f"{ticker}_{last_bar_date:%Y%m%d}_{digest}.png"
+
+def evict_charts(max_bytes: int = CHART_CACHE_MAX_BYTES, max_age_seconds: int = CHART_CACHE_MAX_AGE_SECONDS) -> int:
+    """
+    Removes cached charts older than `max_age_seconds`, then removes the least
+    recently used ones until the directory fits in `max_bytes`.
+
+    Returns:
+        Number of files removed.
+    """
+    entries = []
+    for name in os.listdir(CHART_DIR):
+        if not name.endswith('.png'):
+            continue
+        path = os.path.join(CHART_DIR, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    # mtime doubles as last-access time: cache hits touch the file
+    entries.sort()
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in entries:
+        if now - mtime <= max_age_seconds and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+
+    if removed:
+        logger.info(f"Evicted {removed} cached charts")
+    return removed
+
+def render_chart(df: "pd.DataFrame", ticker: str, style: str, filepath: str) -> str:
+    """
+    Renders a candlestick chart of `df` to `filepath`. Runs in a chart
+    renderer worker process, or in-process when no renderer is running.
+    """
+    # Unique temp file so concurrent renders never write to the same path
+    tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    mpf.plot(
+        df,
+        type='candle',
+        style=style,
+        title=f"{ticker} Daily Chart",
+        savefig=dict(fname=tmp_path, format='png'),
+        volume=True
+    )
+    os.replace(tmp_path, filepath)
+    return filepath
+
+def _prepare_chart(ticker: str, style: str) -> "Tuple[Optional[pd.DataFrame], str]":
+    """
+    Loads the chart data and resolves the cached file name.
+
+    Returns:
+        (None, path) on a cache hit, (df, path) if a render is needed and
+        (None, "") if there is no data.
+    """
+    # Fetch data for last 6 months
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=180)
+
+    df = load_price_history(ticker, start_date, end_date)
+    if df.empty:
+        return None, ""
+
+    filepath = os.path.join(CHART_DIR, _chart_filename(ticker, df.index[-1], style))
+    if os.path.exists(filepath):
+        os.utime(filepath)
+        return None, filepath
+    return df, filepath
+
+def generate_chart(ticker: str, market: str, style: str = 'charles') -> str:
     """
     Generates a candlestick chart for the given ticker and saves it as an image.
     Returns the path to the saved image.
+
+    Charts are cached by (ticker, last bar date, style), so repeat requests
+    return the existing file without rendering. Renders go to the chart
+    renderer's worker processes when it is running.
     """
     try:
-        # Fetch data for last 6 months
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=180)
-        
-        df = fdr.DataReader(ticker, start_date, end_date)
-        if df.empty:
-            return ""
-            
-        filename = f"{ticker}_{datetime.now().strftime('%Y%m%d%H%M%S')}.png"
-        filepath = os.path.join(CHART_DIR, filename)
-        
-        # Plot
-        mpf.plot(
-            df, 
-            type='candle', 
-            style='charles', 
-            title=f"{ticker} Daily Chart",
-            savefig=filepath,
-            volume=True
-        )
-        
+        df, filepath = _prepare_chart(ticker, style)
+        if df is None:
+            return filepath
+
+        renderer = get_chart_renderer()
+        if renderer.running:
+            renderer.submit(filepath, render_chart, df, ticker, style, filepath).result()
+        else:
+            with _render_lock:
+                if not os.path.exists(filepath):
+                    render_chart(df, ticker, style, filepath)
+
+        evict_charts()
+        return filepath
+    except Exception as e:
+        logger.error(f"Error generating chart for {ticker}: {e}")
+        return ""
+
+async def generate_chart_async(ticker: str, market: str, style: str = 'charles') -> str:
+    """
+    Async generate_chart: data loading runs in a thread and the render in
+    a renderer worker process, so the event loop is never blocked.
+    """
+    renderer = get_chart_renderer()
+    loop = asyncio.get_running_loop()
+    if not renderer.running:
+        return await loop.run_in_executor(None, contextvars.copy_context().run, generate_chart, ticker, market, style)
+
+    try:
+        df, filepath = await loop.run_in_executor(None, contextvars.copy_context().run, _prepare_chart, ticker, style)
+        if df is None:
+            return filepath
+
+        # Shielded: the render may be shared with other requests, so a timeout here must not cancel it
+        await asyncio.shield(asyncio.wrap_future(renderer.submit(filepath, render_chart, df, ticker, style, filepath)))
+        await loop.run_in_executor(None, evict_charts)
         return filepath
     except Exception as e:
         logger.error(f"Error generating chart for {ticker}: {e}")
@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from config import CHART_RENDER_WORKERS
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+def _init_worker() -> None:
+    # Pay the matplotlib/mplfinance import (and font cache load) once per worker, not per chart
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot  # noqa: F401
+    import mplfinance  # noqa: F401
+
+def _ready() -> int:
+    return os.getpid()
+
+class ChartRenderer:
+    """
+    Pool of worker processes that render charts in parallel.
+
+    Workers are started with the Agg backend and mplfinance already
+    imported, so a job only pays for the plot itself. Concurrent jobs for
+    the same output file share one render.
+    """
+
+    def __init__(self, workers: int = CHART_RENDER_WORKERS):
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None
+
+    def start(self) -> "ChartRenderer":
+        """
+        Creates the spawn-context process pool and waits for it to answer
+        one no-op job per worker. Processes are started by the executor as
+        it needs them, so this does not guarantee that every worker is up.
+        """
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the API process runs threads and an event loop
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+                pool = self._pool
+            else:
+                return self
+        pids = {future.result() for future in [pool.submit(_ready) for _ in range(self.workers)]}
+        logger.info(f"Chart renderer ready with {len(pids)} worker processes")
+        return self
+
+    def submit(self, key: str, fn: Callable[..., Any], *args: Any) -> Future:
+        """
+        Runs `fn(*args)` in a worker. A job with the same `key` that is
+        still running is reused instead of starting another.
+        """
+        with self._lock:
+            if self._pool is None:
+                raise RuntimeError("Chart renderer is not running")
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._pool.submit(fn, *args)
+                self._inflight[key] = future
+                future.add_done_callback(lambda done: self._forget(key, done))
+            return future
+
+    def _forget(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._inflight.clear()
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+            logger.info("Chart renderer stopped")
+
+_renderer = ChartRenderer()
+
+def get_chart_renderer() -> ChartRenderer:
+    """
+    Returns the process-wide renderer. It renders nothing until started
+    (the API starts it on startup); until then charts render in-process.
+    """
+    return _renderer
@@ -1,5 +1,5 @@
-import FinanceDataReader as fdr
 from typing import Dict, Any, Optional
+from modules.price_loader import load_price_history
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -13,8 +13,8 @@ def get_financial_summary(ticker: str, market: str) -> Dict[str, Any]:
         # We might need to map 'US' to a specific exchange or just try 'NASDAQ'.
         # For simplicity, if market is 'US', we assume it's a valid ticker for FDR (e.g., 'AAPL', 'TSLA').
         
-        # Get current price
-        df = fdr.DataReader(ticker)
+        # Get current price from the local store (only new bars are downloaded)
+        df = load_price_history(ticker)
         if df.empty:
             return {}
             
@@ -1,11 +1,28 @@
-import requests
+import httpx
+import asyncio
 import json
-from typing import List, Dict, Any
-from config import SERPER_API_KEY
+from typing import List, Dict, Any, Optional
+from config import SERPER_API_KEY, SERPER_BASE_URL, SERPER_MAX_CONCURRENCY
+from modules.news_archive import get_news_archive
+from utils import http_client
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+SERPER_NEWS_URL = f"{SERPER_BASE_URL}/news"
+SERPER_SEARCH_URL = f"{SERPER_BASE_URL}/search"
+
+def _serper_headers() -> Dict[str, str]:
+    return {
+        'X-API-KEY': SERPER_API_KEY or '',
+        'Content-Type': 'application/json'
+    }
+
+def _archive(query: str, news_items: List[Dict[str, Any]]) -> None:
+    archive = get_news_archive()
+    if archive and news_items:
+        archive.store(query, news_items)
+
 def fetch_news(query: str, n: int = 5) -> List[Dict[str, Any]]:
     """
     Fetches news from Serper Dev API.
@@ -17,7 +34,7 @@ def fetch_news(query: str, n: int = 5) -> List[Dict[str, Any]]:
     Returns:
         List of news items (dictionaries).
     """
-    url = "https://google.serper.dev/news"
+    url = SERPER_NEWS_URL
     
     # Payload construction
     payload_dict = {
@@ -26,15 +43,11 @@ def fetch_news(query: str, n: int = 5) -> List[Dict[str, Any]]:
         "tbs": "qdr:d" # Last 24 hours
     }
     
-    headers = {
-        'X-API-KEY': SERPER_API_KEY,
-        'Content-Type': 'application/json'
-    }
-    
     try:
-        response = requests.post(url, headers=headers, data=json.dumps(payload_dict))
+        response = http_client.post('serper', url, headers=_serper_headers(), data=json.dumps(payload_dict))
         response.raise_for_status()
         results = response.json().get("news", [])
+        _archive(query, results)
         return results
     except Exception as e:
         logger.error(f"Error fetching news for {query}: {e}")
@@ -52,21 +65,98 @@ def search_past_reaction(query: str) -> List[Dict[str, Any]]:
     """
     # Search for historical context
     search_query = f"{query} stock price reaction history"
-    url = "https://google.serper.dev/search"
+    url = SERPER_SEARCH_URL
     payload_dict = {
         "q": search_query,
         "num": 3
     }
-    headers = {
-        'X-API-KEY': SERPER_API_KEY,
-        'Content-Type': 'application/json'
+    try:
+        response = http_client.post('serper', url, headers=_serper_headers(), data=json.dumps(payload_dict))
+        response.raise_for_status()
+        results = response.json().get("organic", [])
+        return results
+    except Exception as e:
+        logger.error(f"Error searching past reaction for {query}: {e}")
+        return []
+
+async def fetch_news_async(client: Optional[httpx.AsyncClient], query: str, n: int = 5) -> List[Dict[str, Any]]:
+    """
+    Async version of fetch_news using a shared httpx client.
+    
+    Args:
+        client: AsyncClient to use, or None for the shared pooled client.
+        query: Search query string.
+        n: Number of results to return.
+        
+    Returns:
+        List of news items (dictionaries).
+    """
+    payload_dict = {
+        "q": query,
+        "num": n,
+        "tbs": "qdr:d" # Last 24 hours
     }
     
     try:
-        response = requests.post(url, headers=headers, data=json.dumps(payload_dict))
+        response = await http_client.async_post('serper', SERPER_NEWS_URL, client=client, headers=_serper_headers(), json=payload_dict)
         response.raise_for_status()
-        results = response.json().get("organic", [])
+        results = response.json().get("news", [])
+        # SQLite work runs in a worker thread so the event loop keeps serving
+        await asyncio.to_thread(_archive, query, results)
         return results
+    except Exception as e:
+        logger.error(f"Error fetching news for {query}: {e}")
+        return []
+
+async def search_past_reaction_async(client: Optional[httpx.AsyncClient], query: str) -> List[Dict[str, Any]]:
+    """
+    Async version of search_past_reaction using a shared httpx client.
+    
+    Args:
+        client: AsyncClient to use, or None for the shared pooled client.
+        query: Search query string.
+        
+    Returns:
+        List of search results (dictionaries).
+    """
+    payload_dict = {
+        "q": f"{query} stock price reaction history",
+        "num": 3
+    }
+    
+    try:
+        response = await http_client.async_post('serper', SERPER_SEARCH_URL, client=client, headers=_serper_headers(), json=payload_dict)
+        response.raise_for_status()
+        return response.json().get("organic", [])
     except Exception as e:
         logger.error(f"Error searching past reaction for {query}: {e}")
         return []
+
+async def fetch_news_many(
+    queries: List[str],
+    n: int = 5,
+    max_concurrency: int = SERPER_MAX_CONCURRENCY,
+    client: Optional[httpx.AsyncClient] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Fetches news for several queries concurrently.
+    
+    All queries share one connection pool and at most `max_concurrency`
+    requests are in flight at the same time.
+    
+    Args:
+        queries: Search query strings.
+        n: Number of results to return per query.
+        max_concurrency: Upper bound on simultaneous Serper requests.
+        client: Optional AsyncClient to use instead of the shared pooled client.
+        
+    Returns:
+        One list of news items per query, in the same order as `queries`.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def _bounded_fetch(query: str) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await fetch_news_async(client, query, n)
+    
+    return list(await asyncio.gather(*[_bounded_fetch(q) for q in queries]))
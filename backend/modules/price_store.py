@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Union
+from config import PRICE_STORE_DIR, PRICE_STORE_LOOKBACK_DAYS, PRICE_STORE_REFRESH_SECONDS
+from utils.lazy_import import lazy_import
+from utils.logger import setup_logger
+
+fdr = lazy_import("FinanceDataReader")
+pd = lazy_import("pandas")
+
+logger = setup_logger(__name__)
+
+DateLike = Union[str, datetime, "pd.Timestamp", None]
+
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+def _ticker_lock(ticker: str) -> threading.Lock:
+    with _locks_guard:
+        if ticker not in _locks:
+            _locks[ticker] = threading.Lock()
+        return _locks[ticker]
+
+def _store_path(ticker: str) -> str:
+    safe_ticker = "".join(c if c.isalnum() else "_" for c in ticker.upper())
+    return os.path.join(PRICE_STORE_DIR, f"{safe_ticker}.parquet")
+
+def _read_store(path: str) -> "Optional[pd.DataFrame]":
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception as e:
+        logger.warning(f"Discarding unreadable price store file {path}: {e}")
+        return None
+
+def _write_store(path: str, df: "pd.DataFrame") -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Unique per process and thread: the ticker lock does not reach other processes (API workers, the bot)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _download(ticker: str, start: "pd.Timestamp", end: "Optional[pd.Timestamp]" = None) -> "pd.DataFrame":
+    df = fdr.DataReader(ticker, start, end)
+    if df is None:
+        return pd.DataFrame()
+    return df
+
+def _with_change(df: "pd.DataFrame") -> "pd.DataFrame":
+    # Not every FDR source provides Change, and incremental downloads start
+    # mid-series, so always derive it from the stored closes
+    df = df.copy()
+    df['Change'] = df['Close'].pct_change()
+    return df
+
+def _merge(stored: "pd.DataFrame", new: "pd.DataFrame") -> "pd.DataFrame":
+    if new.empty:
+        return stored
+    merged = pd.concat([stored, new])
+    # Later downloads win, so the in-progress bar of the last stored day gets refreshed
+    merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+    merged.attrs = dict(stored.attrs)
+    return _with_change(merged)
+
+def resolve_start(start: DateLike) -> "pd.Timestamp":
+    """
+    Returns `start` as a Timestamp, defaulting to PRICE_STORE_LOOKBACK_DAYS ago.
+    """
+    if start is not None:
+        return pd.Timestamp(start)
+    return pd.Timestamp(datetime.now().date() - timedelta(days=PRICE_STORE_LOOKBACK_DAYS))
+
+def get_price_history(ticker: str, start: DateLike = None, end: DateLike = None) -> "pd.DataFrame":
+    """
+    Returns daily OHLCV bars for a ticker from the local price store.
+
+    The first call for a ticker downloads PRICE_STORE_LOOKBACK_DAYS of
+    history (or from `start` if earlier). Later calls only download the
+    bars after the last stored date, at most once per
+    PRICE_STORE_REFRESH_SECONDS.
+
+    Args:
+        ticker: Ticker symbol understood by FinanceDataReader.
+        start: First date to return. Defaults to PRICE_STORE_LOOKBACK_DAYS ago.
+        end: Last date to return. Defaults to the latest stored bar.
+
+    Returns:
+        DataFrame indexed by date with Open/High/Low/Close/Volume/Change columns.
+        Empty if the ticker has no data.
+    """
+    start_ts = resolve_start(start)
+    end_ts = pd.Timestamp(end) if end is not None else None
+    path = _store_path(ticker)
+
+    with _ticker_lock(ticker):
+        stored = _read_store(path)
+
+        if stored is None or stored.empty:
+            df = _download(ticker, start_ts)
+            if df.empty:
+                return df
+            df = _with_change(df)
+            df.attrs['coverage_start'] = start_ts.isoformat()
+            _write_store(path, df)
+        else:
+            df = stored
+            changed = False
+
+            # Dates before the first bar may simply be holidays or pre-listing,
+            # so remember how far back we already asked for
+            coverage_start = pd.Timestamp(df.attrs.get('coverage_start', df.index[0]))
+
+            try:
+                if start_ts < coverage_start:
+                    logger.info(f"Backfilling {ticker} from {start_ts.date()}")
+                    df = _merge(df, _download(ticker, start_ts, df.index[0]))
+                    df.attrs['coverage_start'] = start_ts.isoformat()
+                    changed = True
+
+                if time.time() - os.path.getmtime(path) > PRICE_STORE_REFRESH_SECONDS:
+                    df = _merge(df, _download(ticker, df.index[-1]))
+                    changed = True
+            except Exception as e:
+                # Serve what we have; the refresh is retried on the next call
+                logger.warning(f"Price store refresh failed for {ticker}, serving stored bars: {e}")
+
+            if changed:
+                _write_store(path, df)
+
+    return df.loc[start_ts:end_ts]
@@ -0,0 +1,132 @@
+import math
+import re
+from typing import Any, Dict, FrozenSet, List
+from config import (
+    PROMPT_CONTEXT_TOKEN_BUDGET, PROMPT_SNIPPET_MAX_TOKENS, PROMPT_DUPLICATE_JACCARD, PROMPT_RECENCY_HALF_LIFE_HOURS
+)
+from modules.news_archive import age_hours
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SHINGLE_SIZE = 3
+WORD = re.compile(r"\w+")
+
+class PromptContext:
+    """
+    News context packed for the LLM: the chosen articles, most relevant
+    first, and the text built from them.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], text: str, tokens: int, duplicates: int, over_budget: int):
+        self.items = items
+        self.text = text
+        self.tokens = tokens
+        self.duplicates = duplicates
+        self.over_budget = over_budget
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count without a tokenizer: about 4 characters per token for
+    ASCII text and 1.5 for everything else (Hangul costs far more per
+    character). Errs on the high side.
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5)
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cuts `text` at a word boundary so that it fits in `max_tokens`.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    words = text.split()
+    low, high = 0, len(words)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(" ".join(words[:mid]) + " ...") <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return " ".join(words[:low]) + " ..." if low else ""
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> FrozenSet[str]:
+    words = WORD.findall(text.lower())
+    if len(words) < size:
+        return frozenset(words)
+    return frozenset(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def score_article(item: Dict[str, Any], keywords: List[str], half_life_hours: float = PROMPT_RECENCY_HALF_LIFE_HOURS) -> float:
+    """
+    Relevance to the keywords (a title hit counts double a snippet hit),
+    decayed by the article's age with the given half-life.
+    """
+    title = (item.get('title') or '').lower()
+    snippet = (item.get('snippet') or '').lower()
+    terms = [keyword.strip().lower() for keyword in keywords if keyword.strip()]
+    relevance = sum(2 if term in title else 1 if term in snippet else 0 for term in terms) / max(len(terms), 1)
+    recency = 0.5 ** (age_hours(item.get('date')) / half_life_hours)
+    return (1 + relevance) * recency
+
+def _article_line(item: Dict[str, Any], snippet_max_tokens: int) -> str:
+    snippet = truncate_to_tokens(item.get('snippet') or '', snippet_max_tokens)
+    return f"- {item.get('title', '')}: {snippet}"
+
+def pack_news(
+    news_items: List[Dict[str, Any]],
+    keywords: List[str],
+    budget: int = PROMPT_CONTEXT_TOKEN_BUDGET,
+    snippet_max_tokens: int = PROMPT_SNIPPET_MAX_TOKENS,
+    duplicate_threshold: float = PROMPT_DUPLICATE_JACCARD
+) -> PromptContext:
+    """
+    Builds the shared LLM news context.
+
+    Articles are ranked by score_article; an article whose word shingles
+    overlap an already chosen one by at least `duplicate_threshold`
+    (Jaccard) is treated as the same story and skipped. Chosen articles
+    are added, snippets capped at `snippet_max_tokens`, until `budget`
+    tokens are used; an article that does not fit is skipped so shorter
+    ones further down can still be used.
+
+    Args:
+        news_items: Candidate articles (title, snippet, link, date).
+        keywords: The user's search keywords.
+        budget: Token budget for the whole context.
+        snippet_max_tokens: Cap on each article's snippet.
+        duplicate_threshold: Jaccard similarity above which two articles are duplicates.
+
+    Returns:
+        PromptContext with the chosen articles and their text.
+    """
+    ranked = sorted(news_items, key=lambda item: score_article(item, keywords), reverse=True)
+
+    chosen: List[Dict[str, Any]] = []
+    chosen_shingles: List[FrozenSet[str]] = []
+    lines: List[str] = []
+    used = duplicates = over_budget = 0
+    for item in ranked:
+        item_shingles = shingles(f"{item.get('title', '')} {item.get('snippet', '')}")
+        if any(jaccard(item_shingles, other) >= duplicate_threshold for other in chosen_shingles):
+            duplicates += 1
+            continue
+
+        line = _article_line(item, snippet_max_tokens)
+        tokens = estimate_tokens(line) + 1 # newline
+        if used + tokens > budget:
+            over_budget += 1
+            continue
+
+        chosen.append(item)
+        chosen_shingles.append(item_shingles)
+        lines.append(line)
+        used += tokens
+
+    if duplicates or over_budget:
+        logger.info(f"Packed {len(chosen)} articles ({used} tokens); skipped {duplicates} duplicates, {over_budget} over budget")
+    return PromptContext(chosen, "\n".join(lines), used, duplicates, over_budget)
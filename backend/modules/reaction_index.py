@@ -0,0 +1,217 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+from config import (
+    REACTION_INDEX_PATH, REACTION_INDEX_THRESHOLD, REACTION_INDEX_TTL_SECONDS, REACTION_INDEX_MAX_ENTRIES
+)
+from utils.lazy_import import lazy_import
+from utils.logger import setup_logger
+
+np = lazy_import("numpy")
+
+logger = setup_logger(__name__)
+
+# Hashed feature space: character trigrams of each word plus the words themselves
+VECTOR_DIM = 1024
+NGRAM_SIZE = 3
+WORD_WEIGHT = 2.0
+WORD = re.compile(r"\w+")
+NUMBER = re.compile(r"^\d+$")
+
+def _hash(feature: str) -> int:
+    # crc32 is stable across processes, unlike the salted built-in hash()
+    return zlib.crc32(feature.encode('utf-8'))
+
+def vectorize(text: str) -> "np.ndarray":
+    """
+    L2-normalised hashed n-gram vector of `text`; texts sharing most of
+    their words and word fragments get a cosine similarity close to 1.
+    """
+    vector = np.zeros(VECTOR_DIM, dtype=np.float32)
+    for word in WORD.findall(text.lower()):
+        features = [(f"w:{word}", WORD_WEIGHT)]
+        padded = f"<{word}>"
+        features.extend((padded[i:i + NGRAM_SIZE], 1.0) for i in range(max(1, len(padded) - NGRAM_SIZE + 1)))
+        for feature, weight in features:
+            h = _hash(feature)
+            # The top bit picks the sign so colliding features tend to cancel rather than add up
+            vector[h % VECTOR_DIM] += weight if h & 0x80000000 else -weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def numbers(text: str) -> FrozenSet[str]:
+    return frozenset(word for word in WORD.findall(text) if NUMBER.match(word))
+
+class ReactionIndex:
+    """
+    Past history-search queries and the market reactions Gemini summarized
+    for them, stored in SQLite with one hashed n-gram vector per query.
+
+    `lookup` returns the stored reaction of the most similar query (cosine
+    top-k over an in-memory matrix, reloaded when another process has
+    written) if it is at least `threshold` similar and mentions the same
+    numbers, so "2008 crisis" is never answered with "2020 crisis".
+    Entries expire after `ttl_seconds`; beyond `max_entries` the oldest
+    are dropped.
+    """
+
+    def __init__(self, path: str, threshold: float, ttl_seconds: int, max_entries: int):
+        self.path = path
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        self._version: Optional[Tuple[int, int]] = None
+        self._queries: List[str] = []
+        self._reactions: List[str] = []
+        self._created = None
+        self._matrix = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS reaction_index ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " query TEXT NOT NULL,"
+                " reaction TEXT NOT NULL,"
+                " vector BLOB NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _refresh(self, conn: sqlite3.Connection) -> None:
+        # Rows are only ever appended or deleted, so (max id, count) changes whenever the table does
+        version = conn.execute("SELECT COALESCE(MAX(id), 0), COUNT(*) FROM reaction_index").fetchone()
+        if version == self._version:
+            return
+        rows = conn.execute("SELECT query, reaction, vector, created_at FROM reaction_index ORDER BY id").fetchall()
+        self._queries = [row[0] for row in rows]
+        self._reactions = [row[1] for row in rows]
+        self._created = np.array([row[3] for row in rows], dtype=np.float64)
+        self._matrix = (
+            np.vstack([np.frombuffer(row[2], dtype=np.float32) for row in rows])
+            if rows else np.zeros((0, VECTOR_DIM), dtype=np.float32)
+        )
+        self._version = version
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[float, str, str]]:
+        """
+        Returns up to `k` unexpired (similarity, query, reaction) entries,
+        most similar first.
+        """
+        vector = vectorize(query)
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            with self._connect() as conn:
+                self._refresh(conn)
+            if not self._queries:
+                return []
+            # Expired rows stay until the next add, so mask them before ranking
+            scores = np.where(self._created > cutoff, self._matrix @ vector, -np.inf)
+            top = np.argsort(-scores)[:k]
+            return [
+                (float(scores[i]), self._queries[i], self._reactions[i])
+                for i in top if np.isfinite(scores[i])
+            ]
+
+    def lookup(self, query: str) -> Optional[str]:
+        """
+        Returns the stored reaction for a query close enough to `query`, or None.
+        """
+        reaction = None
+        try:
+            wanted = numbers(query)
+            for score, stored_query, stored_reaction in self.search(query):
+                if score < self.threshold:
+                    break
+                if numbers(stored_query) == wanted:
+                    logger.info(f"Reusing reaction for '{stored_query}' ({score:.2f}) for '{query}'")
+                    reaction = stored_reaction
+                    break
+        except Exception as e:
+            logger.warning(f"Reaction index lookup failed: {e}")
+
+        with self._lock:
+            if reaction is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return reaction
+
+    def add(self, query: str, reaction: str) -> None:
+        now = time.time()
+        try:
+            vector = vectorize(query).tobytes()
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO reaction_index (query, reaction, vector, created_at) VALUES (?, ?, ?, ?)",
+                    (query, reaction, vector, now)
+                )
+                conn.execute("DELETE FROM reaction_index WHERE created_at <= ?", (now - self.ttl_seconds,))
+                conn.execute(
+                    "DELETE FROM reaction_index WHERE id IN ("
+                    " SELECT id FROM reaction_index ORDER BY id DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+        except Exception as e:
+            logger.warning(f"Reaction index write failed: {e}")
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        entries = None
+        try:
+            with self._connect() as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM reaction_index").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Reaction index stats failed: {e}")
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "entries": entries}
+
+_default_index: Optional[ReactionIndex] = None
+_default_index_lock = threading.Lock()
+
+def get_reaction_index() -> Optional[ReactionIndex]:
+    """
+    Returns the process-wide reaction index, or None if it cannot be opened.
+    """
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            try:
+                _default_index = ReactionIndex(
+                    REACTION_INDEX_PATH, REACTION_INDEX_THRESHOLD, REACTION_INDEX_TTL_SECONDS, REACTION_INDEX_MAX_ENTRIES
+                )
+            except Exception as e:
+                logger.error(f"Error opening reaction index at {REACTION_INDEX_PATH}: {e}")
+                return None
+        return _default_index
+
+def reused_reaction(search_query: str) -> Optional[str]:
+    """
+    Stored reaction for a query close to `search_query` from the
+    process-wide index, or None. A hit skips both the history search and
+    the synthesis call.
+    """
+    index = get_reaction_index()
+    return index.lookup(search_query) if index else None
+
+def remember_reaction(search_query: str, historical_reaction: str) -> None:
+    index = get_reaction_index()
+    if index:
+        index.add(search_query, historical_reaction)
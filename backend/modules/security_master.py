@@ -0,0 +1,229 @@
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from config import MARKET_KRX, MARKET_US, SECURITY_MASTER_DIR, SECURITY_MASTER_REFRESH_SECONDS
+from utils.lazy_import import lazy_import
+from utils.logger import setup_logger
+
+fdr = lazy_import("FinanceDataReader")
+pd = lazy_import("pandas")
+
+logger = setup_logger(__name__)
+
+# FinanceDataReader listings that make up each of our markets
+LISTING_SOURCES = {
+    MARKET_KRX: ["KRX"],
+    MARKET_US: ["NASDAQ", "NYSE", "AMEX"],
+}
+
+# After a failed download, wait this long before trying again
+FAILED_LOAD_RETRY_SECONDS = 60 * 60
+
+_listings: Dict[str, Tuple[float, List[Dict[str, str]]]] = {}
+_listings_lock = threading.Lock()
+
+def _listing_path(market: str) -> str:
+    return os.path.join(SECURITY_MASTER_DIR, f"{market.lower()}.parquet")
+
+def _download_listing(market: str) -> "pd.DataFrame":
+    frames = []
+    for source in LISTING_SOURCES[market]:
+        df = fdr.StockListing(source)
+        # KRX listings use Code, overseas listings use Symbol
+        ticker_col = 'Code' if 'Code' in df.columns else 'Symbol'
+        frame = df[[ticker_col, 'Name']].rename(columns={ticker_col: 'ticker', 'Name': 'name'})
+        frame['exchange'] = source
+        frames.append(frame)
+    listing = pd.concat(frames, ignore_index=True).dropna(subset=['ticker', 'name'])
+    listing['ticker'] = listing['ticker'].astype(str).str.strip()
+    listing['name'] = listing['name'].astype(str).str.strip()
+    listing['market'] = market
+    return listing.drop_duplicates(subset=['ticker']).reset_index(drop=True)
+
+def _load_listing(market: str) -> List[Dict[str, str]]:
+    path = _listing_path(market)
+    is_fresh = os.path.exists(path) and time.time() - os.path.getmtime(path) < SECURITY_MASTER_REFRESH_SECONDS
+
+    if not is_fresh:
+        try:
+            listing = _download_listing(market)
+            os.makedirs(SECURITY_MASTER_DIR, exist_ok=True)
+            listing.to_parquet(path)
+            logger.info(f"Refreshed {market} security master ({len(listing)} listings)")
+            return listing.to_dict('records')
+        except Exception as e:
+            logger.warning(f"Error refreshing {market} security master: {e}")
+
+    if os.path.exists(path):
+        return pd.read_parquet(path).to_dict('records')
+    raise RuntimeError(f"No {market} listing available")
+
+def get_listings(market: str) -> List[Dict[str, str]]:
+    """
+    Returns every listed security of a market as dicts with ticker, name,
+    market and exchange keys.
+
+    Listings come from fdr.StockListing, are cached on disk and in memory,
+    and are refreshed once every SECURITY_MASTER_REFRESH_SECONDS. A stale
+    copy is served if the refresh fails; an empty list if none exists.
+    """
+    now = time.time()
+    with _listings_lock:
+        cached = _listings.get(market)
+        if cached and now < cached[0]:
+            return cached[1]
+
+        try:
+            rows = _load_listing(market)
+            expires_at = now + SECURITY_MASTER_REFRESH_SECONDS
+        except Exception as e:
+            logger.error(f"Error loading {market} security master: {e}")
+            rows = cached[1] if cached else []
+            expires_at = now + FAILED_LOAD_RETRY_SECONDS
+
+        _listings[market] = (expires_at, rows)
+        return rows
+
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def _refresh(market: str) -> None:
+    try:
+        get_listings(market)
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(market)
+
+def refresh_listings(markets: List[str]) -> None:
+    """
+    Loads or refreshes the listings of `markets` in background threads,
+    at most one per market at a time, without waiting for them.
+    """
+    for market in markets:
+        with _refreshing_lock:
+            if market in _refreshing:
+                continue
+            _refreshing.add(market)
+        threading.Thread(target=_refresh, args=(market,), name=f"security-master-{market}", daemon=True).start()
+
+def cached_listings(market: str) -> List[Dict[str, str]]:
+    """
+    Like get_listings, but never waits for a download: returns what is in
+    memory (possibly stale, or an empty list before the first load) and
+    refreshes missing or expired listings in the background.
+    """
+    # Read without _listings_lock, which get_listings holds while downloading
+    cached = _listings.get(market)
+    if cached is None or time.time() >= cached[0]:
+        refresh_listings([market])
+    return cached[1] if cached else []
+
+# Corporate suffixes of listing names that news and LLMs usually leave out
+NAME_SUFFIX = re.compile(
+    r"[\s,.]+(inc|corp|corporation|co|company|ltd|limited|plc|holdings?|group|"
+    r"class [a-c]|common stock|ordinary shares|adr|sa|nv|ag|se)\.?$",
+    re.IGNORECASE
+)
+
+def strip_name_suffixes(name: str) -> str:
+    """
+    Drops trailing corporate suffixes: "Apple Inc." -> "Apple",
+    "Toyota Motor Corp ADR" -> "Toyota Motor".
+    """
+    name = name.strip()
+    previous = None
+    while previous != name:
+        previous = name
+        name = NAME_SUFFIX.sub("", name).strip()
+    return name
+
+def _normalize_name(name: str) -> str:
+    name = strip_name_suffixes(str(name or "").lower())
+    # Drop spaces and punctuation so "SK Hynix" and "SK hynix, Inc." agree
+    return "".join(ch for ch in name if ch.isalnum())
+
+def _normalize_ticker(ticker: str, market: str) -> str:
+    ticker = str(ticker or "").strip().upper().lstrip("$")
+    if market == MARKET_KRX:
+        ticker = ticker.split(".")[0] # 005930.KS -> 005930
+        if ticker.isdigit():
+            ticker = ticker.zfill(6)
+    return ticker
+
+_lookups: Dict[str, Tuple[int, Dict[str, Dict[str, str]], Dict[str, Dict[str, str]]]] = {}
+
+def _lookup_tables(market: str) -> Tuple[Dict[str, Dict[str, str]], Dict[str, Dict[str, str]]]:
+    rows = cached_listings(market)
+    cached = _lookups.get(market)
+    if cached is None or cached[0] != id(rows):
+        by_ticker = {str(row['ticker']).upper(): row for row in rows}
+        by_name: Dict[str, Dict[str, str]] = {}
+        for row in rows:
+            by_name.setdefault(_normalize_name(row['name']), row)
+        cached = (id(rows), by_ticker, by_name)
+        _lookups[market] = cached
+    return cached[1], cached[2]
+
+def resolve_security(ticker: str, market: str, name: str, markets: List[str]) -> Optional[Dict[str, str]]:
+    """
+    Checks a (ticker, market, name) triple against the security master.
+
+    Tries, in order: the ticker in the given market, the ticker in another
+    allowed market, then the name in the given and other allowed markets.
+    Only markets in `markets` are searched, so a security is never
+    remapped into a market the caller did not ask for.
+
+    Returns:
+        The listed security (ticker, name, market, exchange), or None if
+        nothing matches.
+    """
+    candidates = ([market] if market in markets else []) + [m for m in markets if m != market]
+    candidates = [m for m in candidates if m in LISTING_SOURCES]
+
+    for candidate in candidates:
+        by_ticker, _ = _lookup_tables(candidate)
+        row = by_ticker.get(_normalize_ticker(ticker, candidate))
+        if row:
+            return row
+
+    normalized = _normalize_name(name)
+    if normalized:
+        for candidate in candidates:
+            _, by_name = _lookup_tables(candidate)
+            row = by_name.get(normalized)
+            if row:
+                return row
+    return None
+
+def validate_recommendations(recommendations: List[Dict[str, Any]], markets: List[str]) -> List[Dict[str, Any]]:
+    """
+    Fixes or drops LLM stock recommendations before they are enriched.
+
+    Entries with a wrong market or ticker are remapped to the listed
+    security; entries that match nothing are dropped, as are duplicates.
+    Only listings already in memory are used, so a request never waits for
+    a download; if none is available yet, recommendations pass through
+    unchanged rather than being dropped.
+    """
+    if not any(cached_listings(market) for market in markets if market in LISTING_SOURCES):
+        logger.warning("Security master unavailable, skipping ticker validation")
+        return recommendations
+
+    validated = []
+    seen = set()
+    for stock in recommendations:
+        ticker, market, name = stock.get('ticker'), stock.get('market'), stock.get('name')
+        row = resolve_security(ticker, market, name, markets)
+        if row is None:
+            logger.info(f"Dropping unknown recommendation {name} ({ticker}, {market})")
+            continue
+        if (row['ticker'], row['market']) != (ticker, market):
+            logger.info(f"Remapped recommendation {name} ({ticker}, {market}) -> {row['name']} ({row['ticker']}, {row['market']})")
+        key = (row['market'], row['ticker'])
+        if key in seen:
+            continue
+        seen.add(key)
+        validated.append(dict(stock, ticker=row['ticker'], market=row['market'], name=row['name']))
+    return validated
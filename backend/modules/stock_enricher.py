@@ -0,0 +1,110 @@
+import asyncio
+import contextvars
+from typing import List, Dict, Any, Optional
+from config import ENRICH_TIMEOUT_SECONDS, CHART_PNG_ENABLED
+from modules.finance_analyzer import get_financial_summary
+from modules.chart_generator import generate_chart_async
+from modules.price_loader import current_price_loader
+from modules.indicators import get_indicators
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+def start_indicators(tickers: List[str]) -> asyncio.Future:
+    """
+    Computes indicators for all `tickers` as one panel in a worker thread.
+
+    Returns:
+        Future resolving to {ticker: indicators}, to be shared by the
+        enrich_stock calls of the same request.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    loader = current_price_loader()
+    if loader is not None:
+        # The summaries need the longest history, so the panel loads that once for both
+        for ticker in tickers:
+            loader.want(ticker)
+
+    # Executor threads do not inherit context vars, so hand over a copy
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(None, contextvars.copy_context().run, get_indicators, tickers)
+
+async def enrich_stock(stock: Dict[str, Any], timeout: float = ENRICH_TIMEOUT_SECONDS,
+                       indicators: Optional[asyncio.Future] = None) -> Dict[str, Any]:
+    """
+    Adds price, change, chart path and technical indicators to a
+    recommended stock.
+
+    Financials run in a worker thread and the chart (only if
+    CHART_PNG_ENABLED) in the chart renderer, at the same time as the
+    indicators. Whatever has not finished after `timeout` seconds is left
+    as None, so a slow ticker never holds up the rest of the response.
+    Threads cannot be interrupted, though: a timed-out FDR call keeps its
+    executor slot until it returns, and a stuck one shrinks the pool for
+    later requests.
+
+    Args:
+        stock: Recommendation dict (name, ticker, market, reason).
+        timeout: Seconds to wait for this stock's data.
+        indicators: Panel future from start_indicators covering this
+            ticker; one is started for this ticker alone if not given.
+
+    Returns:
+        Copy of `stock` with price, change, chart_path and indicators keys added.
+    """
+    ticker = stock.get('ticker')
+    market = stock.get('market')
+    enriched = dict(stock, price=None, change=None, chart_path=None, indicators=None)
+
+    loader = current_price_loader()
+    if loader is not None:
+        # The summary needs the longest history, so load that once for both
+        loader.want(ticker)
+
+    # Executor threads do not inherit context vars, so hand over a copy
+    loop = asyncio.get_running_loop()
+    fin_future = loop.run_in_executor(None, contextvars.copy_context().run, get_financial_summary, ticker, market)
+    # Shared with the other stocks of the request, so a timeout here must not cancel it
+    indicator_future = asyncio.shield(indicators if indicators is not None else start_indicators([ticker]))
+    futures = [fin_future, indicator_future]
+    chart_future = None
+    if CHART_PNG_ENABLED:
+        chart_future = asyncio.ensure_future(generate_chart_async(ticker, market))
+        futures.append(chart_future)
+
+    done, pending = await asyncio.wait(futures, timeout=timeout)
+    if pending:
+        logger.warning(f"Enrichment for {ticker} timed out after {timeout}s, returning partial result")
+        # Stops the chart job if it has not started; the executor threads
+        # run on and their results are discarded
+        for future in pending:
+            future.cancel()
+
+    if fin_future in done and not fin_future.exception():
+        fin = fin_future.result() or {}
+        enriched['price'] = fin.get('price')
+        enriched['change'] = fin.get('change')
+    if chart_future in done and not chart_future.exception():
+        enriched['chart_path'] = chart_future.result() or None
+    if indicator_future in done and not indicator_future.exception():
+        enriched['indicators'] = indicator_future.result().get(ticker)
+
+    return enriched
+
+async def enrich_stocks(stocks: List[Dict[str, Any]], timeout: float = ENRICH_TIMEOUT_SECONDS) -> List[Dict[str, Any]]:
+    """
+    Enriches all recommended stocks concurrently.
+
+    Indicators are computed once for all stocks as one panel. Each stock
+    takes a default-executor thread for its financials, which stays busy
+    past `timeout` if the data source hangs (see enrich_stock).
+
+    Args:
+        stocks: Recommendation dicts from recommend_stocks.
+        timeout: Per-stock timeout in seconds.
+
+    Returns:
+        Enriched stock dicts in the same order as `stocks`.
+    """
+    indicators = start_indicators([stock.get('ticker') for stock in stocks])
+    return list(await asyncio.gather(*[enrich_stock(stock, timeout, indicators) for stock in stocks]))
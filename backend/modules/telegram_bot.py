@@ -1,8 +1,10 @@
-import telegram
 import asyncio
 from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+from utils.lazy_import import lazy_import
 from utils.logger import setup_logger
 
+telegram = lazy_import("telegram")
+
 logger = setup_logger(__name__)
 
 async def send_alert(alert_data):
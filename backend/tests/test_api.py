@@ -0,0 +1,124 @@
+import unittest
+from unittest.mock import patch, AsyncMock
+import asyncio
+import json
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+import main
+from utils import http_client
+from utils.singleflight import SingleFlight
+
+NEWS = [[{"title": "HBM demand surges", "link": "http://news.com/1", "snippet": "..."}]]
+ANALYSIS = {"importance": "High", "reason": "Memory upcycle", "themes": ["HBM"]}
+RECOMMENDATIONS = [{"name": "SK Hynix", "ticker": "000660", "market": "KRX", "reason": "..."}]
+
+async def fake_enrich(stock, timeout=None, indicators=None):
+    return dict(stock, price=150000.0, change=0.02, chart_path=None)
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+@patch('main.start_indicators')
+@patch('main.enrich_stock', side_effect=fake_enrich)
+@patch('main.validate_recommendations', side_effect=lambda recommendations, markets: recommendations)
+@patch('main.recommend_stocks', return_value=RECOMMENDATIONS)
+@patch('main.analyze_news', return_value=ANALYSIS)
+@patch('main.fetch_news_many', new_callable=AsyncMock, return_value=NEWS)
+class TestAnalyzeStream(unittest.TestCase):
+
+    def setUp(self):
+        listings_patch = patch('main.refresh_listings')
+        listings_patch.start()
+        self.addCleanup(listings_patch.stop)
+        # One event loop for all requests, as under uvicorn, so runs can be shared between them
+        self.client = TestClient(main.app)
+        self.client.__enter__()
+        self.addCleanup(self.client.__exit__, None, None, None)
+        flight_patch = patch.object(main, 'analysis_flight', SingleFlight(60, 10))
+        flight_patch.start()
+        self.addCleanup(flight_patch.stop)
+
+    def test_stream_emits_stages_in_order(self, *mocks):
+        response = self.client.get("/analyze/stream", params={"keywords": ["HBM"], "markets": ["KRX"]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        events = parse_events(response.text)
+        self.assertEqual([name for name, _ in events], ["news", "analysis", "stock", "done"])
+        self.assertEqual(events[1][1]["themes"], ["HBM"])
+        self.assertEqual(events[2][1]["ticker"], "000660")
+
+    def test_stream_reports_missing_news_as_error_event(self, mock_fetch, *mocks):
+        mock_fetch.return_value = [[]]
+
+        events = parse_events(self.client.get("/analyze/stream", params={"keywords": ["none"]}).text)
+
+        self.assertEqual(events, [("error", {"status_code": 404, "detail": "No news found"})])
+
+        # Failed runs are not reused
+        mock_fetch.return_value = NEWS
+        events = parse_events(self.client.get("/analyze/stream", params={"keywords": ["none"]}).text)
+        self.assertEqual(events[-1][0], "done")
+
+    def test_stream_and_post_share_one_run(self, mock_fetch, mock_analyze, *mocks):
+        params = {"keywords": ["HBM"], "markets": ["KRX"]}
+        streamed = parse_events(self.client.get("/analyze/stream", params=params).text)
+        replayed = parse_events(self.client.get("/analyze/stream", params=params).text)
+        posted = self.client.post("/analyze", json=params).json()
+
+        self.assertEqual(streamed, replayed)
+        self.assertEqual(posted["recommended_stocks"][0], streamed[2][1])
+        self.assertEqual(mock_fetch.await_count, 1)
+        self.assertEqual(mock_analyze.call_count, 1)
+
+@patch('main.start_indicators')
+@patch('main.enrich_stock', side_effect=fake_enrich)
+@patch('main.validate_recommendations', side_effect=lambda recommendations, markets: recommendations)
+@patch('main.recommend_stocks', return_value=RECOMMENDATIONS)
+@patch('main.analyze_news', return_value=ANALYSIS)
+@patch('main.fetch_news_many', new_callable=AsyncMock, return_value=NEWS)
+class TestAnalyzeCoalescing(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(main.app)
+        self.flight_patch = patch.object(main, 'analysis_flight', SingleFlight(60, 10))
+        self.flight_patch.start()
+
+    def tearDown(self):
+        self.flight_patch.stop()
+
+    def test_equivalent_requests_reuse_one_result(self, mock_fetch, *mocks):
+        first = self.client.post("/analyze", json={"keywords": ["HBM", "Nvidia"], "markets": ["KRX", "US"]})
+        second = self.client.post("/analyze", json={"keywords": ["nvidia ", "hbm"], "markets": ["US", "KRX"]})
+        other = self.client.post("/analyze", json={"keywords": ["HBM"], "markets": ["KRX"]})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(other.status_code, 200)
+        self.assertEqual(mock_fetch.call_count, 2)
+        self.assertEqual(first.json()["recommended_stocks"][0]["ticker"], "000660")
+
+class TestLifespan(unittest.TestCase):
+
+    @patch('main.CHART_PNG_ENABLED', False)
+    @patch('main.refresh_listings')
+    def test_shutdown_closes_the_shared_async_client(self, mock_refresh):
+        async def run():
+            async with main.lifespan(main.app):
+                client = http_client.get_async_client()
+            return client
+
+        self.assertTrue(asyncio.run(run()).is_closed)
+        mock_refresh.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
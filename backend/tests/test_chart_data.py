@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import patch
+import os
+import struct
+import sys
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+import main
+from modules.chart_data import lttb_indices, get_chart_data, encode_binary, BINARY_HEADER
+
+def make_prices(days=300):
+    index = pd.date_range("2024-01-01", periods=days, freq="D")
+    close = 100 + np.sin(np.arange(days) / 10) * 10
+    return pd.DataFrame({
+        "Open": close - 1, "High": close + 2, "Low": close - 2, "Close": close,
+        "Volume": np.arange(days) * 1000.0,
+    }, index=index)
+
+class TestLttb(unittest.TestCase):
+
+    def test_keeps_endpoints_and_count(self):
+        values = np.random.default_rng(0).normal(size=1000).cumsum()
+        indices = lttb_indices(values, 100)
+
+        self.assertEqual(len(indices), 100)
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], 999)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+
+    def test_keeps_spike(self):
+        values = np.zeros(500)
+        values[321] = 50.0
+
+        self.assertIn(321, lttb_indices(values, 20))
+
+    def test_short_series_untouched(self):
+        self.assertEqual(lttb_indices(np.arange(10.0), 50).tolist(), list(range(10)))
+
+class TestChartData(unittest.TestCase):
+
+    @patch('modules.chart_data.load_price_history', return_value=make_prices())
+    def test_downsamples_to_points(self, mock_load):
+        data = get_chart_data("AAPL", "US", days=300, points=60)
+
+        self.assertEqual(len(data["t"]), 60)
+        self.assertEqual(data["t"][0], "2024-01-01")
+        self.assertEqual({len(data[key]) for key in "ohlcv"}, {60})
+
+    @patch('modules.chart_data.load_price_history', side_effect=Exception("network down"))
+    def test_failure_returns_empty_columns(self, mock_load):
+        data = get_chart_data("AAPL", "US")
+
+        self.assertEqual(data["t"], [])
+        self.assertEqual(data["c"], [])
+
+    def test_binary_round_trip(self):
+        data = {"t": ["1970-01-02", "2024-01-01"], "o": [1.0, 2.0], "h": [3.0, 4.0],
+                "l": [0.5, 1.5], "c": [2.0, 3.0], "v": [10, 20]}
+        payload = encode_binary(data)
+
+        magic, version, count = BINARY_HEADER.unpack_from(payload)
+        self.assertEqual((magic, version, count), (b"OHLC", 1, 2))
+        offset = BINARY_HEADER.size
+        days = struct.unpack_from("<2i", payload, offset)
+        self.assertEqual(days, (1, 19723))
+        closes = np.frombuffer(payload, dtype='<f4', count=2, offset=offset + 8 + 3 * 8)
+        self.assertEqual(closes.tolist(), [2.0, 3.0])
+        self.assertEqual(len(payload), BINARY_HEADER.size + 2 * 4 * 6)
+
+@patch('main.get_chart_data')
+class TestChartDataEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(main.app)
+
+    def test_json(self, mock_data):
+        mock_data.return_value = {"ticker": "AAPL", "market": "US", "t": ["2024-01-01"],
+                                  "o": [1.0], "h": [2.0], "l": [0.5], "c": [1.5], "v": [100]}
+        response = self.client.get("/chart-data/US/AAPL", params={"points": 50})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["c"], [1.5])
+        self.assertIn("max-age", response.headers["cache-control"])
+        mock_data.assert_called_once_with("AAPL", "US", main.CHART_DATA_DEFAULT_DAYS, 50)
+
+    def test_binary(self, mock_data):
+        mock_data.return_value = {"ticker": "AAPL", "market": "US", "t": ["2024-01-01"],
+                                  "o": [1.0], "h": [2.0], "l": [0.5], "c": [1.5], "v": [100]}
+        response = self.client.get("/chart-data/US/AAPL", params={"format": "binary"})
+
+        self.assertEqual(response.headers["content-type"], "application/octet-stream")
+        self.assertEqual(response.content[:4], b"OHLC")
+
+    def test_errors(self, mock_data):
+        mock_data.return_value = {"ticker": "X", "market": "US", "t": [], "o": [], "h": [], "l": [], "c": [], "v": []}
+
+        self.assertEqual(self.client.get("/chart-data/JP/7203").status_code, 400)
+        self.assertEqual(self.client.get("/chart-data/US/X").status_code, 404)
+
+if __name__ == '__main__':
+    unittest.main()
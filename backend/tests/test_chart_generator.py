@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules import chart_generator
+from modules.chart_renderer import ChartRenderer
+
+def fake_plot(df, savefig, **kwargs):
+    with open(savefig['fname'], 'wb') as f:
+        f.write(b'\x89PNG' + b'0' * 100)
+
+class TestChartGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir_patch = patch.object(chart_generator, 'CHART_DIR', self.tmp.name)
+        self.dir_patch.start()
+
+    def tearDown(self):
+        self.dir_patch.stop()
+        self.tmp.cleanup()
+
+    @patch('modules.chart_generator.mpf.plot', side_effect=fake_plot)
+    @patch('modules.chart_generator.load_price_history')
+    def test_repeat_request_reuses_cached_chart(self, mock_history, mock_plot):
+        index = pd.bdate_range('2024-01-01', periods=5)
+        mock_history.return_value = pd.DataFrame({'Close': range(5)}, index=index)
+
+        first = chart_generator.generate_chart('005930', 'KRX')
+        second = chart_generator.generate_chart('005930', 'KRX')
+
+        self.assertEqual(first, second)
+        self.assertTrue(os.path.exists(first))
+        self.assertEqual(mock_plot.call_count, 1)
+
+    @patch('modules.chart_generator.load_price_history')
+    def test_async_charts_render_in_worker_process(self, mock_history):
+        index = pd.bdate_range('2024-01-01', periods=30, name='Date')
+        close = [100.0 + i for i in range(30)]
+        mock_history.return_value = pd.DataFrame(
+            {'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': [1000] * 30}, index=index
+        )
+        renderer = ChartRenderer(workers=1).start()
+        self.addCleanup(renderer.shutdown)
+
+        async def render_twice():
+            return await asyncio.gather(chart_generator.generate_chart_async('005930', 'KRX'),
+                                        chart_generator.generate_chart_async('005930', 'KRX'))
+
+        with patch('modules.chart_generator.get_chart_renderer', return_value=renderer), \
+             patch('modules.chart_generator.mpf.plot', side_effect=AssertionError("rendered in API process")):
+            first, second = asyncio.run(render_twice())
+
+        self.assertEqual(first, second)
+        with open(first, 'rb') as f:
+            self.assertEqual(f.read(4), b'\x89PNG')
+        self.assertEqual(os.listdir(self.tmp.name), [os.path.basename(first)])
+
+    def test_evict_removes_expired_then_least_recently_used(self):
+        now = time.time()
+        for name, age in [('old.png', 1000), ('lru.png', 30), ('recent.png', 10), ('new.png', 0)]:
+            path = os.path.join(self.tmp.name, name)
+            with open(path, 'wb') as f:
+                f.write(b'0' * 100)
+            os.utime(path, (now - age, now - age))
+
+        removed = chart_generator.evict_charts(max_bytes=200, max_age_seconds=500)
+
+        self.assertEqual(removed, 2)
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ['new.png', 'recent.png'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules import fundamentals
+
+ITEM_PAGE = (
+    '<html><body><div>' + 'x' * 1000 + '</div>'
+    '<td><em id="_per">12.34</em>배</td><td><em id="_pbr" class="num">1.05</em>배</td>'
+    '</body></html>'
+).encode('euc-kr')
+
+def naver_response(content=ITEM_PAGE):
+    response = MagicMock()
+    response.content = content
+    return response
+
+class TestFundamentals(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = fundamentals.FundamentalsStore(os.path.join(self.tmp.name, 'fundamentals.sqlite3'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_extract_fundamentals(self):
+        self.assertEqual(fundamentals.extract_fundamentals(ITEM_PAGE), {'per': '12.34', 'pbr': '1.05'})
+        self.assertEqual(fundamentals.extract_fundamentals(b'<html></html>'), {})
+
+    def test_current_trading_day_skips_weekend_and_pre_open(self):
+        kst = fundamentals.KST
+        self.assertEqual(fundamentals.current_trading_day(datetime(2024, 6, 12, 10, tzinfo=kst)), '2024-06-12')
+        self.assertEqual(fundamentals.current_trading_day(datetime(2024, 6, 12, 8, tzinfo=kst)), '2024-06-11')
+        self.assertEqual(fundamentals.current_trading_day(datetime(2024, 6, 16, 12, tzinfo=kst)), '2024-06-14')
+        self.assertEqual(fundamentals.current_trading_day(datetime(2024, 6, 17, 7, tzinfo=kst)), '2024-06-14')
+
+    @patch('modules.fundamentals.http_client.get', return_value=naver_response())
+    def test_scrapes_once_per_trading_day(self, mock_get):
+        first = self.store.get('005930')
+        second = self.store.get('005930')
+        # A fresh store on the same file reads from SQLite
+        reopened = fundamentals.FundamentalsStore(self.store.path).get('005930')
+
+        self.assertEqual(first, {'per': '12.34', 'pbr': '1.05'})
+        self.assertEqual(second, first)
+        self.assertEqual(reopened, first)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('modules.fundamentals.http_client.get', side_effect=ConnectionError('down'))
+    def test_failures_are_not_cached(self, mock_get):
+        self.assertEqual(self.store.get('005930'), {})
+        self.assertEqual(self.store.get('005930'), {})
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('modules.fundamentals.http_client.get', return_value=naver_response())
+    def test_refresh_fetches_only_missing_tickers(self, mock_get):
+        self.store.set('005930', {'per': '9.0', 'pbr': '1.0'})
+
+        result = self.store.refresh(['005930', '000660', '035420', '000660'])
+
+        self.assertEqual(list(result), ['005930', '000660', '035420'])
+        self.assertEqual(result['005930'], {'per': '9.0', 'pbr': '1.0'})
+        self.assertEqual(result['000660'], {'per': '12.34', 'pbr': '1.05'})
+        self.assertEqual(mock_get.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import asyncio
+import os
+import sys
+import tempfile
+import httpx
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import http_client
+from utils.rate_limiter import RateLimiter
+
+class TestHttpClient(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.limiter = RateLimiter(os.path.join(self.tmp.name, "rate_limits.sqlite3"),
+                                   {"serper": {"rate": 100.0, "burst": 10, "max_concurrency": 4}})
+        patcher = patch('utils.http_client.get_rate_limiter', return_value=self.limiter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_session_is_shared_and_leaves_429_to_the_limiter(self):
+        session = http_client.get_session()
+        self.assertIs(session, http_client.get_session())
+        retry = session.get_adapter("https://google.serper.dev").max_retries
+        self.assertNotIn(429, retry.status_forcelist)
+        self.assertIn(503, retry.status_forcelist)
+        self.assertTrue(retry.respect_retry_after_header)
+
+    def test_request_reports_429_and_retries(self):
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "0"})
+        ok = MagicMock(status_code=200, headers={})
+        session = MagicMock()
+        session.request.side_effect = [throttled, ok]
+
+        with patch('utils.http_client.get_session', return_value=session):
+            response = http_client.post('serper', "https://google.serper.dev/news", json={})
+
+        self.assertIs(response, ok)
+        self.assertEqual(session.request.call_count, 2)
+        stats = self.limiter.stats()["serper"]
+        self.assertEqual(stats["inflight"], 0)
+        self.assertLess(stats["concurrency"], 4)
+
+    @patch('utils.http_client.HTTP_BACKOFF_FACTOR', 0)
+    def test_async_request_retries_after_429(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"ok": True})
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await http_client.async_post('serper', "https://google.serper.dev/news", client=client, json={})
+
+        response = asyncio.run(run())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(calls), 2)
+
+    @patch('utils.http_client.HTTP_MAX_RETRIES', 1)
+    @patch('utils.http_client.HTTP_BACKOFF_FACTOR', 0)
+    def test_async_request_gives_up_after_max_retries(self):
+        def handler(request):
+            return httpx.Response(503)
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await http_client.async_get('naver', "https://finance.naver.com", client=client)
+
+        self.assertEqual(asyncio.run(run()).status_code, 503)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.indicators import build_panel, compute_indicators, rank_tickers
+
+def make_bars(close, volume=None):
+    close = np.asarray(close, dtype=float)
+    index = pd.bdate_range(end='2024-06-14', periods=len(close), name='Date')
+    return pd.DataFrame({
+        'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Volume': volume if volume is not None else np.full(len(close), 1000.0)
+    }, index=index)
+
+def reference_rsi(close, period=14):
+    diff = pd.Series(close).diff()
+    gain = diff.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean()
+    loss = (-diff.clip(upper=0)).ewm(alpha=1 / period, adjust=False).mean()
+    return 100 - 100 / (1 + gain.iloc[-1] / loss.iloc[-1])
+
+class TestIndicators(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.walk = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300)))
+        self.frames = {
+            'WALK': make_bars(self.walk),
+            'UP': make_bars(np.linspace(50, 100, 300)),
+            'NEW': make_bars(np.linspace(10, 12, 30)),
+            'EMPTY': pd.DataFrame(),
+        }
+
+    def test_panel_is_right_aligned(self):
+        panel = build_panel(self.frames, length=260)
+
+        self.assertEqual(panel.tickers, ['WALK', 'UP', 'NEW'])
+        self.assertEqual(panel.close.shape, (3, 260))
+        self.assertTrue(np.isnan(panel.close[2, :230]).all())
+        self.assertEqual(panel.close[2, -1], 12.0)
+
+    def test_matches_per_ticker_reference(self):
+        result = compute_indicators(build_panel(self.frames, length=260))
+        walk = self.walk[-260:]
+
+        self.assertAlmostEqual(result['WALK']['sma_20'], walk[-20:].mean(), places=3)
+        self.assertAlmostEqual(result['WALK']['rsi_14'], reference_rsi(walk), places=3)
+        self.assertAlmostEqual(result['WALK']['high_52w'], (walk[-252:] * 1.01).max(), places=3)
+        self.assertAlmostEqual(result['WALK']['return_20'], walk[-1] / walk[-21] - 1, places=3)
+        self.assertEqual(result['UP']['rsi_14'], 100.0)
+        self.assertEqual(result['UP']['volume_ratio'], 1.0)
+
+    def test_short_history_yields_none(self):
+        result = compute_indicators(build_panel(self.frames, length=260))
+
+        self.assertIsNone(result['NEW']['sma_50'])
+        self.assertIsNone(result['NEW']['sma_200'])
+        self.assertIsNotNone(result['NEW']['sma_20'])
+        self.assertIsNotNone(result['NEW']['rsi_14'])
+
+    def test_rank_tickers_skips_missing_scores(self):
+        ranking = rank_tickers({'A': {'momentum_score': 0.5}, 'B': {'momentum_score': None}, 'C': {'momentum_score': 1.2}})
+
+        self.assertEqual(ranking, [('C', 1.2), ('A', 0.5)])
+
+if __name__ == '__main__':
+    unittest.main()
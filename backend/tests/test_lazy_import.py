@@ -0,0 +1,39 @@
+import unittest
+from unittest.mock import patch
+import os
+import subprocess
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.lazy_import import lazy_import
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HEAVY_MODULES = ("pandas", "numpy", "FinanceDataReader", "mplfinance", "matplotlib", "telegram")
+
+class TestLazyImport(unittest.TestCase):
+
+    def test_loads_on_first_attribute_access(self):
+        module = lazy_import("colorsys")
+
+        self.assertIn("not loaded", repr(module))
+        self.assertEqual(module.rgb_to_hsv(0, 0, 0), (0.0, 0.0, 0.0))
+        self.assertNotIn("not loaded", repr(module))
+
+    def test_patch_through_proxy(self):
+        module = lazy_import("colorsys")
+        original = module.rgb_to_hsv
+
+        with patch.object(module, "rgb_to_hsv", return_value="patched"):
+            self.assertEqual(module.rgb_to_hsv(1, 1, 1), "patched")
+        self.assertIs(module.rgb_to_hsv, original)
+
+    def test_api_import_skips_heavy_modules(self):
+        code = f"import sys, main; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+        result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "[]")
+
+if __name__ == '__main__':
+    unittest.main()
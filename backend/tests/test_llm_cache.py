@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.llm_cache import LLMCache
+from modules import ai_analyzer
+
+class TestLLMCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "llm_cache.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_miss_and_expiry(self):
+        cache = LLMCache(self.path, ttl_seconds=60, max_entries=10)
+        self.assertIsNone(cache.get("model", "prompt"))
+        cache.set("model", "prompt", "answer")
+        self.assertEqual(cache.get("model", "prompt"), "answer")
+        self.assertIsNone(cache.get("other-model", "prompt"))
+
+        expired = LLMCache(self.path, ttl_seconds=-1, max_entries=10)
+        self.assertIsNone(expired.get("model", "prompt"))
+
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 2, "entries": 1})
+
+    def test_evicts_least_recently_used(self):
+        cache = LLMCache(self.path, ttl_seconds=60, max_entries=2)
+        cache.set("m", "a", "1")
+        cache.set("m", "b", "2")
+        cache.get("m", "a")
+        cache.set("m", "c", "3")
+
+        self.assertEqual(cache.get("m", "a"), "1")
+        self.assertIsNone(cache.get("m", "b"))
+        self.assertEqual(cache.get("m", "c"), "3")
+
+    def test_stats_survive_database_errors(self):
+        cache = LLMCache(self.path, ttl_seconds=60, max_entries=10)
+        os.remove(self.path)
+        os.mkdir(self.path) # no longer openable as a database
+
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 0, "entries": None})
+
+    @patch('modules.ai_analyzer.GEMINI_API_KEY', 'test-key')
+    @patch('modules.ai_analyzer.http_client.post')
+    def test_call_gemini_api_uses_cache(self, mock_post):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"candidates": [{"content": {"parts": [{"text": "cached answer"}]}}]}
+        mock_post.return_value = mock_response
+        cache = LLMCache(self.path, ttl_seconds=60, max_entries=10)
+
+        with patch('modules.ai_analyzer.get_llm_cache', return_value=cache):
+            first = ai_analyzer._call_gemini_api("same prompt")
+            second = ai_analyzer._call_gemini_api("same prompt")
+
+        self.assertEqual(first, "cached answer")
+        self.assertEqual(second, "cached answer")
+        self.assertEqual(mock_post.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,26 @@
 import unittest
 from unittest.mock import patch, MagicMock
+import asyncio
+import json
 import sys
 import os
+import httpx
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from modules.news_fetcher import fetch_news
+from modules.news_fetcher import fetch_news, fetch_news_many
 from modules.ai_analyzer import analyze_news
 
 class TestModules(unittest.TestCase):
 
-    @patch('modules.news_fetcher.requests.post')
+    def setUp(self):
+        # Keep fixture articles out of the real news archive
+        archive_patch = patch('modules.news_fetcher.get_news_archive', return_value=None)
+        archive_patch.start()
+        self.addCleanup(archive_patch.stop)
+
+    @patch('modules.news_fetcher.http_client.post')
     def test_fetch_news_success(self, mock_post):
         # Mock response
         mock_response = MagicMock()
@@ -27,7 +36,7 @@ class TestModules(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]['title'], "Test News")
 
-    @patch('modules.news_fetcher.requests.post')
+    @patch('modules.news_fetcher.http_client.post')
     def test_fetch_news_failure(self, mock_post):
         # Mock failure
         mock_post.side_effect = Exception("API Error")
@@ -35,6 +44,22 @@ class TestModules(unittest.TestCase):
         results = fetch_news("test query")
         self.assertEqual(results, [])
 
+    @patch('utils.http_client.HTTP_MAX_RETRIES', 0)
+    def test_fetch_news_many_keeps_query_order(self):
+        # Mock Serper with a local transport
+        def handler(request):
+            query = json.loads(request.content)["q"]
+            if query == "broken":
+                return httpx.Response(500)
+            return httpx.Response(200, json={"news": [{"title": query, "link": f"http://{query}.com"}]})
+        
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await fetch_news_many(["a", "broken", "b"], n=3, client=client)
+        
+        results = asyncio.run(run())
+        self.assertEqual([r[0]['title'] if r else None for r in results], ["a", None, "b"])
+
     @patch('modules.ai_analyzer._call_gemini_api')
     def test_analyze_news_low_importance(self, mock_gemini):
         # Mock Gemini response for Step 1
@@ -0,0 +1,114 @@
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+import os
+import sys
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+import main
+from modules.news_archive import NewsArchive, match_expression
+from modules.news_fetcher import fetch_news
+from utils.singleflight import SingleFlight
+
+ARTICLES = [
+    {"title": "삼성전자가 HBM 생산 확대", "snippet": "AI 서버 수요 급증", "link": "http://news.com/1", "date": "2 hours ago", "source": "연합뉴스"},
+    {"title": "Hynix HBM prices climb", "snippet": "Samsung and Hynix gain", "link": "http://news.com/2", "date": "20 hours ago", "source": "Reuters"},
+    {"title": "Fed holds rates", "snippet": "No change in policy", "link": "http://news.com/3", "date": "Jan 5, 2024", "source": "AP"},
+]
+
+class TestNewsArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = NewsArchive(os.path.join(self.tmp.name, "news_archive.sqlite3"), fresh_seconds=60, window_hours=24)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_search_ranks_and_recomputes_dates(self):
+        self.archive.store("HBM", ARTICLES)
+        self.archive.store("Hynix", ARTICLES[1:2])
+
+        results = self.archive.search("hbm")
+        self.assertEqual([item["link"] for item in results], ["http://news.com/1", "http://news.com/2"])
+        self.assertEqual(results[0]["date"], "2 hours ago")
+        self.assertEqual(results[0]["source"], "연합뉴스")
+
+        self.assertEqual([item["link"] for item in self.archive.search("삼성전자")], ["http://news.com/1"])
+        self.assertEqual([item["link"] for item in self.archive.search("HBM", max_age_hours=12)], ["http://news.com/1"])
+        self.assertEqual(self.archive.search("Fed")[0]["date"], "Jan 5, 2024")
+        self.assertEqual(self.archive.search('fed" OR *'), [])
+        self.assertIsNone(match_expression("  ?! "))
+        self.assertEqual(self.archive.stats()["entries"], 3)
+
+    def test_recent_answers_fresh_keywords_only(self):
+        self.archive.store("HBM", ARTICLES)
+
+        self.assertEqual(len(self.archive.recent(" hbm ", n=1)), 1)
+        self.assertIsNone(self.archive.recent("Nvidia"))
+        stale = NewsArchive(self.archive.path, fresh_seconds=-1)
+        self.assertIsNone(stale.recent("HBM"))
+        self.assertEqual(self.archive.stats()["hits"], 1)
+
+    @patch('modules.news_fetcher.http_client.post')
+    def test_fetch_news_archives_results(self, mock_post):
+        mock_post.return_value = MagicMock(**{"json.return_value": {"news": ARTICLES}})
+
+        with patch('modules.news_fetcher.get_news_archive', return_value=self.archive):
+            fetch_news("HBM")
+
+        self.assertEqual(len(self.archive.recent("HBM", n=5)), 2)
+
+    def test_stats_survive_database_errors(self):
+        self.archive.store("HBM", ARTICLES)
+        os.remove(self.archive.path)
+        os.mkdir(self.archive.path) # no longer openable as a database
+
+        self.assertEqual(self.archive.stats(), {"hits": 0, "misses": 0, "entries": None})
+
+@patch('main.start_indicators')
+@patch('main.enrich_stock', new_callable=AsyncMock)
+@patch('main.validate_recommendations', side_effect=lambda recommendations, markets: recommendations)
+@patch('main.recommend_stocks', return_value=[])
+@patch('main.analyze_news', return_value={"reason": "Memory upcycle", "themes": ["HBM"]})
+@patch('main.fetch_news_many', new_callable=AsyncMock, return_value=[ARTICLES[2:]])
+class TestNewsArchiveApi(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = NewsArchive(os.path.join(self.tmp.name, "news_archive.sqlite3"))
+        self.archive.store("HBM", ARTICLES)
+        self.patches = [patch('main.get_news_archive', return_value=self.archive),
+                        patch.object(main, 'analysis_flight', SingleFlight(60, 10))]
+        for p in self.patches:
+            p.start()
+        self.client = TestClient(main.app)
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.tmp.cleanup()
+
+    def test_news_search(self, *mocks):
+        response = self.client.get("/news/search", params={"q": "HBM", "limit": 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["link"], "http://news.com/1")
+        self.assertEqual(self.client.get("/news/search", params={"q": ""}).status_code, 422)
+
+    def test_analyze_uses_archive_for_fresh_keywords(self, mock_fetch, *mocks):
+        response = self.client.post("/analyze", json={"keywords": ["HBM", "Fed"], "use_archive": True})
+
+        self.assertEqual(response.status_code, 200)
+        mock_fetch.assert_awaited_once_with(["Fed"], n=3)
+        links = {item["link"] for item in response.json()["news_items"]}
+        self.assertEqual(links, {"http://news.com/1", "http://news.com/2", "http://news.com/3"})
+
+        self.client.post("/analyze", json={"keywords": ["HBM"]})
+        self.assertEqual(mock_fetch.await_args.args, (["HBM"],))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import patch, AsyncMock
+import asyncio
+import os
+import sys
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules import price_loader
+from modules.stock_enricher import enrich_stock
+
+BARS = pd.DataFrame(
+    {'Close': [float(i) for i in range(600)], 'Change': [0.0] * 600},
+    index=pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=600, name='Date')
+)
+
+def fake_history(ticker, start=None, end=None):
+    return BARS.loc[pd.Timestamp(start):end]
+
+@patch('modules.price_loader.get_price_history', side_effect=fake_history)
+class TestPriceLoader(unittest.TestCase):
+
+    def test_outside_scope_reads_store_directly(self, mock_history):
+        price_loader.load_price_history('005930')
+        price_loader.load_price_history('005930')
+
+        self.assertEqual(mock_history.call_count, 2)
+
+    def test_scope_loads_each_ticker_once_and_slices(self, mock_history):
+        with price_loader.price_loader_scope() as loader:
+            loader.want('005930', '2000-01-01')
+            short = price_loader.load_price_history('005930', BARS.index[-10])
+            full = price_loader.load_price_history('005930', BARS.index[0], BARS.index[99])
+
+        self.assertEqual(mock_history.call_count, 1)
+        self.assertEqual(len(short), 10)
+        self.assertEqual(len(full), 100)
+        self.assertIsNone(price_loader.current_price_loader())
+
+    def test_earlier_start_than_loaded_reloads(self, mock_history):
+        with price_loader.price_loader_scope():
+            price_loader.load_price_history('005930', BARS.index[-10])
+            price_loader.load_price_history('005930', BARS.index[-50])
+            price_loader.load_price_history('005930', BARS.index[-20])
+
+        self.assertEqual(mock_history.call_count, 2)
+
+    def test_enrich_stock_shares_one_load(self, mock_history):
+        def summary(ticker, market):
+            df = price_loader.load_price_history(ticker)
+            return {'price': df['Close'].iloc[-1], 'change': 0.0}
+
+        def chart(ticker, market):
+            price_loader.load_price_history(ticker, BARS.index[-120])
+            return f"/tmp/{ticker}.png"
+
+        async def run():
+            with price_loader.price_loader_scope():
+                return await enrich_stock({'ticker': 'AAPL', 'market': 'US'})
+
+        with patch('modules.stock_enricher.CHART_PNG_ENABLED', True), \
+             patch('modules.stock_enricher.get_financial_summary', side_effect=summary), \
+             patch('modules.stock_enricher.generate_chart_async', new_callable=AsyncMock, side_effect=chart):
+            enriched = asyncio.run(run())
+
+        self.assertEqual(enriched['price'], 599.0)
+        self.assertEqual(enriched['chart_path'], '/tmp/AAPL.png')
+        self.assertEqual(mock_history.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import threading
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules import price_store
+
+def make_bars(start, periods):
+    index = pd.bdate_range(start, periods=periods, name='Date')
+    close = [100.0 + i for i in range(periods)]
+    return pd.DataFrame({
+        'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': [1000] * periods
+    }, index=index)
+
+class TestPriceStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir_patch = patch.object(price_store, 'PRICE_STORE_DIR', self.tmp.name)
+        self.dir_patch.start()
+
+    def tearDown(self):
+        self.dir_patch.stop()
+        self.tmp.cleanup()
+
+    @patch.object(price_store, 'PRICE_STORE_REFRESH_SECONDS', -1)
+    @patch('modules.price_store.fdr.DataReader')
+    def test_refresh_downloads_only_new_bars(self, mock_reader):
+        history = make_bars('2024-01-01', 30)
+        mock_reader.side_effect = [history.iloc[:20], history.iloc[19:]]
+
+        first = price_store.get_price_history('005930', start='2024-01-01')
+        second = price_store.get_price_history('005930', start='2024-01-01')
+
+        self.assertEqual(len(first), 20)
+        self.assertEqual(len(second), 30)
+        # Second download starts at the last stored bar, not at the beginning
+        self.assertEqual(pd.Timestamp(mock_reader.call_args_list[1].args[1]), history.index[19])
+        self.assertAlmostEqual(second['Change'].iloc[20], 120.0 / 119.0 - 1)
+
+    @patch('modules.price_store.fdr.DataReader')
+    def test_fresh_store_skips_download(self, mock_reader):
+        mock_reader.return_value = make_bars('2024-01-01', 10)
+
+        price_store.get_price_history('TSLA', start='2024-01-01')
+        df = price_store.get_price_history('TSLA', start='2024-01-05')
+
+        self.assertEqual(mock_reader.call_count, 1)
+        self.assertEqual(df.index[0], pd.Timestamp('2024-01-05'))
+
+    def test_concurrent_writers_do_not_share_a_temp_file(self):
+        # Two processes refreshing one ticker are not serialized by the ticker lock
+        path = os.path.join(self.tmp.name, "005930.parquet")
+        frames = [make_bars('2024-01-01', 500), make_bars('2024-01-01', 600)]
+        errors = []
+
+        def write(df):
+            try:
+                for _ in range(20):
+                    price_store._write_store(path, df)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(df,)) for df in frames]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertIn(len(pd.read_parquet(path)), (500, 600))
+        self.assertEqual(os.listdir(self.tmp.name), ["005930.parquet"])
+
+if __name__ == '__main__':
+    unittest.main()
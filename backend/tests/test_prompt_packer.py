@@ -0,0 +1,59 @@
+import unittest
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.prompt_packer import pack_news, estimate_tokens, truncate_to_tokens, age_hours, score_article
+
+def article(title, snippet, date="1 hour ago", link=None):
+    return {"title": title, "snippet": snippet, "date": date, "link": link or title}
+
+class TestPromptPacker(unittest.TestCase):
+
+    def test_near_duplicates_collapse(self):
+        wire = "Samsung Electronics raises HBM output as AI server demand surges across the industry"
+        items = [
+            article("Samsung boosts HBM output", wire),
+            article("Samsung boosts HBM output - Reuters", wire + " sources said"),
+            article("Hyundai Motor opens new EV plant", "The plant in Georgia will build electric SUVs"),
+        ]
+
+        context = pack_news(items, ["Samsung"])
+
+        self.assertEqual(len(context.items), 2)
+        self.assertEqual(context.duplicates, 1)
+        self.assertEqual(context.items[0]["title"], "Samsung boosts HBM output")
+
+    def test_ranks_by_relevance_and_recency(self):
+        items = [
+            article("Market wrap", "Stocks were mixed", date="1 hour ago"),
+            article("HBM prices climb", "Memory makers gain", date="20 hours ago"),
+            article("HBM supply tight", "Analysts see shortage", date="10 분 전"),
+        ]
+
+        titles = [item["title"] for item in pack_news(items, ["HBM"]).items]
+
+        self.assertEqual(titles, ["HBM supply tight", "HBM prices climb", "Market wrap"])
+
+    def test_respects_budget(self):
+        items = [article(f"Story {i}", " ".join(f"word{i}x{j}" for j in range(100))) for i in range(20)]
+
+        context = pack_news(items, ["story"], budget=300, snippet_max_tokens=50)
+
+        self.assertLessEqual(context.tokens, 300)
+        self.assertLessEqual(estimate_tokens(context.text), 300)
+        self.assertGreater(context.over_budget, 0)
+        self.assertTrue(all("..." in line for line in context.text.splitlines()))
+
+    def test_helpers(self):
+        self.assertEqual(age_hours("3 hours ago"), 3)
+        self.assertEqual(age_hours("2일 전"), 48)
+        self.assertEqual(age_hours("Jan 5, 2024"), 24)
+        self.assertGreater(estimate_tokens("삼성전자"), estimate_tokens("abcd"))
+        self.assertEqual(truncate_to_tokens("short text", 10), "short text")
+        self.assertGreater(score_article(article("HBM", ""), ["hbm"]), score_article(article("DRAM", ""), ["hbm"]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.rate_limiter import RateLimiter, RateLimitExceeded
+
+LIMITS = {"gemini": {"rate": 10.0, "burst": 2, "max_concurrency": 4}}
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "rate_limits.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_token_bucket(self):
+        limiter = RateLimiter(self.path, LIMITS)
+        first, _ = limiter.try_acquire("gemini")
+        second, _ = limiter.try_acquire("gemini")
+        third, wait = limiter.try_acquire("gemini")
+
+        self.assertIsNotNone(first)
+        self.assertIsNotNone(second)
+        self.assertIsNone(third)
+        self.assertAlmostEqual(wait, 0.1, delta=0.02)
+
+    def test_unlimited_service_passes(self):
+        self.assertEqual(RateLimiter(self.path, LIMITS).try_acquire("naver"), (None, 0.0))
+
+    def test_429_shrinks_cap_and_blocks_all_processes(self):
+        api_worker = RateLimiter(self.path, LIMITS)
+        bot = RateLimiter(self.path, LIMITS)
+        lease, _ = api_worker.try_acquire("gemini")
+        api_worker.release("gemini", lease, throttled=True, retry_after=30)
+
+        lease, wait = bot.try_acquire("gemini")
+        self.assertIsNone(lease)
+        self.assertGreater(wait, 29)
+        self.assertEqual(bot.stats()["gemini"]["concurrency"], 2)
+
+    def test_burst_of_429s_counts_once_and_successes_recover(self):
+        limiter = RateLimiter(self.path, {"gemini": {"rate": 1000.0, "burst": 100, "max_concurrency": 8}})
+        leases = [limiter.try_acquire("gemini")[0] for _ in range(4)]
+        for lease in leases:
+            limiter.release("gemini", lease, throttled=True, retry_after=0)
+        self.assertEqual(limiter.stats()["gemini"]["concurrency"], 4)
+
+        for _ in range(20):
+            lease = limiter.acquire("gemini")
+            limiter.release("gemini", lease)
+        self.assertGreater(limiter.stats()["gemini"]["concurrency"], 6)
+
+    def test_concurrency_cap(self):
+        limiter = RateLimiter(self.path, {"gemini": {"rate": 1000.0, "burst": 100, "max_concurrency": 2}})
+        leases = [limiter.try_acquire("gemini")[0] for _ in range(2)]
+        self.assertIsNone(limiter.try_acquire("gemini")[0])
+
+        limiter.release("gemini", leases[0])
+        self.assertIsNotNone(limiter.try_acquire("gemini")[0])
+
+    def test_gives_up_after_max_wait(self):
+        limiter = RateLimiter(self.path, LIMITS, max_wait_seconds=1)
+        lease, _ = limiter.try_acquire("gemini")
+        limiter.release("gemini", lease, throttled=True, retry_after=60)
+
+        with self.assertRaises(RateLimitExceeded):
+            limiter.acquire("gemini")
+        with self.assertRaises(RateLimitExceeded):
+            asyncio.run(limiter.acquire_async("gemini"))
+
+    def test_async_calls_do_not_block_the_loop(self):
+        limiter = RateLimiter(self.path, LIMITS)
+        try_acquire = limiter.try_acquire
+
+        def slow_try_acquire(service):
+            time.sleep(0.2) # e.g. waiting on another process's write lock
+            return try_acquire(service)
+
+        async def run():
+            ticks = 0
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+            task = asyncio.ensure_future(ticker())
+            with patch.object(limiter, 'try_acquire', side_effect=slow_try_acquire):
+                lease = await limiter.acquire_async("gemini")
+            await limiter.release_async("gemini", lease)
+            task.cancel()
+            return ticks
+
+        self.assertGreater(asyncio.run(run()), 5)
+        with sqlite3.connect(self.path) as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    @patch('utils.rate_limiter.LEASE_SECONDS', -1)
+    def test_stale_leases_expire(self):
+        limiter = RateLimiter(self.path, {"gemini": {"rate": 1000.0, "burst": 100, "max_concurrency": 1}})
+        limiter.try_acquire("gemini") # never released, e.g. the process died
+
+        self.assertIsNotNone(limiter.try_acquire("gemini")[0])
+
+    def test_stats_survive_database_errors(self):
+        limiter = RateLimiter(self.path, LIMITS)
+        limiter.try_acquire("gemini")
+        with patch.object(limiter, '_connect', side_effect=sqlite3.OperationalError("database is locked")):
+            stats = limiter.stats()
+
+        self.assertEqual(stats, {"gemini": {"tokens": None, "concurrency": None, "inflight": None, "blocked_seconds": None}})
+
+if __name__ == '__main__':
+    unittest.main()
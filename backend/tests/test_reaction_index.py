@@ -0,0 +1,75 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.reaction_index import ReactionIndex, vectorize
+from modules.ai_analyzer import analyze_news
+
+TRIAGE = '{"importance": "High", "reason": "Rates", "themes": ["Banks"], "search_query": "%s"}'
+
+class TestReactionIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "reaction_index.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_index(self, ttl_seconds=60):
+        return ReactionIndex(self.path, threshold=0.87, ttl_seconds=ttl_seconds, max_entries=10)
+
+    def test_vectorize_similarity(self):
+        query = vectorize("Fed rate hike stock reaction")
+        self.assertAlmostEqual(float(query @ query), 1.0, places=5)
+        self.assertGreater(float(query @ vectorize("Fed rate hike stock market reaction")), 0.87)
+        self.assertLess(float(query @ vectorize("Fed rate cut stock reaction")), 0.87)
+        self.assertLess(float(query @ vectorize("Apple iPhone launch stock price history")), 0.5)
+
+    def test_lookup_reuses_close_queries_only(self):
+        index = self.make_index()
+        index.add("Fed rate hike stock reaction", "Stocks fell 2% then recovered.")
+        index.add("2008 financial crisis stock reaction", "Markets halved.")
+
+        # Another process (or worker) sees the entries through the shared file
+        other = self.make_index()
+        self.assertEqual(other.lookup("Fed rate hike stock market reaction"), "Stocks fell 2% then recovered.")
+        self.assertIsNone(other.lookup("Apple iPhone launch stock price history"))
+        self.assertIsNone(other.lookup("2020 financial crisis stock reaction"))
+        self.assertEqual(other.stats(), {"hits": 1, "misses": 2, "entries": 2})
+
+        self.assertIsNone(self.make_index(ttl_seconds=-1).lookup("Fed rate hike stock reaction"))
+
+    def test_expired_near_matches_do_not_hide_fresh_ones(self):
+        index = self.make_index()
+        index.add("Fed rate hike stock market reaction", "Fresh answer.")
+        with patch('modules.reaction_index.time.time', return_value=0.0):
+            for _ in range(6):
+                index.add("Fed rate hike stock reaction", "Stale answer.")
+
+        self.assertEqual(index.lookup("Fed rate hike stock reaction"), "Fresh answer.")
+
+    @patch('modules.ai_analyzer.search_past_reaction')
+    @patch('modules.ai_analyzer._call_gemini_api')
+    def test_analyze_news_skips_search_and_synthesis_on_match(self, mock_gemini, mock_search):
+        mock_gemini.side_effect = [TRIAGE % "Fed rate hike stock reaction", "Stocks fell 2% then recovered.",
+                                   TRIAGE % "fed rate hikes stock reaction"]
+        mock_search.return_value = [{"title": "2018 hikes", "snippet": "Stocks dipped"}]
+        index = self.make_index()
+
+        with patch('modules.reaction_index.get_reaction_index', return_value=index):
+            first = analyze_news({"title": "Fed hikes rates", "snippet": "..."})
+            second = analyze_news({"title": "Fed raises rates again", "snippet": "..."})
+
+        self.assertEqual(first['historical_reaction'], "Stocks fell 2% then recovered.")
+        self.assertEqual(second['historical_reaction'], "Stocks fell 2% then recovered.")
+        self.assertEqual(mock_search.call_count, 1)
+        self.assertEqual(mock_gemini.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules import security_master
+
+LISTINGS = {
+    'KRX': [
+        {'ticker': '005930', 'name': '삼성전자', 'market': 'KRX', 'exchange': 'KRX'},
+        {'ticker': '000660', 'name': 'SK하이닉스', 'market': 'KRX', 'exchange': 'KRX'},
+    ],
+    'US': [
+        {'ticker': 'NVDA', 'name': 'NVIDIA Corp', 'market': 'US', 'exchange': 'NASDAQ'},
+        {'ticker': 'AAPL', 'name': 'Apple Inc.', 'market': 'US', 'exchange': 'NASDAQ'},
+    ],
+}
+
+@patch('modules.security_master.cached_listings', side_effect=lambda market: LISTINGS.get(market, []))
+class TestValidateRecommendations(unittest.TestCase):
+
+    def test_fixes_market_ticker_and_name(self, mock_listings):
+        recommendations = [
+            {'name': 'Samsung Electronics', 'ticker': '5930', 'market': 'KRX', 'reason': 'a'},
+            {'name': 'NVIDIA', 'ticker': 'NVDA', 'market': 'KRX', 'reason': 'b'},
+            {'name': 'Apple', 'ticker': 'APPL', 'market': 'US', 'reason': 'c'},
+        ]
+
+        validated = security_master.validate_recommendations(recommendations, ['KRX', 'US'])
+
+        self.assertEqual([(s['ticker'], s['market'], s['name']) for s in validated], [
+            ('005930', 'KRX', '삼성전자'), ('NVDA', 'US', 'NVIDIA Corp'), ('AAPL', 'US', 'Apple Inc.')
+        ])
+        self.assertEqual(validated[0]['reason'], 'a')
+
+    def test_drops_unknown_and_duplicate_entries(self, mock_listings):
+        recommendations = [
+            {'name': 'Made Up Robotics', 'ticker': 'MURX', 'market': 'US'},
+            {'name': 'SK하이닉스', 'ticker': '000660', 'market': 'KRX'},
+            {'name': 'SK하이닉스', 'ticker': '000660.KS', 'market': 'KRX'},
+        ]
+
+        validated = security_master.validate_recommendations(recommendations, ['KRX', 'US'])
+
+        self.assertEqual([s['ticker'] for s in validated], ['000660'])
+
+    def test_never_remaps_outside_allowed_markets(self, mock_listings):
+        recommendations = [
+            {'name': 'NVIDIA', 'ticker': 'NVDA', 'market': 'US'},
+            {'name': '삼성전자', 'ticker': '005930', 'market': 'US'},
+            {'name': 'SK하이닉스', 'ticker': '000660', 'market': 'KRX'},
+        ]
+
+        validated = security_master.validate_recommendations(recommendations, ['KRX'])
+
+        self.assertEqual([(s['ticker'], s['market']) for s in validated], [('005930', 'KRX'), ('000660', 'KRX')])
+        self.assertIsNone(security_master.resolve_security('AAPL', 'US', 'Apple', ['KRX']))
+
+    def test_passes_through_without_listings(self, mock_listings):
+        mock_listings.side_effect = lambda market: []
+        recommendations = [{'name': 'Anything', 'ticker': 'ZZZZ', 'market': 'US'}]
+
+        self.assertEqual(security_master.validate_recommendations(recommendations, ['US']), recommendations)
+
+class TestCachedListings(unittest.TestCase):
+
+    def setUp(self):
+        listings_patch = patch.dict(security_master._listings, clear=True)
+        listings_patch.start()
+        self.addCleanup(listings_patch.stop)
+
+    def test_never_waits_for_a_download(self):
+        release = threading.Event()
+
+        def slow_load(market):
+            release.wait(5)
+            return LISTINGS[market]
+
+        with patch('modules.security_master._load_listing', side_effect=slow_load) as mock_load:
+            # Nothing loaded yet: answers at once and loads in the background, once
+            self.assertEqual(security_master.cached_listings('KRX'), [])
+            self.assertEqual(security_master.cached_listings('KRX'), [])
+            release.set()
+            deadline = time.time() + 5
+            while security_master._refreshing and time.time() < deadline:
+                time.sleep(0.01)
+
+            self.assertEqual(security_master.cached_listings('KRX'), LISTINGS['KRX'])
+            self.assertEqual(mock_load.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.singleflight import SingleFlight
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_computation(self):
+        flight = SingleFlight(ttl_seconds=60, max_entries=10)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"answer": 42}
+
+        async def run():
+            results = await asyncio.gather(*[flight.do(("hbm",), compute) for _ in range(5)])
+            later = await flight.do(("hbm",), compute)
+            return results, later
+
+        results, later = asyncio.run(run())
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"answer": 42}] * 5)
+        self.assertEqual(later, {"answer": 42})
+        self.assertEqual(flight.stats(), {"hits": 1, "coalesced": 4, "misses": 1, "inflight": 0, "entries": 1})
+
+    def test_failures_reach_waiters_but_are_not_cached(self):
+        flight = SingleFlight(ttl_seconds=60, max_entries=10)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        async def run():
+            first = await asyncio.gather(flight.do("k", compute), flight.do("k", compute), return_exceptions=True)
+            second = await asyncio.gather(flight.do("k", compute), return_exceptions=True)
+            return first + second
+
+        results = asyncio.run(run())
+
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(len(calls), 2)
+
+    def test_cancelled_caller_does_not_cancel_computation(self):
+        flight = SingleFlight(ttl_seconds=60, max_entries=10)
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do("k", compute))
+            follower = asyncio.ensure_future(flight.do("k", compute))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await follower
+
+        self.assertEqual(asyncio.run(run()), "done")
+
+    def test_shared_handles_stay_in_flight_until_complete(self):
+        flight = SingleFlight(ttl_seconds=0.2, max_entries=10)
+        started = []
+
+        def start():
+            handle = asyncio.get_running_loop().create_future()
+            started.append(handle)
+            return handle
+
+        async def run():
+            first = flight.share("k", start, lambda handle: handle)
+            await asyncio.sleep(0.3) # longer than the TTL, still running
+            joined = flight.share("k", start, lambda handle: handle)
+            inflight = flight.stats()["inflight"]
+            first.set_result("done")
+            await asyncio.sleep(0.1) # TTL counts from completion
+            cached = flight.share("k", start, lambda handle: handle)
+            return first, joined, inflight, cached
+
+        first, joined, inflight, cached = asyncio.run(run())
+
+        self.assertEqual(len(started), 1)
+        self.assertIs(joined, first)
+        self.assertIs(cached, first)
+        self.assertEqual(inflight, 1)
+        self.assertEqual(flight.stats(), {"hits": 1, "coalesced": 1, "misses": 1, "inflight": 0, "entries": 1})
+
+    def test_failed_shared_handles_are_dropped(self):
+        flight = SingleFlight(ttl_seconds=60, max_entries=10)
+
+        async def run():
+            failed = flight.share("k", asyncio.get_running_loop().create_future, lambda handle: handle)
+            failed.set_exception(ValueError("upstream down"))
+            failed.exception()
+            await asyncio.sleep(0)
+            return failed, flight.share("k", asyncio.get_running_loop().create_future, lambda handle: handle)
+
+        failed, retried = asyncio.run(run())
+
+        self.assertIsNot(retried, failed)
+        self.assertEqual(flight.stats()["misses"], 2)
+
+    def test_results_expire_and_evict(self):
+        flight = SingleFlight(ttl_seconds=60, max_entries=2)
+
+        async def run():
+            for key in ("a", "b", "c"):
+                await flight.do(key, lambda key=key: asyncio.sleep(0, result=key))
+
+        asyncio.run(run())
+
+        self.assertIsNone(flight.get_cached("a"))
+        self.assertEqual(flight.get_cached("c"), "c")
+        with patch('utils.singleflight.time.monotonic', return_value=float('inf')):
+            self.assertIsNone(flight.get_cached("c"))
+
+if __name__ == '__main__':
+    unittest.main()
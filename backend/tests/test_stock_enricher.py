@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import patch, AsyncMock
+import asyncio
+import time
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.stock_enricher import enrich_stocks
+
+def fake_summary(ticker, market):
+    if ticker == "SLOW":
+        time.sleep(0.5)
+    return {"price": 100.0, "change": 0.01}
+
+class TestStockEnricher(unittest.TestCase):
+
+    @patch('modules.stock_enricher.CHART_PNG_ENABLED', True)
+    @patch('modules.stock_enricher.get_indicators', return_value={"FAST": {"rsi_14": 55.0}})
+    @patch('modules.stock_enricher.generate_chart_async', new_callable=AsyncMock, return_value="static/charts/x.png")
+    @patch('modules.stock_enricher.get_financial_summary', side_effect=fake_summary)
+    def test_slow_ticker_returns_partial_result(self, mock_fin, mock_chart, mock_indicators):
+        stocks = [
+            {"name": "Fast", "ticker": "FAST", "market": "US", "reason": "..."},
+            {"name": "Slow", "ticker": "SLOW", "market": "US", "reason": "..."},
+        ]
+
+        results = asyncio.run(enrich_stocks(stocks, timeout=0.2))
+
+        self.assertEqual([r['ticker'] for r in results], ["FAST", "SLOW"])
+        self.assertEqual(results[0]['price'], 100.0)
+        self.assertIsNone(results[1]['price'])
+        self.assertEqual(results[1]['chart_path'], "static/charts/x.png")
+        self.assertEqual(results[0]['indicators'], {"rsi_14": 55.0})
+        self.assertIsNone(results[1]['indicators'])
+        # One panel for the whole request
+        mock_indicators.assert_called_once_with(["FAST", "SLOW"])
+
+    @patch('modules.stock_enricher.CHART_PNG_ENABLED', True)
+    @patch('modules.stock_enricher.get_indicators', return_value={})
+    @patch('modules.stock_enricher.generate_chart_async', new_callable=AsyncMock, side_effect=Exception("render failed"))
+    @patch('modules.stock_enricher.get_financial_summary', return_value={})
+    def test_failing_ticker_does_not_raise(self, mock_fin, mock_chart, mock_indicators):
+        stocks = [{"name": "Bad", "ticker": "BAD", "market": "KRX", "reason": "..."}]
+
+        results = asyncio.run(enrich_stocks(stocks, timeout=1))
+
+        self.assertIsNone(results[0]['price'])
+        self.assertIsNone(results[0]['chart_path'])
+
+    @patch('modules.stock_enricher.CHART_PNG_ENABLED', False)
+    @patch('modules.stock_enricher.get_indicators', return_value={})
+    @patch('modules.stock_enricher.generate_chart_async', new_callable=AsyncMock)
+    @patch('modules.stock_enricher.get_financial_summary', side_effect=fake_summary)
+    def test_png_disabled_skips_chart(self, mock_fin, mock_chart, mock_indicators):
+        results = asyncio.run(enrich_stocks([{"name": "Fast", "ticker": "FAST", "market": "US", "reason": "..."}]))
+
+        self.assertIsNone(results[0]['chart_path'])
+        self.assertEqual(results[0]['price'], 100.0)
+        mock_chart.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
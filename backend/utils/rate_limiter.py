@@ -0,0 +1,256 @@
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+from config import RATE_LIMIT_DB_PATH, RATE_LIMITS, RATE_LIMIT_MAX_WAIT_SECONDS
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# AIMD: halve the concurrency cap on a 429, grow it by about one slot per cap's worth of successes
+DECREASE_FACTOR = 0.5
+MIN_CONCURRENCY = 1.0
+# 429s for requests that were already in flight count as one decrease
+DECREASE_COOLDOWN_SECONDS = 1.0
+# Leases of a crashed process stop counting against the cap after this long
+LEASE_SECONDS = 120
+# Poll interval while every concurrency slot is taken
+SLOT_POLL_SECONDS = 0.05
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when no request slot became free within the maximum wait.
+    """
+
+class RateLimiter:
+    """
+    Per-service token bucket plus an AIMD cap on concurrent requests,
+    stored in SQLite so that every process on the host (all API workers
+    and the scheduler) draws from the same budget.
+
+    Each request takes a lease: one token from the bucket and one of the
+    concurrency slots. A 429 halves the concurrency cap, empties the
+    bucket and blocks the service until its Retry-After has passed;
+    successes raise the cap again additively up to `max_concurrency`. Services
+    without a configured limit are not limited. If the database cannot be
+    used, requests are let through.
+    """
+
+    def __init__(self, path: str, limits: Dict[str, Dict[str, float]], max_wait_seconds: float = RATE_LIMIT_MAX_WAIT_SECONDS):
+        self.path = path
+        self.limits = limits
+        self.max_wait_seconds = max_wait_seconds
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # WAL survives a crashed writer and lets readers proceed while another process writes
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        finally:
+            conn.close()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_state ("
+                " service TEXT PRIMARY KEY,"
+                " tokens REAL NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " concurrency REAL NOT NULL,"
+                " blocked_until REAL NOT NULL,"
+                " decreased_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_leases ("
+                " id TEXT PRIMARY KEY,"
+                " service TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_leases_service ON rate_leases (service, expires_at)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        try:
+            # In WAL mode NORMAL only syncs at checkpoints but cannot corrupt the file
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # IMMEDIATE takes the write lock up front, so read-modify-write is atomic across processes
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def _state(self, conn: sqlite3.Connection, service: str, now: float) -> Tuple[float, float, float, float]:
+        limits = self.limits[service]
+        row = conn.execute(
+            "SELECT tokens, updated_at, concurrency, blocked_until, decreased_at FROM rate_state WHERE service = ?", (service,)
+        ).fetchone()
+        if row is None:
+            return limits["burst"], limits["max_concurrency"], 0.0, 0.0
+        tokens, updated_at, concurrency, blocked_until, decreased_at = row
+        tokens = min(limits["burst"], tokens + max(0.0, now - updated_at) * limits["rate"])
+        return tokens, concurrency, blocked_until, decreased_at
+
+    def _save(self, conn: sqlite3.Connection, service: str, now: float, tokens: float, concurrency: float,
+              blocked_until: float, decreased_at: float) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO rate_state (service, tokens, updated_at, concurrency, blocked_until, decreased_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (service, tokens, now, concurrency, blocked_until, decreased_at)
+        )
+
+    def try_acquire(self, service: str) -> Tuple[Optional[str], float]:
+        """
+        Takes a lease if the service has a token and a free slot.
+
+        Returns:
+            (lease id, 0) on success, otherwise (None, seconds to wait
+            before trying again). The lease id is None with no wait for
+            services that are not limited.
+        """
+        if service not in self.limits:
+            return None, 0.0
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                tokens, concurrency, blocked_until, decreased_at = self._state(conn, service, now)
+                if now < blocked_until:
+                    return None, blocked_until - now
+
+                conn.execute("DELETE FROM rate_leases WHERE expires_at <= ?", (now,))
+                inflight = conn.execute("SELECT COUNT(*) FROM rate_leases WHERE service = ?", (service,)).fetchone()[0]
+                if inflight >= int(concurrency):
+                    return None, SLOT_POLL_SECONDS
+                if tokens < 1:
+                    return None, (1 - tokens) / self.limits[service]["rate"]
+
+                lease = uuid.uuid4().hex
+                conn.execute("INSERT INTO rate_leases (id, service, expires_at) VALUES (?, ?, ?)", (lease, service, now + LEASE_SECONDS))
+                self._save(conn, service, now, tokens - 1, concurrency, blocked_until, decreased_at)
+                return lease, 0.0
+        except sqlite3.Error as e:
+            logger.warning(f"Rate limiter unavailable, not limiting {service}: {e}")
+            return None, 0.0
+
+    def release(self, service: str, lease: Optional[str], throttled: bool = False, retry_after: Optional[float] = None) -> None:
+        """
+        Returns a lease and feeds the outcome back into the AIMD cap.
+
+        Args:
+            service: Service the lease was taken for.
+            lease: Lease id from try_acquire (None is ignored).
+            throttled: True if the upstream answered 429.
+            retry_after: Seconds the upstream asked to wait (for a 429).
+        """
+        if service not in self.limits:
+            return
+        now = time.time()
+        max_concurrency = self.limits[service]["max_concurrency"]
+        try:
+            with self._connect() as conn:
+                if lease:
+                    conn.execute("DELETE FROM rate_leases WHERE id = ?", (lease,))
+                tokens, concurrency, blocked_until, decreased_at = self._state(conn, service, now)
+                if throttled:
+                    tokens = 0.0
+                    blocked_until = max(blocked_until, now + (retry_after or 0.0))
+                    if now - decreased_at >= DECREASE_COOLDOWN_SECONDS:
+                        concurrency = max(MIN_CONCURRENCY, concurrency * DECREASE_FACTOR)
+                        decreased_at = now
+                        logger.warning(f"{service} throttled; concurrency cap now {concurrency:.1f}")
+                else:
+                    concurrency = min(max_concurrency, concurrency + 1 / concurrency)
+                self._save(conn, service, now, tokens, concurrency, blocked_until, decreased_at)
+        except sqlite3.Error as e:
+            logger.warning(f"Rate limiter release failed for {service}: {e}")
+
+    def _next_wait(self, service: str, waited: float, wait: float) -> float:
+        if waited + wait > self.max_wait_seconds:
+            raise RateLimitExceeded(f"No {service} request slot within {self.max_wait_seconds}s")
+        # Jitter so processes woken by the same Retry-After do not retry in lockstep
+        return min(wait, 1.0) * random.uniform(1.0, 1.2)
+
+    def acquire(self, service: str) -> Optional[str]:
+        """
+        Blocks until a lease is available and returns it.
+
+        Raises:
+            RateLimitExceeded: If that takes longer than max_wait_seconds.
+        """
+        waited = 0.0
+        while True:
+            lease, wait = self.try_acquire(service)
+            if wait <= 0:
+                return lease
+            delay = self._next_wait(service, waited, wait)
+            time.sleep(delay)
+            waited += delay
+
+    async def acquire_async(self, service: str) -> Optional[str]:
+        """
+        Async version of acquire. The SQLite work runs in a worker thread
+        so a busy database file does not stall the event loop.
+        """
+        waited = 0.0
+        while True:
+            lease, wait = await asyncio.to_thread(self.try_acquire, service)
+            if wait <= 0:
+                return lease
+            delay = self._next_wait(service, waited, wait)
+            await asyncio.sleep(delay)
+            waited += delay
+
+    async def release_async(self, service: str, lease: Optional[str], throttled: bool = False, retry_after: Optional[float] = None) -> None:
+        """
+        Async version of release, run in a worker thread.
+        """
+        await asyncio.to_thread(self.release, service, lease, throttled, retry_after)
+
+    def stats(self) -> Dict[str, Dict[str, Optional[float]]]:
+        now = time.time()
+        result = {}
+        try:
+            with self._connect() as conn:
+                for service in self.limits:
+                    tokens, concurrency, blocked_until, _ = self._state(conn, service, now)
+                    inflight = conn.execute(
+                        "SELECT COUNT(*) FROM rate_leases WHERE service = ? AND expires_at > ?", (service, now)
+                    ).fetchone()[0]
+                    result[service] = {
+                        "tokens": round(tokens, 2),
+                        "concurrency": round(concurrency, 2),
+                        "inflight": inflight,
+                        "blocked_seconds": round(max(0.0, blocked_until - now), 2),
+                    }
+        except sqlite3.Error as e:
+            logger.warning(f"Rate limiter stats failed: {e}")
+            fields = ("tokens", "concurrency", "inflight", "blocked_seconds")
+            result = {service: dict.fromkeys(fields) for service in self.limits}
+        return result
+
+_default_limiter: Optional[RateLimiter] = None
+_default_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Returns the process-wide rate limiter, or None if it cannot be opened.
+    """
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            try:
+                _default_limiter = RateLimiter(RATE_LIMIT_DB_PATH, RATE_LIMITS)
+            except Exception as e:
+                logger.error(f"Error opening rate limiter at {RATE_LIMIT_DB_PATH}: {e}")
+                return None
+        return _default_limiter
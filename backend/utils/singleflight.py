@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class SingleFlight:
+    """
+    Coalesces concurrent async calls that share a key and caches their
+    results for a short time.
+
+    The first caller for a key starts the computation as its own task;
+    callers arriving while it runs await the same task, and callers within
+    `ttl_seconds` after it finished get the cached result. Failures are
+    passed to every waiting caller but never cached. A caller that is
+    cancelled (e.g. the client disconnected) does not cancel the shared
+    computation.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # Tasks started by `do`, handles started by `share`
+        self._inflight: Dict[Hashable, Any] = {}
+        self._results: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._stats = {"hits": 0, "coalesced": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def get_cached(self, key: Hashable) -> Optional[Any]:
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._results[key]
+            return None
+        self._results.move_to_end(key)
+        return value
+
+    def _store(self, key: Hashable, done: asyncio.Future, value: Callable[[], Any]) -> None:
+        self._inflight.pop(key, None)
+        if done.cancelled() or done.exception() is not None:
+            return
+        if self.ttl_seconds > 0:
+            self._results[key] = (time.monotonic() + self.ttl_seconds, value())
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the result of `fn()` for `key`, computing it at most once
+        for all concurrent callers.
+        """
+        cached = self.get_cached(key)
+        if cached is not None:
+            self._count("hits")
+            return cached
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._count("coalesced")
+        else:
+            self._count("misses")
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._store(key, done, done.result))
+        return await asyncio.shield(task)
+
+    def share(self, key: Hashable, start: Callable[[], Any], completion: Callable[[Any], asyncio.Future]) -> Any:
+        """
+        Like `do`, for work that hands out a handle before it finishes
+        (e.g. a run whose stages are streamed as they complete).
+
+        `start()` returns the handle at once. The key stays in flight until
+        `completion(handle)` is done, and the handle is cached for
+        `ttl_seconds` from then; a handle whose completion failed is
+        dropped, so the next caller starts over. Keys used with `share`
+        must not also be used with `do`.
+        """
+        cached = self.get_cached(key)
+        if cached is not None:
+            self._count("hits")
+            return cached
+
+        handle = self._inflight.get(key)
+        if handle is not None:
+            self._count("coalesced")
+            return handle
+
+        self._count("misses")
+        handle = start()
+        self._inflight[key] = handle
+        completion(handle).add_done_callback(lambda done: self._store(key, done, lambda: handle))
+        return handle
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self._stats, inflight=len(self._inflight), entries=len(self._results))
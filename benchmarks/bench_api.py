@@ -0,0 +1,128 @@
+"""
+Benchmarks POST /analyze against local fake upstreams.
+
+Usage (from the repository root):
+    python benchmarks/bench_api.py --requests 40 --concurrency 1 4 16 --output api.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(os.path.dirname(BENCH_DIR), "backend")
+sys.path.insert(0, BENCH_DIR)
+
+from fakes import FAKE_TICKERS, FakeDataReader, FakeUpstreamServer, UpstreamBehaviour, fake_stock_listing
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+def summarize(latencies: List[float], errors: int, wall: float) -> Dict[str, Any]:
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "wall_seconds": round(wall, 4),
+        "throughput_rps": round((len(latencies) + errors) / wall, 3) if wall else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+async def run_level(app, total: int, concurrency: int, repeat_keywords: bool, run_id: str) -> Dict[str, Any]:
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(client, i: int) -> None:
+        nonlocal errors
+        # Unique keywords by default so every request runs the full pipeline
+        keywords = ["HBM", "2차전지"] if repeat_keywords else [f"HBM {run_id}-{concurrency}-{i}", f"2차전지 {i}"]
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post("/analyze", json={"keywords": keywords, "markets": ["KRX", "US"]})
+            elapsed = time.perf_counter() - started
+        if response.status_code == 200:
+            latencies.append(elapsed)
+        else:
+            errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[one(client, i) for i in range(total)])
+        wall = time.perf_counter() - started
+    return summarize(latencies, errors, wall)
+
+def main(argv=None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20, help="Requests per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--latency-ms", type=float, default=50, help="Mean latency of each fake upstream")
+    parser.add_argument("--gemini-latency-ms", type=float, default=300, help="Mean latency of the fake Gemini")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream calls that fail")
+    parser.add_argument("--repeat-keywords", action="store_true", help="Send identical keywords (exercises caches)")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    args = parser.parse_args(argv)
+
+    jitter = args.latency_ms / 1000 / 4
+    server = FakeUpstreamServer(
+        serper=UpstreamBehaviour(args.latency_ms / 1000, jitter, args.error_rate),
+        gemini=UpstreamBehaviour(args.gemini_latency_ms / 1000, jitter, args.error_rate, error_status=429),
+        naver=UpstreamBehaviour(args.latency_ms / 1000, jitter, args.error_rate),
+    ).start()
+    data_reader = FakeDataReader(UpstreamBehaviour(args.latency_ms / 1000, jitter, args.error_rate))
+
+    os.environ.update(server.env())
+    workdir = tempfile.mkdtemp(prefix="bench_api_")
+    # Fresh rate-limiter state per run instead of the host-wide default
+    os.environ["RATE_LIMIT_DB_PATH"] = os.path.join(workdir, "rate_limits.sqlite3")
+    os.chdir(workdir) # data/, static/charts and bot.log are relative to the working directory
+    sys.path.insert(0, BACKEND_DIR)
+    logging.disable(logging.WARNING)
+
+    import main as api
+
+    results: Dict[str, Any] = {
+        "benchmark": "api_analyze",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "levels": {},
+    }
+    # ASGITransport does not run the app lifespan, so start the chart workers here
+    renderer = api.get_chart_renderer()
+    if api.CHART_RENDER_WORKERS > 0:
+        renderer.start()
+    listing = fake_stock_listing([{"ticker": ticker, "name": name, "market": market}
+                                  for market, rows in FAKE_TICKERS.items() for ticker, name in rows])
+    try:
+        with patch("modules.price_store.fdr.DataReader", data_reader), \
+             patch("modules.security_master.fdr.StockListing", listing):
+            for concurrency in args.concurrency:
+                level = asyncio.run(run_level(api.app, args.requests, concurrency, args.repeat_keywords, server.nonce))
+                results["levels"][str(concurrency)] = level
+                print(f"concurrency={concurrency}: {level}", file=sys.stderr)
+    finally:
+        server.stop()
+        renderer.shutdown()
+
+    results["upstream_requests"] = dict(server.request_counts, fdr=data_reader.calls)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(main(), indent=2))
@@ -0,0 +1,112 @@
+"""
+Benchmarks one scheduler cycle (main.job()) against local fake upstreams
+for watchlists of increasing size.
+
+Usage (from the repository root):
+    python benchmarks/bench_job.py --watchlist-sizes 10 100 1000 10000 --output job.json
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fakes import FakeDataReader, FakeUpstreamServer, UpstreamBehaviour, fake_stock_listing
+
+def make_watchlist(size: int) -> List[Dict[str, str]]:
+    watchlist = []
+    for i in range(size):
+        if i % 2 == 0:
+            watchlist.append({"ticker": f"{i:06d}", "market": "KRX", "name": f"Korea Holdings {i:05d}"})
+        else:
+            watchlist.append({"ticker": f"US{i:05d}", "market": "US", "name": f"America Corp {i:05d}"})
+    return watchlist
+
+def main(argv=None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--watchlist-sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--cycles", type=int, default=2, help="Cycles per watchlist size")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Mean latency of each fake upstream")
+    parser.add_argument("--gemini-latency-ms", type=float, default=300, help="Mean latency of the fake Gemini")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream calls that fail")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    args = parser.parse_args(argv)
+
+    jitter = args.latency_ms / 1000 / 4
+    server = FakeUpstreamServer(
+        serper=UpstreamBehaviour(args.latency_ms / 1000, jitter, args.error_rate),
+        gemini=UpstreamBehaviour(args.gemini_latency_ms / 1000, jitter, args.error_rate, error_status=429),
+        naver=UpstreamBehaviour(args.latency_ms / 1000, jitter, args.error_rate),
+    ).start()
+    data_reader = FakeDataReader(UpstreamBehaviour(args.latency_ms / 1000, jitter, args.error_rate))
+
+    os.environ.update(server.env())
+    workdir = tempfile.mkdtemp(prefix="bench_job_")
+    # Fresh rate-limiter state per run instead of the host-wide default
+    os.environ["RATE_LIMIT_DB_PATH"] = os.path.join(workdir, "rate_limits.sqlite3")
+    os.chdir(workdir) # data/ and bot.log are relative to the working directory
+    sys.path.insert(0, ROOT_DIR)
+    logging.disable(logging.WARNING)
+
+    import main as bot
+
+    alerts: List[Dict[str, Any]] = []
+
+    def fake_enqueue_alert(alert_data):
+        alerts.append(alert_data)
+        return True
+
+    results: Dict[str, Any] = {
+        "benchmark": "scheduler_job",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "sizes": {},
+    }
+    rng = random.Random(0)
+    # The full-market listing is the largest watchlist, as with real KRX/US listings
+    listing = fake_stock_listing(make_watchlist(max(args.watchlist_sizes)))
+    try:
+        for size in args.watchlist_sizes:
+            watchlist = make_watchlist(size)
+            server.mention_names = [stock["name"] for stock in rng.sample(watchlist, min(size, 20))]
+            durations = []
+            with patch.object(bot, "WATCHLIST", watchlist), \
+                 patch.object(bot, "enqueue_alert", fake_enqueue_alert), \
+                 patch("modules.price_store.fdr.DataReader", data_reader), \
+                 patch("modules.security_master.fdr.StockListing", listing):
+                for _ in range(args.cycles):
+                    server.nonce = str(time.time_ns()) # fresh stories every cycle
+                    alerts.clear()
+                    started = time.perf_counter()
+                    bot.job()
+                    durations.append(time.perf_counter() - started)
+
+            mean = sum(durations) / len(durations)
+            results["sizes"][str(size)] = {
+                "cycles": len(durations),
+                "mean_cycle_seconds": round(mean, 4),
+                "max_cycle_seconds": round(max(durations), 4),
+                "watchlist_entries_per_second": round(size / mean, 1) if mean else None,
+                "alerts_last_cycle": len(alerts),
+            }
+            print(f"watchlist={size}: {results['sizes'][str(size)]}", file=sys.stderr)
+    finally:
+        server.stop()
+
+    results["upstream_requests"] = dict(server.request_counts, fdr=data_reader.calls)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(main(), indent=2))
@@ -0,0 +1,133 @@
+"""
+Measures cold-start time of the API and the scheduler.
+
+For each tree this imports `main` in fresh interpreters with
+`-X importtime` and records the wall time and the cumulative import time of
+every project module and every top-level third-party package. For the API
+it also starts uvicorn and times how long it takes until GET / answers.
+
+Usage (from the repository root):
+    python benchmarks/bench_startup.py --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Any, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+TREES = {"api": os.path.join(ROOT_DIR, "backend"), "scheduler": ROOT_DIR}
+PROJECT_PREFIXES = ("main", "config", "modules", "utils")
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def _env(tree_dir: str) -> Dict[str, str]:
+    env = dict(os.environ, PYTHONPATH=tree_dir)
+    env.pop("PYTHONIMPORTTIME", None)
+    return env
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """
+    Returns cumulative import seconds for project modules and top-level
+    third-party packages (nested third-party imports are folded into their
+    top-level package).
+    """
+    times: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match.group(2)), (len(match.group(3)) - 1) // 2, match.group(4)
+        is_project = name.split(".")[0] in PROJECT_PREFIXES
+        if is_project or depth == 0 or "." not in name:
+            times[name] = cumulative / 1e6
+    return times
+
+def measure_import(tree_dir: str, workdir: str) -> Dict[str, Any]:
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=workdir,
+                            env=_env(tree_dir), capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - started
+    return {"wall_seconds": wall, "modules": parse_importtime(result.stderr)}
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def measure_healthy(tree_dir: str, workdir: str, timeout: float = 60.0) -> float:
+    """
+    Seconds from launching uvicorn until GET / returns 200.
+    """
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+                               cwd=workdir, env=_env(tree_dir), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError("API did not become healthy")
+    finally:
+        process.terminate()
+        process.wait()
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {"median_seconds": round(statistics.median(samples), 4), "max_seconds": round(max(samples), 4)}
+
+def main(argv=None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to keep per tree")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {
+        "benchmark": "startup",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+    }
+    # data/, static/ and bot.log are relative to the working directory
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    os.makedirs(os.path.join(workdir, "static"), exist_ok=True)
+
+    for tree, tree_dir in TREES.items():
+        # One warm-up run so .pyc compilation is not counted
+        measure_import(tree_dir, workdir)
+        runs = [measure_import(tree_dir, workdir) for _ in range(args.runs)]
+        modules: Dict[str, List[float]] = {}
+        for run in runs:
+            for name, seconds in run["modules"].items():
+                modules.setdefault(name, []).append(seconds)
+        medians = {name: statistics.median(samples) for name, samples in modules.items()}
+        slowest = sorted(medians.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+        results[tree] = {
+            "process": summarize([run["wall_seconds"] for run in runs]),
+            "import_main": summarize([run["modules"].get("main", 0.0) for run in runs]),
+            "imports_ms": {name: round(seconds * 1000, 2) for name, seconds in slowest},
+        }
+        print(f"{tree}: {results[tree]['import_main']}", file=sys.stderr)
+
+    results["api"]["healthy"] = summarize([measure_healthy(TREES["api"], workdir) for _ in range(args.runs)])
+    print(f"api healthy: {results['api']['healthy']}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+if __name__ == "__main__":
+    print(json.dumps(main(), indent=2))
@@ -0,0 +1,285 @@
+"""
+Local stand-ins for the upstream services used by the bot and the API.
+
+FakeUpstreamServer answers Serper, Gemini and Naver Finance requests on a
+localhost port; FakeDataReader replaces FinanceDataReader.DataReader.
+Both support configurable latency and error injection so benchmarks run
+fully offline.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+FAKE_TICKERS = {
+    "KRX": [("005930", "Samsung Electronics"), ("000660", "SK Hynix"), ("035420", "NAVER"),
+            ("005380", "Hyundai Motor"), ("373220", "LG Energy Solution"), ("068270", "Celltrion")],
+    "US": [("AAPL", "Apple"), ("NVDA", "NVIDIA"), ("TSLA", "Tesla"),
+           ("MSFT", "Microsoft"), ("AVGO", "Broadcom"), ("AMD", "AMD")],
+}
+
+def _stable_int(text: str) -> int:
+    return int(hashlib.md5(text.encode('utf-8')).hexdigest()[:8], 16)
+
+class UpstreamBehaviour:
+    """
+    Latency and failure settings for one fake service.
+
+    Attributes:
+        latency: Mean response delay in seconds.
+        jitter: Uniform +/- jitter added to the delay, in seconds.
+        error_rate: Fraction of requests answered with `error_status`.
+        error_status: HTTP status used for injected errors (e.g. 429 or 503).
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, error_status: int = 503):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+    def delay(self) -> None:
+        seconds = self.latency + random.uniform(-self.jitter, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+class FakeUpstreamServer:
+    """
+    Threaded HTTP server that imitates Serper, Gemini and Naver Finance.
+
+    Point the apps at it with the SERPER_BASE_URL, GEMINI_BASE_URL and
+    NAVER_FINANCE_BASE_URL environment variables (see `env()`).
+    """
+
+    def __init__(self, serper: Optional[UpstreamBehaviour] = None, gemini: Optional[UpstreamBehaviour] = None,
+                 naver: Optional[UpstreamBehaviour] = None):
+        self.behaviours = {
+            "serper": serper or UpstreamBehaviour(),
+            "gemini": gemini or UpstreamBehaviour(),
+            "naver": naver or UpstreamBehaviour(),
+        }
+        # Names the fake news headlines mention, so watchlist matching has work to do
+        self.mention_names: List[str] = []
+        # Changes every run so links and prompts never hit persistent caches by accident
+        self.nonce = str(time.time_ns())
+        self.request_counts = {"serper": 0, "gemini": 0, "naver": 0}
+        self._counts_lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        return {
+            "SERPER_BASE_URL": self.base_url,
+            "GEMINI_BASE_URL": self.base_url,
+            "NAVER_FINANCE_BASE_URL": self.base_url,
+            "SERPER_API_KEY": "fake-serper-key",
+            "GEMINI_API_KEY": "fake-gemini-key",
+        }
+
+    def start(self) -> "FakeUpstreamServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, service: str) -> None:
+        with self._counts_lock:
+            self.request_counts[service] += 1
+
+    # --- Response builders -------------------------------------------------
+
+    def serper_news(self, query: str, num: int) -> Dict[str, Any]:
+        items = []
+        for i in range(num):
+            seed = _stable_int(f"{self.nonce}|{query}|{i}")
+            subject = self.mention_names[seed % len(self.mention_names)] if self.mention_names else query
+            items.append({
+                "title": f"{subject} shares move as {query} headline {seed % 1000} breaks",
+                "link": f"https://news.example.com/{self.nonce}/{seed}",
+                "snippet": f"Analysts discuss what {query} means for {subject} and its sector. " * 3,
+                "date": f"{seed % 59 + 1} minutes ago",
+                "source": "Example Wire",
+            })
+        return {"news": items}
+
+    def serper_search(self, query: str) -> Dict[str, Any]:
+        return {"organic": [
+            {"title": f"How markets reacted: {query} ({year})", "snippet": f"In {year} stocks moved {i + 1}% after similar news."}
+            for i, year in enumerate((2019, 2021, 2023))
+        ]}
+
+    def gemini_text(self, prompt: str) -> str:
+        seed = _stable_int(prompt)
+        if "one object per article" in prompt:
+            count = len(re.findall(r"^\s*\[(\d+)\] Title:", prompt, re.MULTILINE))
+            return "```json\n" + json.dumps([self._triage(seed + i, index=i) for i in range(count)]) + "\n```"
+        if "Recommend 3-5 stocks" in prompt:
+            markets = [m for m in FAKE_TICKERS if m in prompt] or list(FAKE_TICKERS)
+            picks = []
+            for i in range(3 + seed % 3):
+                market = markets[(seed + i) % len(markets)]
+                ticker, name = FAKE_TICKERS[market][(seed + i) % len(FAKE_TICKERS[market])]
+                if all(p["ticker"] != ticker for p in picks):
+                    picks.append({"name": name, "ticker": ticker, "market": market, "reason": "수혜 예상"})
+            return "```json\n" + json.dumps(picks, ensure_ascii=False) + "\n```"
+        if "Output JSON format ONLY" in prompt:
+            return "```json\n" + json.dumps(self._triage(seed)) + "\n```"
+        return "Historically, similar events caused a short-lived 2-3% move before prices recovered."
+
+    @staticmethod
+    def _triage(seed: int, index: Optional[int] = None) -> Dict[str, Any]:
+        result = {
+            "importance": ("High", "Mid", "Low")[seed % 3],
+            "reason": "Fake analysis for benchmarking.",
+            "themes": ["Semiconductors", "AI"],
+            "search_query": f"semiconductor export news {seed % 50}",
+        }
+        if index is not None:
+            result["index"] = index
+        return result
+
+    @staticmethod
+    def naver_item_page(code: str) -> str:
+        seed = _stable_int(code)
+        filler = "<div class='filler'>" + "market data " * 2000 + "</div>"
+        return (
+            f"<html><head><title>{code}</title></head><body>{filler}"
+            f"<em id=\"_per\">{5 + seed % 30}.{seed % 100:02d}</em>"
+            f"<em id=\"_pbr\">{seed % 5}.{seed % 100:02d}</em>"
+            f"{filler}</body></html>"
+        )
+
+    # --- HTTP plumbing -------------------------------------------------------
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _service(self) -> Optional[str]:
+                if self.path.startswith("/news") or self.path.startswith("/search"):
+                    return "serper"
+                if self.path.startswith("/v1beta/models/"):
+                    return "gemini"
+                if self.path.startswith("/item/"):
+                    return "naver"
+                return None
+
+            def _handle(self, payload: Dict[str, Any]) -> None:
+                service = self._service()
+                if service is None:
+                    self._send(404, b"{}")
+                    return
+                fake._count(service)
+                behaviour = fake.behaviours[service]
+                behaviour.delay()
+                if behaviour.should_fail():
+                    self._send(behaviour.error_status, b'{"error": "injected"}')
+                    return
+
+                if self.path.startswith("/news"):
+                    body = fake.serper_news(payload.get("q", ""), int(payload.get("num", 5)))
+                elif self.path.startswith("/search"):
+                    body = fake.serper_search(payload.get("q", ""))
+                elif service == "gemini":
+                    prompt = payload["contents"][0]["parts"][0]["text"]
+                    body = {"candidates": [{"content": {"parts": [{"text": fake.gemini_text(prompt)}]}}]}
+                else:
+                    code = self.path.split("code=")[-1]
+                    self._send(200, fake.naver_item_page(code).encode("utf-8"), "text/html; charset=utf-8")
+                    return
+                self._send(200, json.dumps(body, ensure_ascii=False).encode("utf-8"))
+
+            def do_GET(self):
+                self._handle({})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b"{}"
+                self._handle(json.loads(raw or b"{}"))
+
+        return Handler
+
+class FakeDataReader:
+    """
+    Drop-in replacement for FinanceDataReader.DataReader.
+
+    Returns a deterministic random-walk OHLCV series per ticker, covering
+    business days between `start` and today, after `behaviour.delay()`.
+    """
+
+    def __init__(self, behaviour: Optional[UpstreamBehaviour] = None):
+        self.behaviour = behaviour or UpstreamBehaviour()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, symbol: str, start=None, end=None, *args, **kwargs) -> pd.DataFrame:
+        with self._lock:
+            self.calls += 1
+        self.behaviour.delay()
+        if self.behaviour.should_fail():
+            raise ConnectionError(f"injected FDR failure for {symbol}")
+
+        end_ts = pd.Timestamp(end) if end is not None else pd.Timestamp(datetime.now().date())
+        start_ts = pd.Timestamp(start) if start is not None else end_ts - timedelta(days=365 * 10)
+        # Generate from a fixed origin so overlapping requests agree on values
+        origin = pd.Timestamp("2010-01-01")
+        index = pd.bdate_range(origin, end_ts, name="Date")
+        rng = np.random.default_rng(_stable_int(symbol))
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, len(index))))
+        spread = np.abs(rng.normal(0, 0.01, len(index))) * close
+        df = pd.DataFrame({
+            "Open": close + rng.normal(0, 0.005, len(index)) * close,
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Volume": rng.integers(100_000, 5_000_000, len(index)),
+        }, index=index)
+        df["Change"] = df["Close"].pct_change()
+        return df.loc[start_ts:end_ts]
+
+def fake_stock_listing(securities: List[Dict[str, str]]):
+    """
+    Builds a replacement for FinanceDataReader.StockListing serving the
+    given securities (KRX rows under "KRX", US rows under "NASDAQ").
+    """
+    def stock_listing(market: str, *args, **kwargs) -> pd.DataFrame:
+        if market.upper() == "KRX":
+            rows = [{"Code": s["ticker"], "Name": s["name"]} for s in securities if s["market"] == "KRX"]
+            return pd.DataFrame(rows, columns=["Code", "Name"])
+        if market.upper() == "NASDAQ":
+            rows = [{"Symbol": s["ticker"], "Name": s["name"]} for s in securities if s["market"] == "US"]
+            return pd.DataFrame(rows, columns=["Symbol", "Name"])
+        return pd.DataFrame(columns=["Symbol", "Name"])
+    return stock_listing
@@ -0,0 +1,106 @@
+"""
+Runs the offline benchmark suite and saves the results as JSON.
+
+The API and the scheduler live in separate trees with their own `config`
+and `modules` packages, so each benchmark runs in its own subprocess.
+
+Usage (from the repository root):
+    python benchmarks/run.py                              # full suite
+    python benchmarks/run.py --quick                      # small smoke run
+    python benchmarks/run.py --baseline benchmarks/results/baseline.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+# Metrics where a larger value is a regression
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "mean_cycle_seconds", "max_cycle_seconds", "seconds")
+
+def run_benchmark(script: str, extra_args: List[str]) -> Dict[str, Any]:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+        output = tmp.name
+    try:
+        subprocess.run([sys.executable, os.path.join(BENCH_DIR, script), "--output", output] + extra_args, check=True,
+                       stdout=subprocess.DEVNULL)
+        with open(output, encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.remove(output)
+
+def _flatten(prefix: str, value: Any, out: Dict[str, float]) -> None:
+    if isinstance(value, dict):
+        for key, child in value.items():
+            _flatten(f"{prefix}.{key}" if prefix else key, child, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = float(value)
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Returns a description of every latency metric that got worse than the
+    baseline by more than `threshold` (a fraction, e.g. 0.2 for 20%).
+    """
+    now: Dict[str, float] = {}
+    before: Dict[str, float] = {}
+    _flatten("", current.get("benchmarks", {}), now)
+    _flatten("", baseline.get("benchmarks", {}), before)
+
+    regressions = []
+    for key, value in sorted(now.items()):
+        if key not in before or not key.endswith(LOWER_IS_BETTER) or before[key] <= 0:
+            continue
+        change = (value - before[key]) / before[key]
+        if change > threshold:
+            regressions.append(f"{key}: {before[key]:g} -> {value:g} (+{change:.0%})")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Small request counts and watchlists")
+    parser.add_argument("--output", help="Results path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before flagging a regression")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        api_args = ["--requests", "4", "--concurrency", "1", "4"]
+        job_args = ["--watchlist-sizes", "10", "1000", "--cycles", "1"]
+        startup_args = ["--runs", "2"]
+    else:
+        api_args = ["--requests", "40", "--concurrency", "1", "4", "16"]
+        job_args = ["--watchlist-sizes", "10", "100", "1000", "10000"]
+        startup_args = ["--runs", "5"]
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "benchmarks": {
+            "api_analyze": run_benchmark("bench_api.py", api_args),
+            "scheduler_job": run_benchmark("bench_job.py", job_args),
+            "startup": run_benchmark("bench_startup.py", startup_args),
+        },
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -6,16 +7,99 @@ load_dotenv()
 # API Keys
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+# Comma-separated list, e.g. TELEGRAM_CHAT_ID=12345,-100987654
+TELEGRAM_CHAT_IDS = [chat_id.strip() for chat_id in (TELEGRAM_CHAT_ID or "").split(",") if chat_id.strip()]
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 
+# Upstream base URLs (overridable so benchmarks can point at local fakes)
+SERPER_BASE_URL = os.getenv("SERPER_BASE_URL", "https://google.serper.dev")
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com")
+NAVER_FINANCE_BASE_URL = os.getenv("NAVER_FINANCE_BASE_URL", "https://finance.naver.com")
+
 # Configuration
 SCHEDULE_INTERVAL_MINUTES = 10
+ANALYSIS_BATCH_SIZE = 10 # Articles per Gemini triage call
+# Analysis pipeline (triage -> history search -> synthesis): workers per stage and queue bound
+ANALYSIS_TRIAGE_CONCURRENCY = 2
+ANALYSIS_HISTORY_CONCURRENCY = 5
+ANALYSIS_SYNTHESIS_CONCURRENCY = 4
+ANALYSIS_QUEUE_SIZE = 20
+
+# Shared HTTP client: (connect, read) timeouts per upstream service
+HTTP_TIMEOUTS = {
+    "serper": (3.05, 10),
+    "gemini": (3.05, 60),
+    "naver": (3.05, 10),
+}
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_POOL_SIZE = 10
+
+# Upstream rate limits, shared through one SQLite file by every process on
+# the host (API workers and the bot): token bucket (requests/second, burst)
+# plus an adaptive cap on concurrent requests that halves on each 429
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", os.path.join(tempfile.gettempdir(), "ai_stock_news_rate_limits.sqlite3"))
+RATE_LIMITS = {
+    "gemini": {"rate": float(os.getenv("GEMINI_RATE_PER_SECOND", 25)), "burst": 50, "max_concurrency": 32},
+    "serper": {"rate": float(os.getenv("SERPER_RATE_PER_SECOND", 50)), "burst": 100, "max_concurrency": 20},
+}
+RATE_LIMIT_MAX_WAIT_SECONDS = 60
 MARKET_KRX = "KRX"
 MARKET_US = "US"
 
+# Telegram delivery (Bot API limits: ~30 msg/s overall, ~1 msg/s per chat)
+TELEGRAM_GLOBAL_RATE_PER_SECOND = 25
+TELEGRAM_PER_CHAT_INTERVAL_SECONDS = 1.0
+TELEGRAM_MAX_ATTEMPTS = 5
+TELEGRAM_QUEUE_SIZE = 10000
+TELEGRAM_WORKERS = 8
+
+# Local OHLCV store
+DATA_DIR = "data"
+PRICE_STORE_DIR = os.path.join(DATA_DIR, "prices")
+PRICE_STORE_LOOKBACK_DAYS = 400
+PRICE_STORE_REFRESH_SECONDS = 300
+
+# Security master (daily snapshot of fdr.StockListing)
+SECURITY_MASTER_DIR = os.path.join(DATA_DIR, "listings")
+SECURITY_MASTER_REFRESH_SECONDS = 24 * 60 * 60
+
+# Seen-news store (Serper is queried for the last 24h, so keep links a bit longer)
+SEEN_STORE_PATH = os.path.join(DATA_DIR, "seen_news.sqlite3")
+SEEN_TTL_SECONDS = 3 * 24 * 60 * 60
+SEEN_BLOOM_CAPACITY = 100000
+SEEN_BLOOM_ERROR_RATE = 0.01
+
+# Naver Finance PER/PBR, cached per trading day
+FUNDAMENTALS_CACHE_PATH = os.path.join(DATA_DIR, "fundamentals.sqlite3")
+FUNDAMENTALS_MAX_WORKERS = 8
+
+# Technical indicators (bars per ticker in the panel; ~1 year for the 52-week range)
+INDICATOR_PANEL_LENGTH = 260
+INDICATOR_LOAD_WORKERS = 8
+
+# LLM response cache
+LLM_CACHE_PATH = os.path.join(DATA_DIR, "llm_cache.sqlite3")
+LLM_CACHE_TTL_SECONDS = 6 * 60 * 60
+LLM_CACHE_MAX_ENTRIES = 5000
+
+# Reuse of historical market reactions: a new history-search query within
+# this cosine similarity of an answered one gets the stored reaction
+REACTION_INDEX_PATH = os.path.join(DATA_DIR, "reaction_index.sqlite3")
+REACTION_INDEX_THRESHOLD = 0.87
+REACTION_INDEX_TTL_SECONDS = 7 * 24 * 60 * 60
+REACTION_INDEX_MAX_ENTRIES = 5000
+
+# Archive of every fetched article (FTS5 search, shared with the API when
+# NEWS_ARCHIVE_PATH points both at one file)
+NEWS_ARCHIVE_PATH = os.getenv("NEWS_ARCHIVE_PATH", os.path.join(DATA_DIR, "news_archive.sqlite3"))
+NEWS_ARCHIVE_FRESH_SECONDS = 15 * 60
+NEWS_ARCHIVE_WINDOW_HOURS = 24
+
 # Watchlist (Example)
+# Optional "aliases" are matched in news text alongside the name and ticker.
 WATCHLIST = [
-    {"ticker": "005930", "market": MARKET_KRX, "name": "Samsung Electronics"},
-    {"ticker": "TSLA", "market": MARKET_US, "name": "Tesla"},
+    {"ticker": "005930", "market": MARKET_KRX, "name": "Samsung Electronics", "aliases": ["삼성전자", "Samsung"]},
+    {"ticker": "TSLA", "market": MARKET_US, "name": "Tesla", "aliases": ["테슬라"]},
 ]
@@ -9,23 +9,49 @@ function App() {
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState(null);
 
-  const handleSearch = async (keywords, markets) => {
+  const handleSearch = (keywords, markets) => {
     setIsLoading(true);
     setError(null);
     setResult(null);
 
-    try {
-      const response = await axios.post('http://localhost:8000/analyze', {
-        keywords,
-        markets
-      });
-      setResult(response.data);
-    } catch (err) {
-      console.error(err);
-      setError('분석 정보를 가져오는데 실패했습니다. 다시 시도해주세요.');
-    } finally {
+    // Stream stage results as they finish instead of waiting for the whole analysis
+    const params = new URLSearchParams();
+    keywords.forEach(keyword => params.append('keywords', keyword));
+    markets.forEach(market => params.append('markets', market));
+    // Keywords searched a few minutes ago are answered from the server's news archive
+    params.append('use_archive', 'true');
+    const source = new EventSource(`http://localhost:8000/analyze/stream?${params}`);
+
+    const finish = () => {
+      source.close();
       setIsLoading(false);
-    }
+    };
+
+    source.addEventListener('news', (e) => {
+      const { news_items } = JSON.parse(e.data);
+      setResult({ news_summary: null, themes: [], recommended_stocks: [], news_items });
+    });
+
+    source.addEventListener('analysis', (e) => {
+      const { news_summary, themes } = JSON.parse(e.data);
+      setResult(prev => ({ ...prev, news_summary, themes }));
+    });
+
+    source.addEventListener('stock', (e) => {
+      const stock = JSON.parse(e.data);
+      setResult(prev => ({ ...prev, recommended_stocks: [...prev.recommended_stocks, stock] }));
+    });
+
+    source.addEventListener('done', finish);
+
+    source.addEventListener('error', (e) => {
+      // Server-sent error events carry data; connection failures do not
+      if (e.data) {
+        console.error(JSON.parse(e.data));
+      }
+      setError('분석 정보를 가져오는데 실패했습니다. 다시 시도해주세요.');
+      finish();
+    });
   };
 
   const handleSendTelegram = async () => {
@@ -55,7 +81,7 @@ function App() {
             <section className="summary-section">
               <h2>뉴스 요약</h2>
               <div className="summary-box">
-                <p>{result.news_summary}</p>
+                <p>{result.news_summary ?? '뉴스를 분석하는 중...'}</p>
               </div>
 
               <div className="themes-box">
@@ -86,6 +112,7 @@ function App() {
 
             <section className="recommendations-section">
               <h2>추천 종목</h2>
+              {isLoading && result.news_summary && <p className="loading-note">종목 정보를 불러오는 중...</p>}
               <div className="stock-grid">
                 {result.recommended_stocks.map((stock, index) => (
                   <StockCard key={index} stock={stock} />
@@ -93,11 +120,13 @@ function App() {
               </div>
             </section>
 
-            <div className="action-bar">
-              <button onClick={handleSendTelegram} className="telegram-button">
-                텔레그램으로 전송
-              </button>
-            </div>
+            {!isLoading && result.news_summary && (
+              <div className="action-bar">
+                <button onClick={handleSendTelegram} className="telegram-button">
+                  텔레그램으로 전송
+                </button>
+              </div>
+            )}
           </div>
         )}
       </main>
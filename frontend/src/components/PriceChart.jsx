@@ -0,0 +1,56 @@
+import React, { useEffect, useState } from 'react';
+import axios from 'axios';
+
+const WIDTH = 300;
+const PRICE_HEIGHT = 150;
+const VOLUME_HEIGHT = 40;
+const UP_COLOR = '#d32f2f'; // Red for up (KR style)
+const DOWN_COLOR = '#1976d2';
+
+// Draws candles and volume bars from /chart-data columns (t, o, h, l, c, v)
+const PriceChart = ({ url, name }) => {
+    const [data, setData] = useState(null);
+    const [failed, setFailed] = useState(false);
+
+    useEffect(() => {
+        let cancelled = false;
+        axios.get(`http://localhost:8000${url}`)
+            .then((response) => { if (!cancelled) setData(response.data); })
+            .catch(() => { if (!cancelled) setFailed(true); });
+        return () => { cancelled = true; };
+    }, [url]);
+
+    if (failed) return null;
+    if (!data) return <p className="loading-note">차트 불러오는 중...</p>;
+
+    const count = data.t.length;
+    const high = Math.max(...data.h);
+    const low = Math.min(...data.l);
+    const maxVolume = Math.max(...data.v, 1);
+    const step = WIDTH / count;
+    const bodyWidth = Math.max(step * 0.6, 1);
+    const y = (price) => high === low ? PRICE_HEIGHT / 2 : (high - price) / (high - low) * PRICE_HEIGHT;
+
+    return (
+        <svg className="price-chart" viewBox={`0 0 ${WIDTH} ${PRICE_HEIGHT + VOLUME_HEIGHT}`} role="img"
+             aria-label={`${name} ${data.t[0]} ~ ${data.t[count - 1]}`}>
+            {data.t.map((date, i) => {
+                const x = i * step + step / 2;
+                const color = data.c[i] >= data.o[i] ? UP_COLOR : DOWN_COLOR;
+                const top = y(Math.max(data.o[i], data.c[i]));
+                const volumeHeight = data.v[i] / maxVolume * VOLUME_HEIGHT;
+                return (
+                    <g key={date}>
+                        <line x1={x} x2={x} y1={y(data.h[i])} y2={y(data.l[i])} stroke={color} strokeWidth="0.5" />
+                        <rect x={x - bodyWidth / 2} y={top} width={bodyWidth}
+                              height={Math.max(y(Math.min(data.o[i], data.c[i])) - top, 0.5)} fill={color} />
+                        <rect x={x - bodyWidth / 2} y={PRICE_HEIGHT + VOLUME_HEIGHT - volumeHeight} width={bodyWidth}
+                              height={volumeHeight} fill={color} opacity="0.4" />
+                    </g>
+                );
+            })}
+        </svg>
+    );
+};
+
+export default PriceChart;
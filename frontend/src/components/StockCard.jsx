@@ -1,4 +1,8 @@
 import React from 'react';
+import PriceChart from './PriceChart';
+
+const formatNumber = (value, scale = 1, suffix = '') =>
+    value === null || value === undefined ? 'N/A' : `${(value * scale).toFixed(1)}${suffix}`;
 
 const StockCard = ({ stock }) => {
     const isPositive = stock.change >= 0;
@@ -21,11 +25,24 @@ const StockCard = ({ stock }) => {
 
             <p className="stock-reason"><strong>추천 사유:</strong> {stock.reason}</p>
 
-            {stock.chart_url && (
+            {stock.indicators && (
+                <div className="stock-indicators">
+                    <span>RSI(14): {formatNumber(stock.indicators.rsi_14)}</span>
+                    <span>SMA20: {stock.indicators.sma_20?.toLocaleString() ?? 'N/A'}</span>
+                    <span>변동성(20D): {formatNumber(stock.indicators.volatility_20, 100, '%')}</span>
+                    <span>52주 위치: {formatNumber(stock.indicators.range_position_52w, 100, '%')}</span>
+                </div>
+            )}
+
+            {stock.chart_url ? (
                 <div className="stock-chart">
                     {/* Use full URL for local dev or proxy */}
                     <img src={`http://localhost:8000${stock.chart_url}`} alt={`${stock.name} Chart`} />
                 </div>
+            ) : stock.chart_data_url && (
+                <div className="stock-chart">
+                    <PriceChart url={stock.chart_data_url} name={stock.name} />
+                </div>
             )}
         </div>
     );
@@ -1,22 +1,26 @@
 import schedule
 import time
-import asyncio
-from config import WATCHLIST, SCHEDULE_INTERVAL_MINUTES
+from config import WATCHLIST, SCHEDULE_INTERVAL_MINUTES, MARKET_KRX
 from modules.news_fetcher import fetch_news
-from modules.ai_analyzer import analyze_news
+from modules.analysis_pipeline import run_analysis_pipeline
 from modules.finance_data import get_stock_data
-from modules.telegram_bot import send_alert
+from modules.fundamentals import refresh_fundamentals
+from modules.price_loader import price_loader_scope
+from modules.indicators import get_indicators, rank_tickers
+from modules.telegram_bot import enqueue_alert, get_dispatcher
+from modules.seen_store import get_seen_store
+from modules.symbol_index import get_symbol_index
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-# Cache to prevent duplicate alerts for the same news
-# Key: News Title or URL, Value: Timestamp
-news_cache = {}
-
 def job():
     logger.info("Starting scheduled job...")
     
+    # Persistent store to prevent duplicate alerts for the same news across restarts
+    seen_store = get_seen_store()
+    seen_store.prune()
+    
     # In a real scenario, we might want to search for general market news or specific news for watchlist items.
     # For this bot, let's iterate through the watchlist to find specific news, 
     # OR we could just search for "Global Stock Market News" or "Korean Stock Market News".
@@ -33,67 +37,103 @@ def job():
         items = fetch_news(q, n=3)
         all_news.extend(items)
         
-    # Deduplicate
-    unique_news = {item['link']: item for item in all_news}.values()
+    # Deduplicate (articles without a link cannot be tracked as seen, so they are dropped)
+    unique_news = {item['link']: item for item in all_news if item.get('link')}.values()
     
-    for news_item in unique_news:
-        link = news_item.get('link')
-        title = news_item.get('title')
+    new_items = [item for item in unique_news if not seen_store.contains(item.get('link'))]
+    if not new_items:
+        logger.info("No new news this cycle.")
+        return
         
-        if link in news_cache:
-            continue
-            
-        logger.info(f"Analyzing news: {title}")
-        
-        # AI Analysis
-        analysis = analyze_news(news_item)
+    symbol_index = get_symbol_index(WATCHLIST)
+    watchlist_by_key = {(stock['market'], str(stock['ticker'])): stock for stock in WATCHLIST}
+    
+    # AI Analysis (triage per batch of articles, then history search and synthesis, all stages overlapping)
+    logger.info(f"Analyzing {len(new_items)} news items")
+    analyses = run_analysis_pipeline(new_items)
+    
+    # Tickers mentioned by several articles are read from the price store once per cycle
+    with price_loader_scope():
+        for news_item, analysis in zip(new_items, analyses):
+            link = news_item.get('link')
+            title = news_item.get('title')
         
-        if not analysis:
-            continue
+            if not analysis:
+                continue
             
-        # Filter by Importance (Example: Only High/Mid)
-        if analysis.get('importance') == 'Low':
-            logger.info(f"Skipping Low importance news: {title}")
-            news_cache[link] = time.time() # Mark as seen
-            continue
+            # Filter by Importance (Example: Only High/Mid)
+            if analysis.get('importance') == 'Low':
+                logger.info(f"Skipping Low importance news: {title}")
+                seen_store.add(link) # Mark as seen
+                continue
             
-        # If important, find related stocks
-        # Theme extraction gives us string names. We need to map them to Tickers if possible.
-        # For this MVP, we will just pass the strings in the message, 
-        # BUT we can also check if any WATCHLIST items are mentioned or relevant.
+            # If important, find related stocks
+            # Theme extraction gives us string names. We need to map them to Tickers if possible.
+            # For this MVP, we will just pass the strings in the message, 
+            # BUT we can also check if any WATCHLIST items are mentioned or relevant.
+        
+            related_stocks_data = []
+            themes = analysis.get('themes') or []
         
-        related_stocks_data = []
-        themes = analysis.get('themes', [])
+            # One pass over title + themes finds every mentioned security (names, Korean names, aliases, tickers)
+            mentioned = symbol_index.find("\n".join([title or ''] + themes))
+            for key in sorted(mentioned):
+                stock = watchlist_by_key.get(key)
+                if stock:
+                    data = get_stock_data(stock['ticker'], stock['market'])
+                    if data:
+                        data['name'] = stock['name']
+                        related_stocks_data.append(data)
         
-        # Simple string matching with Watchlist (Naive approach)
-        for stock in WATCHLIST:
-            # Check if stock name is in title or themes
-            if stock['name'] in title or any(stock['name'] in t for t in themes):
-                data = get_stock_data(stock['ticker'], stock['market'])
-                if data:
-                    data['name'] = stock['name']
-                    related_stocks_data.append(data)
+            # Indicators for all related stocks as one panel (prices are already loaded this cycle)
+            if related_stocks_data:
+                indicators = get_indicators([data['ticker'] for data in related_stocks_data])
+                for data in related_stocks_data:
+                    data['indicators'] = indicators.get(data['ticker'])
+                    data['watchlist_rank'] = watchlist_ranks.get(data['ticker'])
         
-        # Construct Alert Data
-        alert_data = {
-            "news": news_item,
-            "analysis": analysis,
-            "related_stocks": related_stocks_data
-        }
+            # Construct Alert Data
+            alert_data = {
+                "news": news_item,
+                "analysis": analysis,
+                "related_stocks": related_stocks_data
+            }
         
-        # Send Alert (Async wrapper)
-        asyncio.run(send_alert(alert_data))
+            # Queue Alert (delivered by the background dispatcher)
+            enqueue_alert(alert_data)
         
-        # Mark as seen
-        news_cache[link] = time.time()
+            # Mark as seen
+            seen_store.add(link)
+
+# Latest watchlist ranking by risk-adjusted momentum: ticker -> (rank, number of ranked tickers)
+watchlist_ranks = {}
+
+def rank_watchlist():
+    global watchlist_ranks
+    with price_loader_scope():
+        indicators = get_indicators([stock['ticker'] for stock in WATCHLIST])
+    ranking = rank_tickers(indicators)
+    watchlist_ranks = {ticker: (position, len(ranking)) for position, (ticker, _) in enumerate(ranking, 1)}
+    if ranking:
+        logger.info(f"Watchlist leaders: {', '.join(ticker for ticker, _ in ranking[:5])}")
+
+def refresh_watchlist_fundamentals():
+    # Bulk-fetch PER/PBR once per trading day so job() only reads the cache
+    refresh_fundamentals([stock['ticker'] for stock in WATCHLIST if stock['market'] == MARKET_KRX])
 
 def main():
     logger.info("Bot started. Scheduling jobs...")
+    get_dispatcher() # start the Telegram worker before the first job
+    refresh_watchlist_fundamentals()
+    rank_watchlist()
     
     # Run once immediately for testing/demo
     job()
     
+    schedule.every(SCHEDULE_INTERVAL_MINUTES).minutes.do(rank_watchlist)
     schedule.every(SCHEDULE_INTERVAL_MINUTES).minutes.do(job)
+    # Cheap when today's figures are cached; picks up the new trading day
+    schedule.every(1).hours.do(refresh_watchlist_fundamentals)
     
     while True:
         schedule.run_pending()
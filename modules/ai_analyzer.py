@@ -1,20 +1,23 @@
-import requests
 import json
 import os
-from config import GEMINI_API_KEY
+from config import GEMINI_API_KEY, GEMINI_BASE_URL
 from modules.news_fetcher import search_past_reaction
+from modules.llm_cache import get_llm_cache
+from modules.reaction_index import reused_reaction, remember_reaction
+from utils import http_client
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 # Use REST API directly to avoid Python 3.8 SDK compatibility issues
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+GEMINI_MODEL = "gemini-2.0-flash"
+GEMINI_API_URL = f"{GEMINI_BASE_URL}/v1beta/models/{GEMINI_MODEL}:generateContent"
 
-def _call_gemini_api(prompt):
-    if not GEMINI_API_KEY:
-        logger.error("GEMINI_API_KEY is missing.")
-        return None
-        
+LOW_IMPORTANCE = "N/A (Low Importance)"
+NO_HISTORY = "No historical context found."
+HISTORY_FAILED = "Failed to summarize history."
+
+def _gemini_request(prompt):
     headers = {
         "Content-Type": "application/json"
     }
@@ -26,20 +29,65 @@ def _call_gemini_api(prompt):
             "parts": [{"text": prompt}]
         }]
     }
+    return {"headers": headers, "params": params, "json": payload}
+
+def _gemini_content(prompt, result, cache):
+    # Parse Response
+    # Structure: candidates[0].content.parts[0].text
+    if "candidates" in result and result["candidates"]:
+        content = result["candidates"][0]["content"]["parts"][0]["text"]
+        if cache and content:
+            cache.set(GEMINI_MODEL, prompt, content)
+        return content
+    else:
+        logger.warning(f"Empty or unexpected response from Gemini: {result}")
+        return None
+
+def _cached_gemini(prompt):
+    # Byte-identical prompts are answered from the local cache
+    cache = get_llm_cache()
+    if cache:
+        return cache, cache.get(GEMINI_MODEL, prompt)
+    return None, None
+
+def _call_gemini_api(prompt):
+    if not GEMINI_API_KEY:
+        logger.error("GEMINI_API_KEY is missing.")
+        return None
+        
+    cache, cached = _cached_gemini(prompt)
+    if cached is not None:
+        return cached
     
+    response = None
     try:
-        response = requests.post(GEMINI_API_URL, headers=headers, params=params, json=payload)
+        response = http_client.post('gemini', GEMINI_API_URL, **_gemini_request(prompt))
         response.raise_for_status()
-        result = response.json()
+        return _gemini_content(prompt, response.json(), cache)
+            
+    except Exception as e:
+        logger.error(f"Error calling Gemini API: {e}")
+        if response is not None:
+             logger.error(f"Response: {response.text}")
+        return None
+
+async def call_gemini_api_async(prompt, client=None):
+    """
+    Async version of _call_gemini_api (same cache, retries and timeouts).
+    """
+    if not GEMINI_API_KEY:
+        logger.error("GEMINI_API_KEY is missing.")
+        return None
         
-        # Parse Response
-        # Structure: candidates[0].content.parts[0].text
-        if "candidates" in result and result["candidates"]:
-            content = result["candidates"][0]["content"]["parts"][0]["text"]
-            return content
-        else:
-            logger.warning(f"Empty or unexpected response from Gemini: {result}")
-            return None
+    cache, cached = _cached_gemini(prompt)
+    if cached is not None:
+        return cached
+    
+    response = None
+    try:
+        response = await http_client.async_post('gemini', GEMINI_API_URL, client=client, **_gemini_request(prompt))
+        response.raise_for_status()
+        return _gemini_content(prompt, response.json(), cache)
             
     except Exception as e:
         logger.error(f"Error calling Gemini API: {e}")
@@ -47,6 +95,51 @@ def _call_gemini_api(prompt):
              logger.error(f"Response: {response.text}")
         return None
 
+def _parse_json(raw_text):
+    # Gemini tends to wrap JSON in markdown code fences
+    cleaned_text = raw_text.replace('`json', '').replace('`', '').strip()
+    return json.loads(cleaned_text)
+
+def history_prompt(title, past_results):
+    past_context = "\n".join([f"- {r.get('title')}: {r.get('snippet')}" for r in past_results])
+    
+    return f"""
+    Based on the current news: "{title}"
+    And these search results about similar past events:
+    {past_context}
+    
+    Briefly summarize how the market reacted to such events in the past.
+    """
+
+def _summarize_history(title, search_query):
+    """
+    Searches for similar past events and asks Gemini how the market reacted.
+    """
+    past_results = []
+    if search_query:
+        reused = reused_reaction(search_query)
+        if reused:
+            return reused
+        past_results = search_past_reaction(search_query)
+        
+    if not past_results:
+        return NO_HISTORY
+    
+    historical_reaction = _call_gemini_api(history_prompt(title, past_results))
+    if not historical_reaction:
+        return HISTORY_FAILED
+    remember_reaction(search_query, historical_reaction)
+    return historical_reaction
+
+def build_result(analysis, news_item, historical_reaction):
+    return {
+        "importance": analysis.get('importance'),
+        "reason": analysis.get('reason'),
+        "themes": analysis.get('themes'),
+        "historical_reaction": historical_reaction,
+        "original_news": news_item
+    }
+
 def analyze_news(news_item):
     """
     Analyzes news for importance, themes, and historical context.
@@ -80,50 +173,70 @@ def analyze_news(news_item):
             return None
             
         # Clean JSON
-        cleaned_text = raw_text_1.replace('`json', '').replace('`', '').strip()
-        analysis = json.loads(cleaned_text)
+        analysis = _parse_json(raw_text_1)
         
         if analysis.get('importance') == 'Low':
             return {
                 "importance": "Low",
                 "reason": analysis.get('reason'),
                 "themes": analysis.get('themes'),
-                "historical_reaction": "N/A (Low Importance)",
+                "historical_reaction": LOW_IMPORTANCE,
                 "original_news": news_item
             }
             
-        # Step 2: Historical Context Search
-        search_query = analysis.get('search_query')
-        past_results = []
-        if search_query:
-            past_results = search_past_reaction(search_query)
-            
-        # Step 3: Synthesis
-        if past_results:
-            past_context = "\n".join([f"- {r.get('title')}: {r.get('snippet')}" for r in past_results])
-            
-            prompt_2 = f"""
-            Based on the current news: "{title}"
-            And these search results about similar past events:
-            {past_context}
+        # Step 2 & 3: Historical Context Search and Synthesis
+        historical_reaction = _summarize_history(title, analysis.get('search_query'))
             
-            Briefly summarize how the market reacted to such events in the past.
-            """
-            
-            historical_reaction = _call_gemini_api(prompt_2)
-            if not historical_reaction:
-                historical_reaction = "Failed to summarize history."
-        else:
-            historical_reaction = "No historical context found."
-            
-        return {
-            "importance": analysis.get('importance'),
-            "reason": analysis.get('reason'),
-            "themes": analysis.get('themes'),
-            "historical_reaction": historical_reaction,
-            "original_news": news_item
-        }
+        return build_result(analysis, news_item, historical_reaction)
 
     except Exception as e:
         logger.error(f"Error analyzing news: {e}")
         return None
+
+def triage_prompt(news_items):
+    articles = "\n".join([
+        f"[{i}] Title: {item.get('title', '')}\n    Snippet: {item.get('snippet', '')}"
+        for i, item in enumerate(news_items)
+    ])
+    
+    return f"""
+    Analyze each of the following stock market news articles:
+    {articles}
+
+    Tasks for EACH article:
+    1. Determine Importance (High, Mid, Low) for Korean/US markets.
+    2. Extract 2-3 key Theme Stocks or Sectors.
+    3. Formulate a search query to find similar PAST events and their market reaction (e.g., "Apple iPhone launch stock price history").
+    
+    Output a JSON array ONLY, one object per article, using the article number as "index":
+    [
+        {{
+            "index": 0,
+            "importance": "High/Mid/Low",
+            "reason": "Brief reason...",
+            "themes": ["Theme1", "Theme2"],
+            "search_query": "Query string..."
+        }}
+    ]
+    """
+
+def parse_triage(raw_text, count):
+    """
+    Parses a batch triage response into a dict of article index -> analysis
+    dict (missing on failure).
+    """
+    if not raw_text:
+        return {}
+        
+    try:
+        analyses = _parse_json(raw_text)
+    except Exception as e:
+        logger.error(f"Error parsing batch analysis: {e}")
+        return {}
+        
+    results = {}
+    for analysis in analyses if isinstance(analyses, list) else []:
+        index = analysis.get('index') if isinstance(analysis, dict) else None
+        if isinstance(index, int) and 0 <= index < count:
+            results[index] = analysis
+    return results
@@ -0,0 +1,128 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from config import (
+    ANALYSIS_BATCH_SIZE, ANALYSIS_TRIAGE_CONCURRENCY, ANALYSIS_HISTORY_CONCURRENCY,
+    ANALYSIS_SYNTHESIS_CONCURRENCY, ANALYSIS_QUEUE_SIZE
+)
+from modules.ai_analyzer import (
+    call_gemini_api_async, triage_prompt, parse_triage, history_prompt, build_result,
+    LOW_IMPORTANCE, NO_HISTORY, HISTORY_FAILED
+)
+from modules.news_fetcher import search_past_reaction_async
+from modules.reaction_index import reused_reaction, remember_reaction
+from utils import http_client
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+Article = Tuple[int, Dict[str, Any]]
+
+async def analyze_news_pipeline(
+    news_items: List[Dict[str, Any]],
+    batch_size: int = ANALYSIS_BATCH_SIZE,
+    triage_concurrency: int = ANALYSIS_TRIAGE_CONCURRENCY,
+    history_concurrency: int = ANALYSIS_HISTORY_CONCURRENCY,
+    synthesis_concurrency: int = ANALYSIS_SYNTHESIS_CONCURRENCY,
+    queue_size: int = ANALYSIS_QUEUE_SIZE
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Analyzes several articles like analyze_news, as a pipeline.
+
+    Triage (one Gemini call per batch of `batch_size` articles), the
+    Serper history search and the Gemini synthesis run as three stages
+    with their own worker counts, connected by queues of at most
+    `queue_size` entries. An article moves on as soon as its stage is
+    done, so while one article is in synthesis, others are already being
+    searched or triaged; a cycle takes about as long as the slowest chain
+    rather than the sum of all of them.
+
+    Returns:
+        A list aligned with `news_items` (same results as
+        analyze_news); entries are None on failure.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(news_items)
+    if not news_items:
+        return results
+
+    triage_queue: "asyncio.Queue[Tuple[List[Article]]]" = asyncio.Queue(queue_size)
+    history_queue: "asyncio.Queue[Tuple[int, Dict[str, Any], Dict[str, Any]]]" = asyncio.Queue(queue_size)
+    synthesis_queue: "asyncio.Queue[Tuple[int, Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]]" = asyncio.Queue(queue_size)
+
+    async def triage(batch: List[Article]) -> None:
+        items = [item for _, item in batch]
+        analyses = parse_triage(await call_gemini_api_async(triage_prompt(items)), len(items))
+        for position, (index, news_item) in enumerate(batch):
+            analysis = analyses.get(position)
+            if analysis is None and len(batch) > 1:
+                logger.warning(f"Batch analysis missed '{news_item.get('title')}', analyzing individually")
+                analysis = parse_triage(await call_gemini_api_async(triage_prompt([news_item])), 1).get(0)
+            if analysis is None:
+                continue
+            if analysis.get('importance') == 'Low':
+                results[index] = build_result(analysis, news_item, LOW_IMPORTANCE)
+            else:
+                await history_queue.put((index, news_item, analysis))
+
+    async def history(index: int, news_item: Dict[str, Any], analysis: Dict[str, Any]) -> None:
+        search_query = analysis.get('search_query')
+        # Index lookups touch SQLite and may reload the vector matrix, so keep them off the loop
+        reused = await asyncio.to_thread(reused_reaction, search_query) if search_query else None
+        if reused:
+            results[index] = build_result(analysis, news_item, reused)
+            return
+        past_results = await search_past_reaction_async(None, search_query) if search_query else []
+        if past_results:
+            await synthesis_queue.put((index, news_item, analysis, past_results))
+        else:
+            results[index] = build_result(analysis, news_item, NO_HISTORY)
+
+    async def synthesis(index: int, news_item: Dict[str, Any], analysis: Dict[str, Any], past_results: List[Dict[str, Any]]) -> None:
+        historical_reaction = await call_gemini_api_async(history_prompt(news_item.get('title', ''), past_results))
+        if historical_reaction:
+            await asyncio.to_thread(remember_reaction, analysis['search_query'], historical_reaction)
+        results[index] = build_result(analysis, news_item, historical_reaction or HISTORY_FAILED)
+
+    async def worker(queue: asyncio.Queue, handle) -> None:
+        while True:
+            job = await queue.get()
+            try:
+                await handle(*job)
+            except Exception as e:
+                logger.error(f"Error analyzing news: {e}")
+            finally:
+                queue.task_done()
+
+    started = time.perf_counter()
+    workers = (
+        [asyncio.ensure_future(worker(triage_queue, triage)) for _ in range(triage_concurrency)]
+        + [asyncio.ensure_future(worker(history_queue, history)) for _ in range(history_concurrency)]
+        + [asyncio.ensure_future(worker(synthesis_queue, synthesis)) for _ in range(synthesis_concurrency)]
+    )
+    try:
+        articles = list(enumerate(news_items))
+        for start in range(0, len(articles), batch_size):
+            await triage_queue.put((articles[start:start + batch_size],))
+        # Each stage queues its output before marking its input done, so joining in order drains the pipeline
+        await triage_queue.join()
+        await history_queue.join()
+        await synthesis_queue.join()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    logger.info(f"Analyzed {len(news_items)} news items in {time.perf_counter() - started:.2f}s")
+    return results
+
+def run_analysis_pipeline(news_items: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Runs analyze_news_pipeline on a fresh event loop (for the scheduler).
+    """
+    async def run() -> List[Optional[Dict[str, Any]]]:
+        try:
+            return await analyze_news_pipeline(news_items)
+        finally:
+            await http_client.close_async_client()
+
+    return asyncio.run(run())
@@ -0,0 +1,178 @@
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, Optional
+from config import NAVER_FINANCE_BASE_URL, FUNDAMENTALS_CACHE_PATH, FUNDAMENTALS_MAX_WORKERS
+from utils import http_client
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+KST = timezone(timedelta(hours=9))
+KRX_OPEN_HOUR = 9
+
+# <em id="_per">12.34</em> on the Naver item page; matched on raw bytes to skip decoding and parsing
+_FIELD_PATTERN = re.compile(rb'id=["\']_(per|pbr)["\'][^>]*>\s*([^<]*?)\s*<')
+
+def current_trading_day(now: Optional[datetime] = None) -> str:
+    """
+    Returns the KRX session (YYYY-MM-DD) whose figures Naver shows now:
+    before the open and on weekends that is the previous weekday.
+    """
+    now = (now or datetime.now(KST)).astimezone(KST)
+    day = now.date()
+    if now.hour < KRX_OPEN_HOUR:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day.isoformat()
+
+def extract_fundamentals(html: bytes) -> Dict[str, str]:
+    """
+    Pulls PER and PBR out of a Naver Finance item page.
+    """
+    data = {}
+    for field, value in _FIELD_PATTERN.findall(html):
+        key = field.decode('ascii')
+        if key not in data and value.strip():
+            data[key] = value.decode('utf-8', 'replace').strip()
+    return data
+
+def _scrape_naver_finance(ticker: str) -> Dict[str, str]:
+    url = f"{NAVER_FINANCE_BASE_URL}/item/main.nhn?code={ticker}"
+    res = http_client.get('naver', url)
+    res.raise_for_status()
+    return extract_fundamentals(res.content)
+
+class FundamentalsStore:
+    """
+    PER/PBR per KRX ticker, cached for the current trading day.
+
+    Figures live in memory and in SQLite (so restarts and other processes
+    reuse them); rows from earlier trading days are dropped as new ones are
+    written.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._memory: Dict[str, Dict[str, str]] = {}
+        self._memory_day: Optional[str] = None
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS fundamentals ("
+                " ticker TEXT NOT NULL,"
+                " trading_day TEXT NOT NULL,"
+                " per TEXT,"
+                " pbr TEXT,"
+                " PRIMARY KEY (ticker, trading_day))"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _memory_for(self, day: str) -> Dict[str, Dict[str, str]]:
+        with self._lock:
+            if self._memory_day != day:
+                self._memory = {}
+                self._memory_day = day
+            return self._memory
+
+    def get_cached(self, ticker: str, day: Optional[str] = None) -> Optional[Dict[str, str]]:
+        day = day or current_trading_day()
+        memory = self._memory_for(day)
+        if ticker in memory:
+            return memory[ticker]
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT per, pbr FROM fundamentals WHERE ticker = ? AND trading_day = ?", (ticker, day)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Fundamentals cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        data = {key: value for key, value in zip(('per', 'pbr'), row) if value is not None}
+        memory[ticker] = data
+        return data
+
+    def set(self, ticker: str, data: Dict[str, str], day: Optional[str] = None) -> None:
+        day = day or current_trading_day()
+        self._memory_for(day)[ticker] = data
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO fundamentals (ticker, trading_day, per, pbr) VALUES (?, ?, ?, ?)",
+                    (ticker, day, data.get('per'), data.get('pbr'))
+                )
+                conn.execute("DELETE FROM fundamentals WHERE trading_day < ?", (day,))
+        except sqlite3.Error as e:
+            logger.warning(f"Fundamentals cache write failed: {e}")
+
+    def get(self, ticker: str) -> Dict[str, str]:
+        """
+        Returns {'per': ..., 'pbr': ...} for a KRX ticker, scraping Naver
+        Finance only on the first request of the trading day. Keys are
+        missing when Naver has no figure; failures are not cached.
+        """
+        day = current_trading_day()
+        cached = self.get_cached(ticker, day)
+        if cached is not None:
+            return cached
+        try:
+            data = _scrape_naver_finance(ticker)
+        except Exception as e:
+            logger.warning(f"Error scraping Naver Finance for {ticker}: {e}")
+            return {}
+        self.set(ticker, data, day)
+        return data
+
+    def refresh(self, tickers: Iterable[str], max_workers: int = FUNDAMENTALS_MAX_WORKERS) -> Dict[str, Dict[str, str]]:
+        """
+        Fetches every ticker not yet cached for today in parallel.
+
+        Returns:
+            The fundamentals of all given tickers.
+        """
+        day = current_trading_day()
+        tickers = list(dict.fromkeys(tickers))
+        missing = [ticker for ticker in tickers if self.get_cached(ticker, day) is None]
+        if missing:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                list(pool.map(self.get, missing))
+            logger.info(f"Refreshed fundamentals for {len(missing)} of {len(tickers)} tickers")
+        return {ticker: self.get_cached(ticker, day) or {} for ticker in tickers}
+
+_default_store: Optional[FundamentalsStore] = None
+_default_store_lock = threading.Lock()
+
+def get_fundamentals_store() -> FundamentalsStore:
+    """
+    Returns the process-wide fundamentals store.
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = FundamentalsStore(FUNDAMENTALS_CACHE_PATH)
+        return _default_store
+
+def get_fundamentals(ticker: str) -> Dict[str, str]:
+    return get_fundamentals_store().get(ticker)
+
+def refresh_fundamentals(tickers: Iterable[str]) -> Dict[str, Dict[str, str]]:
+    return get_fundamentals_store().refresh(tickers)
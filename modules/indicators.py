@@ -0,0 +1,185 @@
+import contextvars
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+from config import INDICATOR_PANEL_LENGTH, INDICATOR_LOAD_WORKERS
+from modules.price_loader import load_price_history
+from utils.lazy_import import lazy_import
+from utils.logger import setup_logger
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+logger = setup_logger(__name__)
+
+TRADING_DAYS_PER_YEAR = 252
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+VOLATILITY_WINDOW = 20
+RETURN_WINDOW = 20
+SMA_WINDOWS = (20, 50, 200)
+
+class IndicatorPanel:
+    """
+    Aligned 2-D arrays (tickers x bars) of daily closes, highs, lows and
+    volumes.
+
+    Rows are right-aligned on each ticker's latest bar, so column -1 is
+    every ticker's most recent session; tickers with shorter histories
+    are padded with NaN on the left.
+    """
+
+    def __init__(self, tickers: List[Hashable], close: "np.ndarray", high: "np.ndarray", low: "np.ndarray", volume: "np.ndarray"):
+        self.tickers = tickers
+        self.close = close
+        self.high = high
+        self.low = low
+        self.volume = volume
+
+def build_panel(frames: "Dict[Hashable, pd.DataFrame]", length: int = INDICATOR_PANEL_LENGTH) -> IndicatorPanel:
+    """
+    Stacks the last `length` bars of each OHLCV frame into an IndicatorPanel.
+    Empty frames are skipped.
+    """
+    frames = {ticker: df for ticker, df in frames.items() if df is not None and not df.empty}
+    shape = (len(frames), length)
+    close, high, low, volume = (np.full(shape, np.nan) for _ in range(4))
+
+    for row, df in enumerate(frames.values()):
+        # One array conversion per frame; per-column pandas access costs far more than the maths
+        count = min(len(df), length)
+        cols = slice(length - count, length)
+        names = df.columns.tolist()
+        data = df.to_numpy(dtype=float)[-count:]
+        close[row, cols] = data[:, names.index('Close')]
+        high[row, cols] = data[:, names.index('High')] if 'High' in names else close[row, cols]
+        low[row, cols] = data[:, names.index('Low')] if 'Low' in names else close[row, cols]
+        if 'Volume' in names:
+            volume[row, cols] = data[:, names.index('Volume')]
+
+    return IndicatorPanel(list(frames), close, high, low, volume)
+
+def _wilder(values: "np.ndarray", period: int) -> "np.ndarray":
+    """
+    Latest Wilder moving average of each row, seeded with the row's first
+    value. Rows may only have NaN padding on the left; the result is NaN
+    where a row has fewer than `period` values.
+
+    The recursion avg = avg + (x - avg) / period unrolls to fixed weights,
+    so the whole panel reduces to one matrix-vector product.
+    """
+    alpha = 1.0 / period
+    rows, length = values.shape
+    valid = ~np.isnan(values)
+    decay = (1 - alpha) ** np.arange(length - 1, -1, -1)
+    filled = np.where(valid, values, 0.0)
+    avg = filled @ (alpha * decay)
+    # The seed enters with weight decay[first] rather than alpha * decay[first]
+    first = valid.argmax(axis=1)
+    avg += (1 - alpha) * decay[first] * filled[np.arange(rows), first]
+    avg[valid.sum(axis=1) < period] = np.nan
+    return avg
+
+def _window(values: "np.ndarray", size: int) -> "np.ndarray":
+    return values[:, -size:] if values.shape[1] >= size else np.full((values.shape[0], size), np.nan)
+
+def compute_indicators(panel: IndicatorPanel) -> Dict[Hashable, Dict[str, Optional[float]]]:
+    """
+    Computes the latest indicator values for every ticker of a panel.
+
+    Every indicator is a handful of array operations over the whole panel,
+    so the cost barely depends on the number of tickers.
+
+    Returns:
+        {ticker: {...}} with price, sma_20/50/200, rsi_14, atr_14, atr_pct,
+        volatility_20 (annualised), high_52w, low_52w, range_position_52w,
+        return_20, volume_ratio and momentum_score (return_20 divided by
+        volatility_20). Values are None where the history is too short.
+    """
+    if not panel.tickers:
+        return {}
+
+    close, high, low, volume = panel.close, panel.high, panel.low, panel.volume
+    last = close[:, -1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values: Dict[str, np.ndarray] = {"price": last}
+        for window in SMA_WINDOWS:
+            values[f"sma_{window}"] = _window(close, window).mean(axis=1)
+
+        diff = np.diff(close, axis=1)
+        avg_gain = _wilder(np.where(np.isnan(diff), np.nan, np.clip(diff, 0, None)), RSI_PERIOD)
+        avg_loss = _wilder(np.where(np.isnan(diff), np.nan, np.clip(-diff, 0, None)), RSI_PERIOD)
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+        values[f"rsi_{RSI_PERIOD}"] = np.where(avg_loss == 0, np.where(avg_gain > 0, 100.0, 50.0), rsi)
+
+        prev_close = close[:, :-1]
+        true_range = np.fmax(high[:, 1:] - low[:, 1:],
+                             np.fmax(np.abs(high[:, 1:] - prev_close), np.abs(low[:, 1:] - prev_close)))
+        true_range[np.isnan(prev_close)] = np.nan
+        atr = _wilder(true_range, ATR_PERIOD)
+        values[f"atr_{ATR_PERIOD}"] = atr
+        values["atr_pct"] = atr / last
+
+        log_returns = _window(np.log(close[:, 1:] / close[:, :-1]), VOLATILITY_WINDOW)
+        volatility = log_returns.std(axis=1, ddof=1) * math.sqrt(TRADING_DAYS_PER_YEAR)
+        values[f"volatility_{VOLATILITY_WINDOW}"] = volatility
+
+        year_high = np.max(np.where(np.isnan(high[:, -TRADING_DAYS_PER_YEAR:]), -np.inf, high[:, -TRADING_DAYS_PER_YEAR:]), axis=1)
+        year_low = np.min(np.where(np.isnan(low[:, -TRADING_DAYS_PER_YEAR:]), np.inf, low[:, -TRADING_DAYS_PER_YEAR:]), axis=1)
+        year_high[np.isinf(year_high)] = np.nan
+        year_low[np.isinf(year_low)] = np.nan
+        values["high_52w"] = year_high
+        values["low_52w"] = year_low
+        values["range_position_52w"] = (last - year_low) / (year_high - year_low)
+
+        base = _window(close, RETURN_WINDOW + 1)[:, 0]
+        values[f"return_{RETURN_WINDOW}"] = last / base - 1
+        values["volume_ratio"] = volume[:, -1] / _window(volume[:, :-1], VOLATILITY_WINDOW).mean(axis=1)
+        values["momentum_score"] = values[f"return_{RETURN_WINDOW}"] / volatility
+
+    names = list(values)
+    matrix = np.column_stack([values[name] for name in names]).round(4)
+    matrix[~np.isfinite(matrix)] = np.nan
+    return {
+        ticker: {name: (None if v != v else v) for name, v in zip(names, row)}
+        for ticker, row in zip(panel.tickers, matrix.tolist())
+    }
+
+def rank_tickers(indicators: Dict[Hashable, Dict[str, Optional[float]]], key: str = "momentum_score") -> List[Tuple[Hashable, float]]:
+    """
+    Returns (ticker, value) pairs sorted by `key`, best first. Tickers
+    without a value are left out.
+    """
+    scored = [(ticker, values[key]) for ticker, values in indicators.items() if values.get(key) is not None]
+    return sorted(scored, key=lambda item: item[1], reverse=True)
+
+def load_frames(tickers: Iterable[str], max_workers: int = INDICATOR_LOAD_WORKERS) -> "Dict[str, pd.DataFrame]":
+    """
+    Loads price history for many tickers in parallel (through the current
+    PriceLoader, if any). Tickers that fail to load are skipped.
+    """
+    tickers = list(dict.fromkeys(tickers))
+
+    def load(ticker: str) -> "Optional[pd.DataFrame]":
+        try:
+            return load_price_history(ticker)
+        except Exception as e:
+            logger.warning(f"Error loading prices for {ticker}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Copy the context here, in the caller's thread, so workers see its PriceLoader
+        futures = [pool.submit(contextvars.copy_context().run, load, ticker) for ticker in tickers]
+        frames = [future.result() for future in futures]
+    return {ticker: df for ticker, df in zip(tickers, frames) if df is not None}
+
+def get_indicators(tickers: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Loads prices and computes indicators for the given tickers as one panel.
+    """
+    try:
+        return compute_indicators(build_panel(load_frames(tickers)))
+    except Exception as e:
+        logger.error(f"Error computing indicators: {e}")
+        return {}
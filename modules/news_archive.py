@@ -0,0 +1,238 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from config import NEWS_ARCHIVE_PATH, NEWS_ARCHIVE_FRESH_SECONDS, NEWS_ARCHIVE_WINDOW_HOURS
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+WORD = re.compile(r"\w+")
+# Serper reports article age as "3 hours ago", "2일 전", ...
+RELATIVE_AGE = re.compile(r"(\d+)\s*(min|minute|hour|day|week|분|시간|일|주)", re.IGNORECASE)
+AGE_UNIT_HOURS = {
+    "min": 1 / 60, "minute": 1 / 60, "분": 1 / 60,
+    "hour": 1, "시간": 1,
+    "day": 24, "일": 24,
+    "week": 24 * 7, "주": 24 * 7,
+}
+# News is fetched for the last 24 hours, so an unparseable date counts as a day old
+DEFAULT_AGE_HOURS = 24.0
+
+def age_hours(date: Optional[str]) -> float:
+    match = RELATIVE_AGE.search(date or "")
+    if not match:
+        return DEFAULT_AGE_HOURS
+    return int(match.group(1)) * AGE_UNIT_HOURS[match.group(2).lower()]
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+def match_expression(text: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression requiring every word of `text` as a prefix, so
+    "삼성전자" also finds "삼성전자가". Quoting each word keeps FTS5 syntax
+    out of user input.
+    """
+    words = WORD.findall(text)
+    return " ".join(f'"{word}"*' for word in words) if words else None
+
+def relative_date(published_at: float, now: float) -> str:
+    minutes = max(0, int((now - published_at) / 60))
+    if minutes < 60:
+        return f"{minutes} minutes ago"
+    if minutes < 48 * 60:
+        return f"{minutes // 60} hours ago"
+    return f"{minutes // (24 * 60)} days ago"
+
+class NewsArchive:
+    """
+    SQLite archive of every article fetched from Serper, keyed by link,
+    with an FTS5 index over title and snippet.
+
+    Serper reports dates relative to the fetch ("3 hours ago"), so the
+    publication time is estimated when an article is stored and the
+    relative date is recomputed when it is read back. Each searched query
+    is recorded with its fetch time so that a repeated keyword can be
+    answered from the archive for `fresh_seconds`.
+    """
+
+    def __init__(self, path: str, fresh_seconds: int = NEWS_ARCHIVE_FRESH_SECONDS, window_hours: float = NEWS_ARCHIVE_WINDOW_HOURS):
+        self.path = path
+        self.fresh_seconds = fresh_seconds
+        self.window_hours = window_hours
+        self._hits = 0
+        self._misses = 0
+        self._stats_lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS news_articles ("
+                " id INTEGER PRIMARY KEY,"
+                " link TEXT NOT NULL UNIQUE,"
+                " title TEXT NOT NULL,"
+                " snippet TEXT NOT NULL,"
+                " source TEXT,"
+                " date TEXT,"
+                " published_at REAL,"
+                " fetched_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_news_articles_fetched_at ON news_articles (fetched_at)")
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5("
+                " title, snippet, content='news_articles', content_rowid='id')"
+            )
+            # Keep the external-content FTS index in step with news_articles
+            conn.executescript(
+                "CREATE TRIGGER IF NOT EXISTS news_articles_ai AFTER INSERT ON news_articles BEGIN"
+                "  INSERT INTO news_fts (rowid, title, snippet) VALUES (new.id, new.title, new.snippet);"
+                " END;"
+                "CREATE TRIGGER IF NOT EXISTS news_articles_ad AFTER DELETE ON news_articles BEGIN"
+                "  INSERT INTO news_fts (news_fts, rowid, title, snippet) VALUES ('delete', old.id, old.title, old.snippet);"
+                " END;"
+                "CREATE TRIGGER IF NOT EXISTS news_articles_au AFTER UPDATE ON news_articles BEGIN"
+                "  INSERT INTO news_fts (news_fts, rowid, title, snippet) VALUES ('delete', old.id, old.title, old.snippet);"
+                "  INSERT INTO news_fts (rowid, title, snippet) VALUES (new.id, new.title, new.snippet);"
+                " END;"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS news_queries ("
+                " query TEXT PRIMARY KEY,"
+                " fetched_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def store(self, query: str, news_items: List[Dict[str, Any]]) -> None:
+        """
+        Archives the articles Serper returned for `query` (existing links
+        are refreshed) and records the query as fetched now.
+        """
+        now = time.time()
+        rows = []
+        for item in news_items:
+            link = item.get('link')
+            if not link:
+                continue
+            date = item.get('date')
+            published_at = now - age_hours(date) * 3600 if RELATIVE_AGE.search(date or "") else None
+            rows.append((link, item.get('title') or '', item.get('snippet') or '', item.get('source'), date, published_at, now))
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT INTO news_articles (link, title, snippet, source, date, published_at, fetched_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (link) DO UPDATE SET title = excluded.title, snippet = excluded.snippet,"
+                    " source = excluded.source, fetched_at = excluded.fetched_at,"
+                    " published_at = COALESCE(news_articles.published_at, excluded.published_at)",
+                    rows
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO news_queries (query, fetched_at) VALUES (?, ?)", (normalize_query(query), now)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"News archive write failed: {e}")
+
+    def search(self, text: str, limit: int = 20, max_age_hours: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Full-text search over archived titles and snippets, best match first.
+
+        Args:
+            text: Words to search for (all must match, as prefixes).
+            limit: Maximum number of articles.
+            max_age_hours: Only articles published (or, if unknown, fetched) this recently.
+
+        Returns:
+            List of news items (title, snippet, link, date, source).
+        """
+        expression = match_expression(text)
+        if not expression:
+            return []
+        now = time.time()
+        cutoff = now - max_age_hours * 3600 if max_age_hours is not None else 0.0
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT a.title, a.snippet, a.link, a.date, a.source, a.published_at"
+                " FROM news_fts JOIN news_articles a ON a.id = news_fts.rowid"
+                " WHERE news_fts MATCH ? AND COALESCE(a.published_at, a.fetched_at) >= ?"
+                " ORDER BY bm25(news_fts, 2.0, 1.0) LIMIT ?",
+                (expression, cutoff, limit)
+            ).fetchall()
+        return [
+            {
+                "title": title,
+                "snippet": snippet,
+                "link": link,
+                "date": relative_date(published_at, now) if published_at is not None else date,
+                "source": source,
+            }
+            for title, snippet, link, date, source, published_at in rows
+        ]
+
+    def recent(self, query: str, n: int = 5) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answers a keyword Serper was asked about within `fresh_seconds`
+        from the archive.
+
+        Returns:
+            Up to `n` matching articles from the last `window_hours`, or
+            None if the keyword is not fresh or nothing matches (fetch it
+            from Serper instead).
+        """
+        items = None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT fetched_at FROM news_queries WHERE query = ?", (normalize_query(query),)
+                ).fetchone()
+            if row and time.time() - row[0] < self.fresh_seconds:
+                items = self.search(query, limit=n, max_age_hours=self.window_hours) or None
+        except sqlite3.Error as e:
+            logger.warning(f"News archive read failed: {e}")
+
+        with self._stats_lock:
+            if items is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return items
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        entries = None
+        try:
+            with self._connect() as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM news_articles").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.warning(f"News archive stats failed: {e}")
+        with self._stats_lock:
+            return {"hits": self._hits, "misses": self._misses, "entries": entries}
+
+_default_archive: Optional[NewsArchive] = None
+_default_archive_lock = threading.Lock()
+
+def get_news_archive() -> Optional[NewsArchive]:
+    """
+    Returns the process-wide news archive, or None if it cannot be opened.
+    """
+    global _default_archive
+    with _default_archive_lock:
+        if _default_archive is None:
+            try:
+                _default_archive = NewsArchive(NEWS_ARCHIVE_PATH)
+            except Exception as e:
+                logger.error(f"Error opening news archive at {NEWS_ARCHIVE_PATH}: {e}")
+                return None
+        return _default_archive
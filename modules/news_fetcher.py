@@ -1,12 +1,18 @@
-import requests
 import json
-from config import SERPER_API_KEY
+from config import SERPER_API_KEY, SERPER_BASE_URL
+from modules.news_archive import get_news_archive
+from utils import http_client
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+def _archive(query, news_items):
+    archive = get_news_archive()
+    if archive and news_items:
+        archive.store(query, news_items)
+
 def fetch_news(query, n=5):
-    url = "https://google.serper.dev/news"
+    url = f"{SERPER_BASE_URL}/news"
     payload = json.dumps({
         "q": query,
         "num": n,
@@ -29,9 +35,10 @@ def fetch_news(query, n=5):
     }
     
     try:
-        response = requests.post(url, headers=headers, data=json.dumps(payload_dict))
+        response = http_client.post('serper', url, headers=headers, data=json.dumps(payload_dict))
         response.raise_for_status()
         results = response.json().get("news", [])
+        _archive(query, results)
         return results
     except Exception as e:
         logger.error(f"Error fetching news for {query}: {e}")
@@ -40,7 +47,7 @@ def fetch_news(query, n=5):
 def search_past_reaction(query):
     # Search for historical context
     search_query = f"{query} stock price reaction history"
-    url = "https://google.serper.dev/search"
+    url = f"{SERPER_BASE_URL}/search"
     payload_dict = {
         "q": search_query,
         "num": 3
@@ -51,10 +58,29 @@ def search_past_reaction(query):
     }
     
     try:
-        response = requests.post(url, headers=headers, data=json.dumps(payload_dict))
+        response = http_client.post('serper', url, headers=headers, data=json.dumps(payload_dict))
         response.raise_for_status()
         results = response.json().get("organic", [])
         return results
     except Exception as e:
         logger.error(f"Error searching past reaction for {query}: {e}")
         return []
+
+async def search_past_reaction_async(client, query):
+    # Async version of search_past_reaction (client=None uses the shared pooled client)
+    payload_dict = {
+        "q": f"{query} stock price reaction history",
+        "num": 3
+    }
+    headers = {
+        'X-API-KEY': SERPER_API_KEY or '',
+        'Content-Type': 'application/json'
+    }
+    
+    try:
+        response = await http_client.async_post('serper', f"{SERPER_BASE_URL}/search", client=client, headers=headers, json=payload_dict)
+        response.raise_for_status()
+        return response.json().get("organic", [])
+    except Exception as e:
+        logger.error(f"Error searching past reaction for {query}: {e}")
+        return []
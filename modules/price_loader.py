@@ -0,0 +1,94 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+from modules.price_store import DateLike, get_price_history, resolve_start
+from utils.lazy_import import lazy_import
+from utils.logger import setup_logger
+
+pd = lazy_import("pandas")
+
+logger = setup_logger(__name__)
+
+class PriceLoader:
+    """
+    Request-scoped front for the price store.
+
+    Each ticker is loaded once, from the earliest start any caller asked
+    for (or declared up front with `want`), and every caller gets its own
+    slice of that frame. Concurrent loads of the same ticker wait for the
+    first one instead of reading the store again.
+    """
+
+    def __init__(self):
+        self.fetches = 0
+        self._wanted: Dict[str, pd.Timestamp] = {}
+        self._frames: Dict[str, Tuple[pd.Timestamp, pd.DataFrame]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _ticker_lock(self, ticker: str) -> threading.Lock:
+        with self._guard:
+            if ticker not in self._locks:
+                self._locks[ticker] = threading.Lock()
+            return self._locks[ticker]
+
+    def want(self, ticker: str, start: DateLike = None) -> None:
+        """
+        Declares that `ticker` will be needed from `start`, so the first
+        load already covers it.
+        """
+        start_ts = resolve_start(start)
+        with self._guard:
+            if ticker not in self._wanted or start_ts < self._wanted[ticker]:
+                self._wanted[ticker] = start_ts
+
+    def load(self, ticker: str, start: DateLike = None, end: DateLike = None) -> "pd.DataFrame":
+        """
+        Same contract as price_store.get_price_history.
+        """
+        start_ts = resolve_start(start)
+        end_ts = pd.Timestamp(end) if end is not None else None
+
+        with self._ticker_lock(ticker):
+            loaded = self._frames.get(ticker)
+            if loaded is None or start_ts < loaded[0]:
+                with self._guard:
+                    fetch_start = min(start_ts, self._wanted.get(ticker, start_ts))
+                df = get_price_history(ticker, fetch_start)
+                self.fetches += 1
+                loaded = (fetch_start, df)
+                self._frames[ticker] = loaded
+
+        return loaded[1].loc[start_ts:end_ts]
+
+_current_loader: ContextVar[Optional[PriceLoader]] = ContextVar('price_loader', default=None)
+
+@contextmanager
+def price_loader_scope() -> Iterator[PriceLoader]:
+    """
+    Makes one PriceLoader current for the enclosed request or job cycle.
+
+    The loader follows the context into tasks created inside the scope;
+    pass `contextvars.copy_context().run` to executors to reach threads.
+    """
+    loader = PriceLoader()
+    token = _current_loader.set(loader)
+    try:
+        yield loader
+    finally:
+        _current_loader.reset(token)
+        logger.debug(f"Price loader served {len(loader._frames)} tickers with {loader.fetches} store reads")
+
+def current_price_loader() -> Optional[PriceLoader]:
+    return _current_loader.get()
+
+def load_price_history(ticker: str, start: DateLike = None, end: DateLike = None) -> "pd.DataFrame":
+    """
+    Returns daily bars through the current PriceLoader, or straight from
+    the price store outside a loader scope.
+    """
+    loader = _current_loader.get()
+    if loader is None:
+        return get_price_history(ticker, start, end)
+    return loader.load(ticker, start, end)
@@ -0,0 +1,106 @@
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Tuple
+from config import MARKET_KRX, MARKET_US, SECURITY_MASTER_DIR, SECURITY_MASTER_REFRESH_SECONDS
+from utils.lazy_import import lazy_import
+from utils.logger import setup_logger
+
+fdr = lazy_import("FinanceDataReader")
+pd = lazy_import("pandas")
+
+logger = setup_logger(__name__)
+
+# FinanceDataReader listings that make up each of our markets
+LISTING_SOURCES = {
+    MARKET_KRX: ["KRX"],
+    MARKET_US: ["NASDAQ", "NYSE", "AMEX"],
+}
+
+# After a failed download, wait this long before trying again
+FAILED_LOAD_RETRY_SECONDS = 60 * 60
+
+_listings: Dict[str, Tuple[float, List[Dict[str, str]]]] = {}
+_listings_lock = threading.Lock()
+
+def _listing_path(market: str) -> str:
+    return os.path.join(SECURITY_MASTER_DIR, f"{market.lower()}.parquet")
+
+def _download_listing(market: str) -> "pd.DataFrame":
+    frames = []
+    for source in LISTING_SOURCES[market]:
+        df = fdr.StockListing(source)
+        # KRX listings use Code, overseas listings use Symbol
+        ticker_col = 'Code' if 'Code' in df.columns else 'Symbol'
+        frame = df[[ticker_col, 'Name']].rename(columns={ticker_col: 'ticker', 'Name': 'name'})
+        frame['exchange'] = source
+        frames.append(frame)
+    listing = pd.concat(frames, ignore_index=True).dropna(subset=['ticker', 'name'])
+    listing['ticker'] = listing['ticker'].astype(str).str.strip()
+    listing['name'] = listing['name'].astype(str).str.strip()
+    listing['market'] = market
+    return listing.drop_duplicates(subset=['ticker']).reset_index(drop=True)
+
+def _load_listing(market: str) -> List[Dict[str, str]]:
+    path = _listing_path(market)
+    is_fresh = os.path.exists(path) and time.time() - os.path.getmtime(path) < SECURITY_MASTER_REFRESH_SECONDS
+
+    if not is_fresh:
+        try:
+            listing = _download_listing(market)
+            os.makedirs(SECURITY_MASTER_DIR, exist_ok=True)
+            listing.to_parquet(path)
+            logger.info(f"Refreshed {market} security master ({len(listing)} listings)")
+            return listing.to_dict('records')
+        except Exception as e:
+            logger.warning(f"Error refreshing {market} security master: {e}")
+
+    if os.path.exists(path):
+        return pd.read_parquet(path).to_dict('records')
+    raise RuntimeError(f"No {market} listing available")
+
+def get_listings(market: str) -> List[Dict[str, str]]:
+    """
+    Returns every listed security of a market as dicts with ticker, name,
+    market and exchange keys.
+
+    Listings come from fdr.StockListing, are cached on disk and in memory,
+    and are refreshed once every SECURITY_MASTER_REFRESH_SECONDS. A stale
+    copy is served if the refresh fails; an empty list if none exists.
+    """
+    now = time.time()
+    with _listings_lock:
+        cached = _listings.get(market)
+        if cached and now < cached[0]:
+            return cached[1]
+
+        try:
+            rows = _load_listing(market)
+            expires_at = now + SECURITY_MASTER_REFRESH_SECONDS
+        except Exception as e:
+            logger.error(f"Error loading {market} security master: {e}")
+            rows = cached[1] if cached else []
+            expires_at = now + FAILED_LOAD_RETRY_SECONDS
+
+        _listings[market] = (expires_at, rows)
+        return rows
+
+# Corporate suffixes of listing names that news and LLMs usually leave out
+NAME_SUFFIX = re.compile(
+    r"[\s,.]+(inc|corp|corporation|co|company|ltd|limited|plc|holdings?|group|"
+    r"class [a-c]|common stock|ordinary shares|adr|sa|nv|ag|se)\.?$",
+    re.IGNORECASE
+)
+
+def strip_name_suffixes(name: str) -> str:
+    """
+    Drops trailing corporate suffixes: "Apple Inc." -> "Apple",
+    "Toyota Motor Corp ADR" -> "Toyota Motor".
+    """
+    name = name.strip()
+    previous = None
+    while previous != name:
+        previous = name
+        name = NAME_SUFFIX.sub("", name).strip()
+    return name
@@ -0,0 +1,122 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from config import SEEN_STORE_PATH, SEEN_TTL_SECONDS, SEEN_BLOOM_CAPACITY, SEEN_BLOOM_ERROR_RATE
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter. Memory use depends only on capacity and
+    error rate, never on how many keys are added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> Iterator[int]:
+        # Kirsch-Mitzenmacher double hashing from one 128-bit digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+class SeenStore:
+    """
+    Persistent set of already-processed news links with TTL eviction.
+
+    Links live in SQLite so they survive restarts. An in-memory Bloom
+    filter answers most "not seen" lookups without touching the database;
+    it is rebuilt from the surviving rows whenever expired links are pruned.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, capacity: int, error_rate: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS seen_news (key TEXT PRIMARY KEY, seen_at REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_news_seen_at ON seen_news (seen_at)")
+        self.prune()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def contains(self, key: Optional[str]) -> bool:
+        # Articles without a link cannot be tracked; they are never "seen"
+        if not key:
+            return False
+        with self._lock:
+            if key not in self._bloom:
+                return False
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM seen_news WHERE key = ? AND seen_at > ?",
+                (key, time.time() - self.ttl_seconds)
+            ).fetchone()
+        return row is not None
+
+    def add(self, key: Optional[str]) -> None:
+        if not key:
+            return
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO seen_news (key, seen_at) VALUES (?, ?)", (key, time.time()))
+        with self._lock:
+            self._bloom.add(key)
+
+    def prune(self) -> int:
+        """
+        Deletes links older than the TTL and rebuilds the Bloom filter.
+
+        Returns:
+            Number of links removed.
+        """
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        with self._connect() as conn:
+            removed = conn.execute("DELETE FROM seen_news WHERE seen_at <= ?", (time.time() - self.ttl_seconds,)).rowcount
+            for (key,) in conn.execute("SELECT key FROM seen_news"):
+                bloom.add(key)
+        with self._lock:
+            self._bloom = bloom
+        if removed:
+            logger.info(f"Pruned {removed} expired entries from seen-news store")
+        return removed
+
+_default_store: Optional[SeenStore] = None
+
+def get_seen_store() -> SeenStore:
+    """
+    Returns the process-wide seen-news store.
+    """
+    global _default_store
+    if _default_store is None:
+        _default_store = SeenStore(SEEN_STORE_PATH, SEEN_TTL_SECONDS, SEEN_BLOOM_CAPACITY, SEEN_BLOOM_ERROR_RATE)
+    return _default_store
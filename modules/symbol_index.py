@@ -0,0 +1,169 @@
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from config import MARKET_KRX, MARKET_US
+from modules.security_master import get_listings, strip_name_suffixes
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Lowercases ASCII only, so positions in the folded text match the original
+_ASCII_FOLD = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+# Upper-case words that are also US tickers but almost always mean something else
+_TICKER_STOPWORDS = {
+    "AI", "CEO", "CFO", "CPI", "EPS", "ETF", "EV", "FED", "GDP", "HBM", "IPO", "IT",
+    "NEW", "ALL", "ARE", "CAN", "FOR", "NOW", "ONE", "OUT", "SEE", "THE", "USA", "BIG",
+}
+
+MIN_NAME_LENGTH = 2
+MIN_US_TICKER_LENGTH = 3
+
+def _fold(text: str) -> str:
+    return text.translate(_ASCII_FOLD)
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher: finds every occurrence of every pattern in one
+    pass over the text, independent of how many patterns there are.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+        self._built = False
+
+    def add(self, pattern: str, value: Any) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), value))
+        self._built = False
+
+    def build(self) -> None:
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child].extend(self._out[self._fail[child]])
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Yields (start, end, value) for every pattern occurrence in `text`.
+        """
+        if not self._built:
+            self.build()
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, value in self._out[node]:
+                yield i + 1 - length, i + 1, value
+
+class SymbolIndex:
+    """
+    Finds every mentioned security in a text in a single pass.
+
+    Patterns are listing names (with corporate suffixes stripped), Korean
+    names, watchlist names and aliases, KRX codes and US tickers. English
+    patterns must match on word boundaries; US tickers must also match in
+    upper case.
+    """
+
+    def __init__(self, securities: Iterable[Dict[str, Any]]):
+        self._matcher = AhoCorasick()
+        self.size = 0
+        for security in securities:
+            key = (security['market'], str(security['ticker']))
+            names = [security.get('name', '')] + list(security.get('aliases') or [])
+            for name in names:
+                for variant in {name.strip(), strip_name_suffixes(name)}:
+                    if len(variant) >= MIN_NAME_LENGTH:
+                        self._add(_fold(variant), key, None)
+            self._add_ticker(key)
+        self._matcher.build()
+
+    def _add(self, pattern: str, key: Tuple[str, str], exact: Optional[str]) -> None:
+        self._matcher.add(pattern, (key, exact))
+        self.size += 1
+
+    def _add_ticker(self, key: Tuple[str, str]) -> None:
+        market, ticker = key
+        if market == MARKET_KRX and ticker.isdigit():
+            self._add(ticker, key, ticker)
+        elif market == MARKET_US and len(ticker) >= MIN_US_TICKER_LENGTH and ticker.upper() not in _TICKER_STOPWORDS:
+            self._add(_fold(ticker), key, ticker.upper())
+
+    def find(self, text: str) -> Set[Tuple[str, str]]:
+        """
+        Returns the (market, ticker) of every security mentioned in `text`.
+
+        Where one match lies inside a longer one, only the longer counts, so
+        "삼성전자우" is not also read as "삼성전자" and "Samsung Electronics"
+        not also as "Samsung".
+        """
+        folded = _fold(text)
+        matches = []
+        for start, end, (key, exact) in self._matcher.iter_matches(folded):
+            # English words and tickers must not be part of a longer word
+            if _is_word_char(folded[start]) and start > 0 and _is_word_char(folded[start - 1]):
+                continue
+            if _is_word_char(folded[end - 1]) and end < len(folded) and _is_word_char(folded[end]):
+                continue
+            if exact is not None and text[start:end] != exact:
+                continue
+            matches.append((start, end, key))
+
+        found = set()
+        accepted: List[Tuple[int, int]] = []
+        for start, end, key in sorted(matches, key=lambda match: match[0] - match[1]):
+            if any(s <= start and end <= e and e - s > end - start for s, e in accepted):
+                continue
+            accepted.append((start, end))
+            found.add(key)
+        return found
+
+_index: Optional[SymbolIndex] = None
+_index_key: Optional[Tuple] = None
+_index_lock = threading.Lock()
+
+def get_symbol_index(watchlist: List[Dict[str, Any]], markets: Tuple[str, ...] = (MARKET_KRX, MARKET_US)) -> SymbolIndex:
+    """
+    Returns a symbol index over the full KRX/US listings plus the watchlist
+    entries (whose names and aliases may not appear in the listings).
+
+    The index is rebuilt only when the listings are refreshed or the
+    watchlist changes.
+    """
+    global _index, _index_key
+    listings = [get_listings(market) for market in markets]
+    watch_key = tuple((s['market'], str(s['ticker']), s.get('name'), tuple(s.get('aliases') or [])) for s in watchlist)
+    key = (tuple(id(rows) for rows in listings), hash(watch_key))
+
+    with _index_lock:
+        if _index is None or _index_key != key:
+            securities = [row for rows in listings for row in rows] + list(watchlist)
+            _index = SymbolIndex(securities)
+            _index_key = key
+            logger.info(f"Built symbol index with {_index.size} patterns")
+        return _index
@@ -1,14 +1,34 @@
-import telegram
 import asyncio
-from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+import atexit
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from config import (
+    TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_IDS, TELEGRAM_GLOBAL_RATE_PER_SECOND, TELEGRAM_PER_CHAT_INTERVAL_SECONDS,
+    TELEGRAM_MAX_ATTEMPTS, TELEGRAM_QUEUE_SIZE, TELEGRAM_WORKERS
+)
+from utils.lazy_import import lazy_import
 from utils.logger import setup_logger
 
+telegram = lazy_import("telegram")
+
 logger = setup_logger(__name__)
 
-async def send_alert(alert_data):
+def _format_indicators(indicators):
+    def number(key, scale=1, suffix=""):
+        value = indicators.get(key)
+        return "N/A" if value is None else f"{value * scale:.1f}{suffix}"
+
+    trend = ""
+    if indicators.get('sma_50') is not None and indicators.get('price') is not None:
+        trend = " | above SMA50" if indicators['price'] >= indicators['sma_50'] else " | below SMA50"
+    return (f"RSI: {number('rsi_14')} | Vol: {number('volatility_20', 100, '%')}"
+            f" | 52W pos: {number('range_position_52w', 100, '%')}{trend}")
+
+def format_alert(alert_data):
     """
-    Sends a rich format message to Telegram.
-    
+    Builds the Markdown message for an alert.
+
     alert_data structure:
     {
         "news": {...},
@@ -28,50 +48,300 @@ async def send_alert(alert_data):
         "related_stocks": [...] # List of finance data dicts
     }
     """
-    bot = telegram.Bot(token=TELEGRAM_BOT_TOKEN)
-    
+    news = alert_data.get('news', {})
+    analysis = alert_data.get('analysis', {})
+
+    # Build Message
+    importance_emoji = "" if analysis.get('importance') == 'High' else ""
+
+    msg = f"{importance_emoji} *Stock News Alert* {importance_emoji}\n\n"
+    msg += f" *{news.get('title')}*\n"
+    msg += f"_{news.get('snippet')}_\n\n"
+
+    msg += f" *AI Analysis*\n"
+    msg += f" *Importance:* {analysis.get('importance')}\n"
+    msg += f" *Reason:* {analysis.get('reason')}\n"
+    msg += f" *Themes:* {', '.join(analysis.get('themes', []))}\n\n"
+
+    msg += f" *Historical Context*\n"
+    msg += f"{analysis.get('historical_reaction')}\n\n"
+
+    # Financials loop
+    related_stocks = alert_data.get('related_stocks', [])
+    if related_stocks:
+        msg += f" *Related Stocks*\n"
+        for stock in related_stocks:
+            ticker = stock.get('ticker')
+            price = stock.get('price')
+            change = stock.get('change')
+            per = stock.get('per', 'N/A')
+            pbr = stock.get('pbr', 'N/A')
+
+            # Format change with arrow
+            change_emoji = "" if change and change > 0 else "" if change and change < 0 else ""
+
+            msg += f"*{stock.get('name', ticker)} ({ticker})*\n"
+            msg += f"  Price: {price:,} {change_emoji} ({change})\n" # Formatting might need adjustment based on data type
+            msg += f"  PER: {per} | PBR: {pbr}\n"
+            indicators = stock.get('indicators')
+            if indicators:
+                msg += f"  {_format_indicators(indicators)}\n"
+            rank = stock.get('watchlist_rank')
+            if rank:
+                msg += f"  Watchlist momentum rank: {rank[0]}/{rank[1]}\n"
+            msg += "\n"
+
+    msg += f"[Read Article]({news.get('link')})"
+    return msg
+
+async def send_alert(alert_data):
+    """
+    Sends a single alert to every configured chat with a throwaway Bot.
+    The scheduler uses the long-lived AlertDispatcher instead.
+    """
     try:
-        news = alert_data.get('news', {})
-        analysis = alert_data.get('analysis', {})
-        
-        # Build Message
-        importance_emoji = "" if analysis.get('importance') == 'High' else ""
-        
-        msg = f"{importance_emoji} *Stock News Alert* {importance_emoji}\n\n"
-        msg += f" *{news.get('title')}*\n"
-        msg += f"_{news.get('snippet')}_\n\n"
-        
-        msg += f" *AI Analysis*\n"
-        msg += f" *Importance:* {analysis.get('importance')}\n"
-        msg += f" *Reason:* {analysis.get('reason')}\n"
-        msg += f" *Themes:* {', '.join(analysis.get('themes', []))}\n\n"
-        
-        msg += f" *Historical Context*\n"
-        msg += f"{analysis.get('historical_reaction')}\n\n"
-        
-        # Financials loop
-        related_stocks = alert_data.get('related_stocks', [])
-        if related_stocks:
-            msg += f" *Related Stocks*\n"
-            for stock in related_stocks:
-                ticker = stock.get('ticker')
-                price = stock.get('price')
-                change = stock.get('change')
-                per = stock.get('per', 'N/A')
-                pbr = stock.get('pbr', 'N/A')
-                
-                # Format change with arrow
-                change_emoji = "" if change and change > 0 else "" if change and change < 0 else ""
-                
-                msg += f"*{stock.get('name', ticker)} ({ticker})*\n"
-                msg += f"  Price: {price:,} {change_emoji} ({change})\n" # Formatting might need adjustment based on data type
-                msg += f"  PER: {per} | PBR: {pbr}\n"
-                msg += "\n"
-                
-        msg += f"[Read Article]({news.get('link')})"
-        
-        await bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=msg, parse_mode='Markdown')
-        logger.info(f"Sent alert for {news.get('title')}")
-        
+        msg = format_alert(alert_data)
+        async with telegram.Bot(token=TELEGRAM_BOT_TOKEN) as bot:
+            for chat_id in TELEGRAM_CHAT_IDS:
+                await bot.send_message(chat_id=chat_id, text=msg, parse_mode='Markdown')
+        logger.info(f"Sent alert for {alert_data.get('news', {}).get('title')}")
+
     except Exception as e:
         logger.error(f"Error sending Telegram alert: {e}")
+
+def _retry_after_seconds(error: "telegram.error.RetryAfter") -> float:
+    # Newer python-telegram-bot versions may report a timedelta
+    value = error.retry_after
+    return value.total_seconds() if hasattr(value, 'total_seconds') else float(value)
+
+class AlertDispatcher:
+    """
+    Delivers alerts from a background thread with its own event loop, one
+    queue and one Bot (so one HTTP connection pool) for its whole life.
+
+    Sends are spaced to stay within Telegram's limits: at most
+    `global_rate` messages per second overall and one message per
+    `per_chat_interval` seconds to the same chat. Flood-wait (RetryAfter)
+    and network errors are retried up to `max_attempts` times.
+    """
+
+    def __init__(self, token: str, chat_ids: List[str], global_rate: float = TELEGRAM_GLOBAL_RATE_PER_SECOND,
+                 per_chat_interval: float = TELEGRAM_PER_CHAT_INTERVAL_SECONDS, max_attempts: int = TELEGRAM_MAX_ATTEMPTS,
+                 queue_size: int = TELEGRAM_QUEUE_SIZE, workers: int = TELEGRAM_WORKERS, bot: Optional[Any] = None):
+        self.token = token
+        self.chat_ids = list(chat_ids)
+        self.global_interval = 1.0 / global_rate
+        self.per_chat_interval = per_chat_interval
+        self.max_attempts = max_attempts
+        self.queue_size = queue_size
+        self.workers = workers
+        self.sent = 0
+        self.failed = 0
+        self._bot = bot
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._stopping: Optional[asyncio.Event] = None
+        self._next_global = 0.0
+        self._next_per_chat: Dict[str, float] = {}
+        self._retrying = 0
+
+    # --- Called from the scheduler thread -----------------------------------
+
+    def start(self) -> "AlertDispatcher":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="telegram-dispatcher", daemon=True)
+            self._thread.start()
+            self._ready.wait()
+        return self
+
+    def submit(self, alert_data: Dict[str, Any]) -> bool:
+        """
+        Queues an alert for every chat and returns immediately.
+
+        Returns:
+            False if the alert could not be formatted or the dispatcher is
+            not running.
+        """
+        try:
+            msg = format_alert(alert_data)
+        except Exception as e:
+            logger.error(f"Error formatting Telegram alert: {e}")
+            return False
+        if self._loop is None or self._loop.is_closed():
+            logger.error("Telegram dispatcher is not running, dropping alert")
+            return False
+
+        title = alert_data.get('news', {}).get('title')
+        for chat_id in self.chat_ids:
+            self._loop.call_soon_threadsafe(self._enqueue, chat_id, msg, title)
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until every queued message has been sent or given up on.
+
+        Returns:
+            True if the queue drained within `timeout` seconds.
+        """
+        if self._loop is None or self._loop.is_closed():
+            return True
+        future = asyncio.run_coroutine_threadsafe(self._drain(), self._loop)
+        try:
+            future.result(timeout)
+            return True
+        except Exception:
+            future.cancel()
+            return False
+
+    def stop(self, timeout: Optional[float] = 30) -> None:
+        """
+        Drains the queue (for up to `timeout` seconds) and shuts down.
+        """
+        if self._thread is None:
+            return
+        if not self.flush(timeout):
+            logger.warning("Telegram dispatcher stopped with undelivered alerts")
+        if self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # --- Dispatcher thread ----------------------------------------------------
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._main())
+        finally:
+            loop.close()
+
+    async def _main(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._stopping = asyncio.Event()
+        bot = None
+        tasks = []
+        try:
+            bot = self._bot or telegram.Bot(token=self.token)
+            await bot.initialize()
+            tasks = [asyncio.ensure_future(self._worker(bot)) for _ in range(self.workers)]
+        except Exception as e:
+            logger.error(f"Error initializing Telegram bot: {e}")
+        self._ready.set()
+
+        if not tasks:
+            # Keep accepting (and dropping) work so callers never block
+            tasks = [asyncio.ensure_future(self._discard())]
+        await self._stopping.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            if bot is not None:
+                await bot.shutdown()
+        except Exception as e:
+            logger.warning(f"Error shutting down Telegram bot: {e}")
+
+    async def _drain(self) -> None:
+        # Retries waiting out a flood-wait are not in the queue yet
+        while True:
+            await self._queue.join()
+            if not self._retrying:
+                return
+            await asyncio.sleep(0.05)
+
+    def _enqueue(self, chat_id: str, msg: str, title: Optional[str]) -> None:
+        try:
+            self._queue.put_nowait((chat_id, msg, title, 1))
+        except asyncio.QueueFull:
+            self.failed += 1
+            logger.error(f"Telegram queue full, dropping alert for {title} to {chat_id}")
+
+    def _reserve_slot(self, chat_id: str) -> float:
+        # Runs without awaiting, so reservations never interleave
+        now = time.monotonic()
+        slot = max(now, self._next_per_chat.get(chat_id, 0.0), self._next_global)
+        self._next_per_chat[chat_id] = slot + self.per_chat_interval
+        self._next_global = slot + self.global_interval
+        return slot - now
+
+    async def _worker(self, bot) -> None:
+        while True:
+            chat_id, msg, title, attempt = await self._queue.get()
+            try:
+                await self._deliver(bot, chat_id, msg, title, attempt)
+            finally:
+                self._queue.task_done()
+
+    async def _discard(self) -> None:
+        while True:
+            _, _, title, _ = await self._queue.get()
+            self.failed += 1
+            logger.error(f"Telegram bot unavailable, dropping alert for {title}")
+            self._queue.task_done()
+
+    async def _deliver(self, bot, chat_id: str, msg: str, title: Optional[str], attempt: int) -> None:
+        await asyncio.sleep(self._reserve_slot(chat_id))
+        try:
+            await bot.send_message(chat_id=chat_id, text=msg, parse_mode='Markdown')
+            self.sent += 1
+            logger.info(f"Sent alert for {title} to {chat_id}")
+            return
+        except telegram.error.RetryAfter as e:
+            delay = _retry_after_seconds(e)
+            # Push back this chat's next free slot, not only this message
+            self._next_per_chat[chat_id] = max(self._next_per_chat.get(chat_id, 0.0), time.monotonic() + delay)
+            error = e
+        except (telegram.error.TimedOut, telegram.error.NetworkError) as e:
+            # BadRequest and Forbidden are NetworkErrors too, but retrying them cannot help
+            if isinstance(e, (telegram.error.BadRequest, telegram.error.Forbidden)):
+                self.failed += 1
+                logger.error(f"Error sending Telegram alert for {title} to {chat_id}: {e}")
+                return
+            delay = min(2 ** attempt, 30)
+            error = e
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Error sending Telegram alert for {title} to {chat_id}: {e}")
+            return
+
+        if attempt >= self.max_attempts:
+            self.failed += 1
+            logger.error(f"Giving up on Telegram alert for {title} to {chat_id} after {attempt} attempts: {error}")
+            return
+        logger.warning(f"Retrying Telegram alert for {title} to {chat_id} in {delay:.1f}s: {error}")
+        # Requeue instead of sleeping so this worker keeps serving other chats
+        self._retrying += 1
+        asyncio.get_running_loop().call_later(delay, self._requeue, chat_id, msg, title, attempt + 1)
+
+    def _requeue(self, chat_id: str, msg: str, title: Optional[str], attempt: int) -> None:
+        self._retrying -= 1
+        try:
+            self._queue.put_nowait((chat_id, msg, title, attempt))
+        except asyncio.QueueFull:
+            self.failed += 1
+            logger.error(f"Telegram queue full, dropping retry for {title} to {chat_id}")
+
+_dispatcher: Optional[AlertDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+def get_dispatcher() -> AlertDispatcher:
+    """
+    Returns the process-wide alert dispatcher, starting it on first use.
+    Queued alerts are drained when the process exits.
+    """
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = AlertDispatcher(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_IDS).start()
+            atexit.register(_dispatcher.stop)
+        return _dispatcher
+
+def enqueue_alert(alert_data) -> bool:
+    """
+    Queues an alert for delivery to every configured chat without waiting.
+    """
+    return get_dispatcher().submit(alert_data)
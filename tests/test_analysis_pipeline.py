@@ -0,0 +1,136 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import json
+import os
+import re
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.analysis_pipeline import analyze_news_pipeline
+from modules.ai_analyzer import LOW_IMPORTANCE, NO_HISTORY, HISTORY_FAILED
+
+def article(i, importance="High"):
+    return {"title": f"{importance} news {i}", "snippet": "...", "link": f"http://news.com/{i}"}
+
+class FakeUpstreams:
+    """
+    Async Gemini/Serper stand-ins that record call order and how many
+    calls of each kind were in flight at once.
+    """
+
+    def __init__(self, delay=0.01, skip_in_batch=(), broken_searches=(), no_history=(), failed_syntheses=()):
+        self.delay = delay
+        self.skip_in_batch = set(skip_in_batch)
+        self.broken_searches = set(broken_searches)
+        self.no_history = set(no_history)
+        self.failed_syntheses = set(failed_syntheses)
+        self.events = []
+        self.inflight = {"triage": 0, "search": 0, "synthesis": 0}
+        self.peak = dict(self.inflight)
+
+    async def _enter(self, kind, name):
+        self.events.append((kind, name))
+        self.inflight[kind] += 1
+        self.peak[kind] = max(self.peak[kind], self.inflight[kind])
+        await asyncio.sleep(self.delay)
+        self.inflight[kind] -= 1
+
+    async def gemini(self, prompt, client=None):
+        titles = re.findall(r"Title: (.+)", prompt)
+        if titles:
+            await self._enter("triage", tuple(titles))
+            analyses = []
+            for i, title in enumerate(titles):
+                if len(titles) > 1 and title in self.skip_in_batch:
+                    continue
+                analyses.append({
+                    "index": i,
+                    "importance": title.split()[0],
+                    "reason": "...",
+                    "themes": ["AI"],
+                    "search_query": f"{title} history",
+                })
+            return json.dumps(analyses)
+        title = re.search(r'current news: "(.+)"', prompt).group(1)
+        await self._enter("synthesis", title)
+        return None if title in self.failed_syntheses else f"Reaction to {title}"
+
+    async def search(self, client, query):
+        title = query[:-len(" history")]
+        await self._enter("search", title)
+        if title in self.broken_searches:
+            raise RuntimeError("Serper down")
+        if title in self.no_history:
+            return []
+        return [{"title": "Past event", "snippet": "Stocks rose"}]
+
+class TestAnalysisPipeline(unittest.TestCase):
+
+    def run_pipeline(self, upstreams, news_items, **kwargs):
+        with patch('modules.analysis_pipeline.call_gemini_api_async', side_effect=upstreams.gemini), \
+             patch('modules.analysis_pipeline.search_past_reaction_async', side_effect=upstreams.search), \
+             patch('modules.analysis_pipeline.reused_reaction', return_value=None), \
+             patch('modules.analysis_pipeline.remember_reaction'):
+            return asyncio.run(analyze_news_pipeline(news_items, **kwargs))
+
+    def test_results_follow_each_article_through_its_stages(self):
+        upstreams = FakeUpstreams(no_history={"Mid news 2"})
+        news_items = [article(0), article(1, "Low"), article(2, "Mid")]
+
+        results = self.run_pipeline(upstreams, news_items, batch_size=2)
+
+        self.assertEqual([r["original_news"] for r in results], news_items)
+        self.assertEqual(results[0]["historical_reaction"], "Reaction to High news 0")
+        self.assertEqual(results[1]["historical_reaction"], LOW_IMPORTANCE)
+        self.assertEqual(results[2]["historical_reaction"], NO_HISTORY)
+        # Low-importance articles never reach the search or synthesis stages
+        touched = [name for kind, name in upstreams.events if kind != "triage"]
+        self.assertNotIn("Low news 1", touched)
+        # Every article is triaged, then searched, then synthesized
+        for title in ("High news 0", "Mid news 2"):
+            stages = [kind for kind, name in upstreams.events if title == name or title in name]
+            self.assertEqual(stages, ["triage", "search", "synthesis"][:len(stages)])
+
+    def test_stages_overlap_within_their_concurrency_limits(self):
+        upstreams = FakeUpstreams()
+        news_items = [article(i) for i in range(12)]
+
+        results = self.run_pipeline(upstreams, news_items, batch_size=4, triage_concurrency=1,
+                                    history_concurrency=3, synthesis_concurrency=2, queue_size=2)
+
+        self.assertTrue(all(r["historical_reaction"].startswith("Reaction to") for r in results))
+        self.assertEqual(upstreams.peak, {"triage": 1, "search": 3, "synthesis": 2})
+        # The first synthesis starts before the last batch is triaged
+        kinds = [kind for kind, _ in upstreams.events]
+        self.assertLess(kinds.index("synthesis"), len(kinds) - 1 - kinds[::-1].index("triage"))
+
+    def test_failures_stay_with_their_article(self):
+        upstreams = FakeUpstreams(skip_in_batch={"High news 1"}, broken_searches={"High news 2"},
+                                  failed_syntheses={"High news 3"})
+        news_items = [article(i) for i in range(4)]
+
+        results = self.run_pipeline(upstreams, news_items, batch_size=4)
+
+        self.assertEqual(results[0]["historical_reaction"], "Reaction to High news 0")
+        # Missed by the batch response, so triaged again on its own
+        self.assertEqual(results[1]["historical_reaction"], "Reaction to High news 1")
+        self.assertIn(("triage", ("High news 1",)), upstreams.events)
+        self.assertIsNone(results[2])
+        self.assertEqual(results[3]["historical_reaction"], HISTORY_FAILED)
+
+    def test_reused_reactions_skip_search_and_synthesis(self):
+        upstreams = FakeUpstreams()
+
+        with patch('modules.analysis_pipeline.call_gemini_api_async', side_effect=upstreams.gemini), \
+             patch('modules.analysis_pipeline.search_past_reaction_async', side_effect=upstreams.search), \
+             patch('modules.analysis_pipeline.reused_reaction', return_value="Stored reaction"):
+            results = asyncio.run(analyze_news_pipeline([article(0)]))
+
+        self.assertEqual(results[0]["historical_reaction"], "Stored reaction")
+        self.assertEqual([kind for kind, _ in upstreams.events], ["triage"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.news_archive import NewsArchive
+from modules.news_fetcher import fetch_news
+
+ARTICLES = [
+    {"title": "삼성전자가 HBM 생산 확대", "snippet": "AI 서버 수요 급증", "link": "http://news.com/1", "date": "2 hours ago"},
+    {"title": "Fed holds rates", "snippet": "No change in policy", "link": "http://news.com/2", "date": "Jan 5, 2024"},
+]
+
+class TestFetchNews(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = NewsArchive(os.path.join(self.tmp.name, "news_archive.sqlite3"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch('modules.news_fetcher.http_client.post')
+    def test_fetched_articles_are_archived(self, mock_post):
+        mock_post.return_value = MagicMock(**{"json.return_value": {"news": ARTICLES}})
+
+        with patch('modules.news_fetcher.get_news_archive', return_value=self.archive):
+            self.assertEqual(fetch_news("주식 시장 주요 뉴스", n=3), ARTICLES)
+
+        self.assertEqual([item["link"] for item in self.archive.search("삼성전자")], ["http://news.com/1"])
+        self.assertEqual(self.archive.stats()["entries"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.seen_store import SeenStore
+
+class TestSeenStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "seen_news.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_store(self, ttl_seconds=60):
+        return SeenStore(self.path, ttl_seconds=ttl_seconds, capacity=100, error_rate=0.01)
+
+    def test_bloom_false_positives_fall_back_to_sqlite(self):
+        store = self.make_store()
+        store.add("http://news.com/1")
+        # Saturate the filter so every key looks present
+        store._bloom.bits[:] = b"\xff" * len(store._bloom.bits)
+
+        self.assertIn("http://news.com/2", store._bloom)
+        self.assertFalse(store.contains("http://news.com/2"))
+        self.assertTrue(store.contains("http://news.com/1"))
+
+    def test_links_persist_across_instances(self):
+        self.make_store().add("http://news.com/1")
+
+        other = self.make_store()
+        self.assertTrue(other.contains("http://news.com/1"))
+        self.assertFalse(other.contains("http://news.com/2"))
+
+    def test_prune_removes_expired_links(self):
+        store = self.make_store()
+        with patch('modules.seen_store.time.time', return_value=0.0):
+            store.add("http://news.com/old")
+        store.add("http://news.com/new")
+
+        self.assertFalse(store.contains("http://news.com/old"))
+        self.assertEqual(store.prune(), 1)
+        self.assertNotIn("http://news.com/old", store._bloom)
+        self.assertTrue(store.contains("http://news.com/new"))
+        self.assertEqual(store.prune(), 0)
+
+    def test_missing_links_are_never_seen(self):
+        store = self.make_store()
+        store.add(None)
+        store.add("")
+
+        self.assertFalse(store.contains(None))
+        self.assertFalse(store.contains(""))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.symbol_index import AhoCorasick, SymbolIndex
+from modules.security_master import strip_name_suffixes
+
+SECURITIES = [
+    {"ticker": "005930", "name": "삼성전자", "market": "KRX"},
+    {"ticker": "005935", "name": "삼성전자우", "market": "KRX"},
+    {"ticker": "028260", "name": "삼성물산", "market": "KRX"},
+    {"ticker": "000660", "name": "SK하이닉스", "market": "KRX", "aliases": ["SK Hynix"]},
+    {"ticker": "AAPL", "name": "Apple Inc.", "market": "US"},
+    {"ticker": "TM", "name": "Toyota Motor Corp ADR", "market": "US"},
+    {"ticker": "SMSN", "name": "Samsung", "market": "US"},
+    {"ticker": "SSNLF", "name": "Samsung Electronics", "market": "US"},
+    {"ticker": "ALL", "name": "Allstate Corp", "market": "US"},
+]
+
+class TestAhoCorasick(unittest.TestCase):
+
+    def test_finds_overlapping_patterns(self):
+        matcher = AhoCorasick()
+        for pattern in ("he", "she", "his", "hers"):
+            matcher.add(pattern, pattern)
+
+        matches = sorted(matcher.iter_matches("ushers"))
+
+        self.assertEqual(matches, [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")])
+
+class TestSymbolIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SymbolIndex(SECURITIES)
+
+    def test_korean_names_with_particles(self):
+        self.assertEqual(self.index.find("삼성전자가 HBM 생산을 늘린다"), {("KRX", "005930")})
+        self.assertEqual(self.index.find("삼성물산은 합병 후 SK하이닉스와"), {("KRX", "028260"), ("KRX", "000660")})
+
+    def test_longest_match_wins(self):
+        self.assertEqual(self.index.find("삼성전자우 배당 확대"), {("KRX", "005935")})
+        self.assertEqual(self.index.find("Samsung Electronics beats estimates"), {("US", "SSNLF")})
+        # Both mentioned on their own
+        self.assertEqual(self.index.find("삼성전자와 삼성전자우"), {("KRX", "005930"), ("KRX", "005935")})
+
+    def test_name_suffixes_and_word_boundaries(self):
+        self.assertEqual(self.index.find("Apple unveils a new iPhone"), {("US", "AAPL")})
+        self.assertEqual(self.index.find("Toyota Motor recalls cars"), {("US", "TM")})
+        self.assertEqual(self.index.find("Pineapple prices rise"), set())
+        self.assertEqual(self.index.find("sk hynix and AAPL"), {("KRX", "000660"), ("US", "AAPL")})
+        # Tickers match in upper case only, and not when they are common words
+        self.assertEqual(self.index.find("aapl"), set())
+        self.assertEqual(self.index.find("ALL markets rallied"), set())
+
+    def test_strip_name_suffixes(self):
+        self.assertEqual(strip_name_suffixes("Apple Inc."), "Apple")
+        self.assertEqual(strip_name_suffixes("Toyota Motor Corp ADR"), "Toyota Motor")
+        self.assertEqual(strip_name_suffixes("ASML Holding NV"), "ASML")
+        self.assertEqual(strip_name_suffixes("삼성전자"), "삼성전자")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import datetime
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import telegram
+from modules.telegram_bot import AlertDispatcher
+
+real_sleep = asyncio.sleep
+
+def alert(i):
+    return {"news": {"title": f"News {i}", "snippet": "...", "link": f"http://news.com/{i}"},
+            "analysis": {"importance": "High", "themes": []}}
+
+class FakeClock:
+    """
+    Stands in for time.monotonic and asyncio.sleep: sleeping moves the
+    clock forward instead of waiting.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.now += max(0.0, delay)
+        await real_sleep(0)
+
+class FakeBot:
+    """
+    Records (chat_id, time, text) for every message; `failures` are raised,
+    in order, by the first sends to the chats they are keyed by.
+    """
+
+    def __init__(self, clock, failures=None):
+        self.clock = clock
+        self.failures = {chat_id: list(errors) for chat_id, errors in (failures or {}).items()}
+        self.sent = []
+        self.attempts = []
+        self.shut_down = False
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        self.shut_down = True
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        self.attempts.append((chat_id, self.clock.now))
+        if self.failures.get(chat_id):
+            raise self.failures[chat_id].pop(0)
+        self.sent.append((chat_id, self.clock.now, text))
+
+class TestAlertDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        for p in (patch('modules.telegram_bot.time', self.clock), patch('asyncio.sleep', self.clock.sleep)):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def make_dispatcher(self, bot, chat_ids=("a", "b")):
+        dispatcher = AlertDispatcher("token", list(chat_ids), global_rate=10, per_chat_interval=1.0,
+                                     max_attempts=3, workers=1, bot=bot).start()
+        self.addCleanup(dispatcher.stop, 5)
+        return dispatcher
+
+    def send_times(self, bot):
+        start = bot.attempts[0][1]
+        return [(chat_id, round(at - start, 3)) for chat_id, at, _ in bot.sent]
+
+    def test_sends_are_spaced_per_chat_and_globally(self):
+        bot = FakeBot(self.clock)
+        dispatcher = self.make_dispatcher(bot)
+
+        self.assertTrue(dispatcher.submit(alert(0)))
+        self.assertTrue(dispatcher.submit(alert(1)))
+        self.assertTrue(dispatcher.flush(5))
+
+        # 0.1s apart overall, 1s apart within a chat
+        self.assertEqual(self.send_times(bot), [("a", 0.0), ("b", 0.1), ("a", 1.0), ("b", 1.1)])
+        self.assertEqual(dispatcher.sent, 4)
+
+    def test_retry_after_requeues_and_delays_only_that_chat(self):
+        retry_after = telegram.error.RetryAfter(datetime.timedelta(seconds=0.05))
+        bot = FakeBot(self.clock, failures={"a": [retry_after]})
+        dispatcher = self.make_dispatcher(bot)
+
+        dispatcher.submit(alert(0))
+        dispatcher.submit(alert(1))
+        self.assertTrue(dispatcher.flush(5))
+
+        # Chat b keeps its slots while a waits out the flood-wait
+        times = self.send_times(bot)
+        self.assertEqual([t for t in times if t[0] == "b"], [("b", 0.1), ("b", 1.1)])
+        retried = [at for chat_id, at in times if chat_id == "a"]
+        self.assertEqual(len(retried), 2)
+        self.assertGreaterEqual(retried[0], 0.05)
+        self.assertGreaterEqual(retried[1] - retried[0], 1.0)
+        self.assertEqual((dispatcher.sent, dispatcher.failed), (4, 0))
+
+    def test_gives_up_after_max_attempts(self):
+        errors = [telegram.error.RetryAfter(datetime.timedelta(seconds=0.01)) for _ in range(3)]
+        bot = FakeBot(self.clock, failures={"a": errors})
+        dispatcher = self.make_dispatcher(bot, chat_ids=["a"])
+
+        dispatcher.submit(alert(0))
+        self.assertTrue(dispatcher.flush(5))
+
+        self.assertEqual(len(bot.attempts), 3)
+        self.assertEqual((dispatcher.sent, dispatcher.failed), (0, 1))
+
+    def test_stop_drains_the_queue(self):
+        bot = FakeBot(self.clock)
+        dispatcher = self.make_dispatcher(bot)
+
+        for i in range(3):
+            dispatcher.submit(alert(i))
+        dispatcher.stop(5)
+
+        self.assertEqual(len(bot.sent), 6)
+        self.assertTrue(bot.shut_down)
+        self.assertFalse(dispatcher.submit(alert(3)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import HTTP_TIMEOUTS, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_POOL_SIZE
+from utils.logger import setup_logger
+from utils.rate_limiter import RateLimiter, get_rate_limiter
+
+logger = setup_logger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# 429s are retried here rather than by urllib3 so that the shared rate limiter sees them
+SESSION_RETRY_STATUSES = tuple(status for status in RETRY_STATUSES if status != 429)
+DEFAULT_TIMEOUT = (3.05, 30)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# httpx clients are bound to the event loop they were first used on
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def get_timeout(service: str) -> Tuple[float, float]:
+    """
+    Returns the (connect, read) timeout in seconds configured for a service.
+    """
+    return HTTP_TIMEOUTS.get(service, DEFAULT_TIMEOUT)
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide requests session.
+
+    The session keeps a keep-alive pool per host and retries 5xx
+    responses and connection errors with jittered exponential backoff,
+    honouring Retry-After. 429s are retried by `request`.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=HTTP_MAX_RETRIES,
+                backoff_factor=HTTP_BACKOFF_FACTOR,
+                backoff_jitter=HTTP_BACKOFF_FACTOR,
+                status_forcelist=SESSION_RETRY_STATUSES,
+                allowed_methods=None, # Serper and Gemini are queried with POST
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def _limiter_for(service: str) -> Optional[RateLimiter]:
+    limiter = get_rate_limiter()
+    return limiter if limiter is not None and service in limiter.limits else None
+
+def request(service: str, method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Sends a request through the shared session with the service's timeouts.
+
+    Rate-limited services (see RATE_LIMITS) wait for a slot from the shared
+    rate limiter first. A 429 is reported to the limiter and retried once
+    the limiter allows, at most HTTP_MAX_RETRIES times.
+    """
+    kwargs.setdefault('timeout', get_timeout(service))
+    limiter = _limiter_for(service)
+
+    attempt = 0
+    while True:
+        lease = limiter.acquire(service) if limiter else None
+        response = None
+        try:
+            response = get_session().request(method, url, **kwargs)
+            delay = _retry_delay(response, attempt) if response.status_code == 429 else 0.0
+        finally:
+            throttled = response is not None and response.status_code == 429
+            if limiter:
+                limiter.release(service, lease, throttled, delay if throttled else None)
+        if not throttled or attempt >= HTTP_MAX_RETRIES:
+            return response
+        logger.warning(f"{service} returned 429, retrying in {delay:.2f}s")
+        attempt += 1
+        if not limiter:
+            time.sleep(delay)
+
+def get(service: str, url: str, **kwargs) -> requests.Response:
+    return request(service, "GET", url, **kwargs)
+
+def post(service: str, url: str, **kwargs) -> requests.Response:
+    return request(service, "POST", url, **kwargs)
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the shared AsyncClient for the running event loop.
+
+    Uses HTTP/2 when the `h2` package is installed; hosts that only speak
+    HTTP/1.1 are negotiated down automatically.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE)
+        client = httpx.AsyncClient(limits=limits, http2=HTTP2_AVAILABLE)
+        _async_clients[loop] = client
+    return client
+
+def _retry_after_seconds(response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def _backoff_seconds(attempt: int) -> float:
+    return HTTP_BACKOFF_FACTOR * (2 ** attempt) + random.uniform(0, HTTP_BACKOFF_FACTOR)
+
+def _retry_delay(response, attempt: int) -> float:
+    # Retry-After when the upstream sent one, jittered exponential backoff otherwise
+    delay = _retry_after_seconds(response)
+    return _backoff_seconds(attempt) if delay is None else delay
+
+async def close_async_client() -> None:
+    """
+    Closes the shared AsyncClient of the running event loop, if any. Call
+    it before a short-lived loop (e.g. one asyncio.run) ends.
+    """
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+async def async_request(service: str, method: str, url: str, client: Optional[httpx.AsyncClient] = None, **kwargs) -> httpx.Response:
+    """
+    Async counterpart of `request` with the same timeouts, rate limiting
+    and retry policy (429s and 5xx responses, connection errors).
+
+    Args:
+        service: Service name used to look up timeouts (e.g. "serper").
+        method: HTTP method.
+        url: Request URL.
+        client: AsyncClient to use. Defaults to the shared client for this loop.
+
+    Returns:
+        The final response. Callers still check the status themselves.
+    """
+    client = client or get_async_client()
+    connect_timeout, read_timeout = get_timeout(service)
+    kwargs.setdefault('timeout', httpx.Timeout(read_timeout, connect=connect_timeout))
+
+    limiter = _limiter_for(service)
+
+    attempt = 0
+    while True:
+        lease = await limiter.acquire_async(service) if limiter else None
+        response = None
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            if attempt >= HTTP_MAX_RETRIES:
+                raise
+            delay = _backoff_seconds(attempt)
+            logger.warning(f"{service} request failed ({e}), retrying in {delay:.2f}s")
+        else:
+            delay = _retry_delay(response, attempt) if response.status_code in RETRY_STATUSES else 0.0
+        finally:
+            throttled = response is not None and response.status_code == 429
+            if limiter:
+                await limiter.release_async(service, lease, throttled, delay if throttled else None)
+        if response is not None:
+            if response.status_code not in RETRY_STATUSES or attempt >= HTTP_MAX_RETRIES:
+                return response
+            logger.warning(f"{service} returned {response.status_code}, retrying in {delay:.2f}s")
+        attempt += 1
+        # After a 429 the limiter holds every process back until Retry-After has passed
+        if not (throttled and limiter):
+            await asyncio.sleep(delay)
+
+async def async_get(service: str, url: str, **kwargs) -> httpx.Response:
+    return await async_request(service, "GET", url, **kwargs)
+
+async def async_post(service: str, url: str, **kwargs) -> httpx.Response:
+    return await async_request(service, "POST", url, **kwargs)
@@ -0,0 +1,51 @@
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, Optional
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Heavy dependencies (pandas, FinanceDataReader, mplfinance, ...) take
+    seconds to import; binding them with `lazy_import` keeps that cost off
+    process startup and charges it to the first call that needs them.
+    Attribute writes go to the real module, so `unittest.mock.patch`
+    targets like "modules.price_store.fdr.DataReader" keep working.
+    """
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _load(self) -> ModuleType:
+        module: Optional[ModuleType] = object.__getattribute__(self, "_module")
+        if module is None:
+            with object.__getattribute__(self, "_lock"):
+                module = object.__getattribute__(self, "_module")
+                if module is None:
+                    module = importlib.import_module(object.__getattribute__(self, "_name"))
+                    object.__setattr__(self, "_module", module)
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        name = object.__getattribute__(self, "_name")
+        state = "loaded" if object.__getattribute__(self, "_module") is not None else "not loaded"
+        return f"<lazy module {name!r} ({state})>"
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Returns a LazyModule for `name`. Use it in place of `import name` for
+    dependencies that are slow to import and not needed by every code path.
+    """
+    return LazyModule(name)